@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
 import logging
-from typing import Any, Optional
+import time
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -12,15 +14,30 @@ from homeassistant.const import (
     CONF_PASSWORD,
     Platform,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
 
 from .const import (
     DOMAIN, 
     CURRENT_HA_VERSION, 
     MIN_REQUIRED_OVERALL_VERSION,
+    CONF_MQTT_TRANSPORT,
+    CONF_SUBSCRIPTION_MODE,
+    CONF_TRACE_LOG_SAMPLE_RATE,
+    CONF_PERSISTENT_SESSION,
+    DEFAULT_MQTT_TRANSPORT,
+    DEFAULT_SUBSCRIPTION_MODE,
+    DEFAULT_TRACE_LOG_SAMPLE_RATE,
+    DEFAULT_PERSISTENT_SESSION,
+    SETUP_CONNECT_TIMEOUT,
+    RELOAD_GRACE_PERIOD,
+    DATA_PARKED_RUNTIMES,
     CompatibilityStatus
 )
+from .coordinator import TerraMowDataCoordinator
+from .services import async_setup_services, async_unload_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,9 +48,26 @@ class TerraMowBasicData:
     host: str
     password: str
     lawn_mower: Any = None
+    coordinator: TerraMowDataCoordinator | None = None
+    mqtt_transport: str = DEFAULT_MQTT_TRANSPORT
+    subscription_mode: str = DEFAULT_SUBSCRIPTION_MODE
+    trace_log_sample_rate: int = DEFAULT_TRACE_LOG_SAMPLE_RATE
+    persistent_session: bool = DEFAULT_PERSISTENT_SESSION
     compatibility_status: str = CompatibilityStatus.COMPATIBLE
-    firmware_version: Optional[dict] = None
+    firmware_version: dict | None = None
     compatibility_reason: str = ""  # Store the specific reason for compatibility check failure
+    setup_timings: dict[str, float] = field(default_factory=dict)  # Duration of each setup phase in seconds
+
+    @property
+    def connection_settings(self) -> tuple:
+        """Return the settings that need a new MQTT connection when changed."""
+        return (
+            self.host,
+            self.password,
+            self.mqtt_transport,
+            self.subscription_mode,
+            self.persistent_session,
+        )
     
     def check_version_compatibility(self, compatibility_info: dict) -> str:
         """Check version compatibility and return status."""
@@ -132,19 +166,92 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.info("Setting up TerraMow with host %s", host)
     _LOGGER.debug("TerraMow entry data: %s", dict(entry.data))
 
-    basic_data = TerraMowBasicData(host=host, password=password)
+    basic_data = TerraMowBasicData(
+        host=host,
+        password=password,
+        mqtt_transport=entry.options.get(CONF_MQTT_TRANSPORT, DEFAULT_MQTT_TRANSPORT),
+        subscription_mode=entry.options.get(
+            CONF_SUBSCRIPTION_MODE, DEFAULT_SUBSCRIPTION_MODE
+        ),
+        trace_log_sample_rate=entry.options.get(
+            CONF_TRACE_LOG_SAMPLE_RATE, DEFAULT_TRACE_LOG_SAMPLE_RATE
+        ),
+        persistent_session=entry.options.get(
+            CONF_PERSISTENT_SESSION, DEFAULT_PERSISTENT_SESSION
+        ),
+    )
+    # Imported here, the platform module imports TerraMowBasicData from this module
+    from .lawn_mower import TerraMowLawnMower
+
+    started = time.monotonic()
+    parked = _async_take_parked_runtime(hass, entry.entry_id)
+    if parked is not None and parked.connection_settings == basic_data.connection_settings:
+        # 重新加载平台，新实体直接附加到仍在运行的连接和缓存的数据
+        _LOGGER.info("Reattaching to the running connection of %s", host)
+        parked.trace_log_sample_rate = basic_data.trace_log_sample_rate
+        parked.lawn_mower.trace.sample_rate = basic_data.trace_log_sample_rate
+        basic_data = parked
+        lawn_mower = basic_data.lawn_mower
+        restored = connected = time.monotonic()
+    else:
+        if parked is not None:
+            # 连接设置已变更，断开旧连接，但保留数据缓存
+            await parked.lawn_mower.async_stop()
+            basic_data.coordinator = parked.coordinator
+        else:
+            # 协调器保存设备的所有数据点，由各平台实体共享
+            basic_data.coordinator = TerraMowDataCoordinator(hass, host, entry.entry_id)
+            # 连接MQTT之前恢复上次保存的数据，实体在设备上报前即可显示状态
+            await basic_data.coordinator.async_restore()
+        restored = time.monotonic()
+
+        # 在加载平台之前创建割草机并开始连接，所有平台的实体都能使用它
+        lawn_mower = TerraMowLawnMower(basic_data, hass)
+        lawn_mower.start_mqtt_client()
+        if not await lawn_mower.async_wait_connected(SETUP_CONNECT_TIMEOUT):
+            await lawn_mower.async_stop()
+            raise ConfigEntryNotReady(
+                f"Timed out connecting to {host} after {SETUP_CONNECT_TIMEOUT}s: "
+                f"{lawn_mower.reconnect.last_error or 'no response'}"
+            )
+        connected = time.monotonic()
 
     # Use hass.data instead of entry.runtime_data
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = basic_data
 
+    # 订阅和兼容性查询与平台加载同时进行
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # 新实体已注册，取消重新加载前保留但不再使用的订阅
+    lawn_mower.release_subscriptions()
+    finished = time.monotonic()
+
+    basic_data.setup_timings = {
+        "restore": round(restored - started, 3),
+        "connect": round(connected - restored, 3),
+        "platforms": round(finished - connected, 3),
+        "total": round(finished - started, 3),
+    }
+    _LOGGER.info("TerraMow %s set up in %.3fs: %s", host, finished - started, basic_data.setup_timings)
+
+    async_setup_services(hass)
+
+    # 选项变更后重新加载
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    basic_data: TerraMowBasicData = hass.data[DOMAIN][entry.entry_id]
+    # 卸载实体时保留订阅，重新加载后无需重新订阅
+    basic_data.lawn_mower.hold_subscriptions()
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     # If unloading is successful, clear the data
@@ -152,5 +259,53 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN].pop(entry.entry_id)
         if not hass.data[DOMAIN]:
             hass.data.pop(DOMAIN)
+            async_unload_services(hass)
+        if hass.is_stopping:
+            await basic_data.lawn_mower.async_stop()
+        else:
+            # 连接保持一段时间，重新加载时直接复用
+            _async_park_runtime(hass, entry.entry_id, basic_data)
+    else:
+        basic_data.lawn_mower.release_subscriptions()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Disconnect the parked connection and remove the snapshot of a removed config entry."""
+    basic_data = _async_take_parked_runtime(hass, entry.entry_id)
+    if basic_data is not None:
+        await basic_data.lawn_mower.async_stop()
+        coordinator = basic_data.coordinator
+    else:
+        coordinator = TerraMowDataCoordinator(hass, entry.data[CONF_HOST], entry.entry_id)
+    # 停放的协调器可能还有未写入的延迟保存，通过它删除快照以一并取消
+    await coordinator.async_remove_snapshot()
+
+
+@callback
+def _async_park_runtime(
+    hass: HomeAssistant, entry_id: str, basic_data: TerraMowBasicData
+) -> None:
+    """Keep the connection of an unloaded entry for the grace period."""
+
+    async def _async_expire(_now: datetime) -> None:
+        hass.data[DATA_PARKED_RUNTIMES].pop(entry_id, None)
+        _LOGGER.info("Entry %s not set up again, disconnecting %s", entry_id, basic_data.host)
+        await basic_data.lawn_mower.async_stop()
+
+    cancel = async_call_later(hass, RELOAD_GRACE_PERIOD, _async_expire)
+    hass.data.setdefault(DATA_PARKED_RUNTIMES, {})[entry_id] = (basic_data, cancel)
+
+
+@callback
+def _async_take_parked_runtime(
+    hass: HomeAssistant, entry_id: str
+) -> TerraMowBasicData | None:
+    """Return the parked connection of an entry and stop its grace timer."""
+    parked = hass.data.get(DATA_PARKED_RUNTIMES, {}).pop(entry_id, None)
+    if parked is None:
+        return None
+    basic_data, cancel = parked
+    cancel()
+    return basic_data
@@ -1,6 +1,5 @@
 from __future__ import annotations
 import logging
-import json
 
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
@@ -13,6 +12,7 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import TerraMowBasicData, DOMAIN
+from .entity import TerraMowDataPointEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,10 +32,11 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class TerraMowChargingSensor(BinarySensorEntity):
+class TerraMowChargingSensor(TerraMowDataPointEntity, BinarySensorEntity):
     """Binary sensor for the TerraMow charging state."""
 
     _attr_has_entity_name = True
+    _data_point_ids = (108,)
     _attr_translation_key = "charging_state"
     _attr_device_class = BinarySensorDeviceClass.BATTERY_CHARGING
     _attr_entity_category = EntityCategory.DIAGNOSTIC
@@ -60,7 +61,7 @@ class TerraMowChargingSensor(BinarySensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
 
     @property
@@ -71,11 +72,10 @@ class TerraMowChargingSensor(BinarySensorEntity):
     @property
     def is_on(self) -> bool | None:
         """Return true if the binary sensor is on."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
+        battery_status = self.coordinator.battery_status
+        if battery_status is None:
             return None
-
-        battery_status = self.basic_data.lawn_mower.battery_status
-        charger_connected = battery_status.get('charger_connected')
+        charger_connected = battery_status.charger_connected
 
         return bool(charger_connected) if charger_connected is not None else None
 
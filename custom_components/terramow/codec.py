@@ -0,0 +1,39 @@
+"""JSON codec for the TerraMow integration.
+
+orjson is used when it is importable (it ships with Home Assistant), with the
+standard library ``json`` module as a fallback. Both variants decode straight
+from the raw MQTT payload bytes, encode to bytes and raise a ValueError
+subclass for invalid payloads.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+if orjson is not None:
+    CODEC_NAME = "orjson"
+
+    def loads(payload: bytes | str) -> Any:
+        """Decode a JSON payload."""
+        return orjson.loads(payload)
+
+    def dumps(obj: Any) -> bytes:
+        """Encode an object as JSON."""
+        return orjson.dumps(obj)
+
+else:
+    CODEC_NAME = "json"
+
+    def loads(payload: bytes | str) -> Any:
+        """Decode a JSON payload."""
+        return json.loads(payload)
+
+    def dumps(obj: Any) -> bytes:
+        """Encode an object as JSON."""
+        return json.dumps(obj, separators=(",", ":")).encode()
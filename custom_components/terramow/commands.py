@@ -0,0 +1,139 @@
+"""Command acknowledgement tracking for the TerraMow integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# 判断机器人端消息是否确认了命令: (dp_id, data) -> bool
+AckPredicate = Callable[[int, Any], bool]
+
+
+@dataclass
+class PendingCommand:
+    """A command waiting for its acknowledgement."""
+
+    seq: int
+    dp_id: int
+    sent_at: float
+    future: asyncio.Future
+    predicate: AckPredicate | None = None
+    timeout: float = 0
+    timer: asyncio.TimerHandle | None = field(default=None, repr=False)
+
+
+class CommandTracker:
+    """Correlate outbound commands with the robot's responses.
+
+    Every command registered with its ``seq`` gets a future. The future is
+    resolved with the robot side message that acknowledged the command (it
+    echoes the seq or satisfies the predicate of the command), or with None
+    when no acknowledgement arrives in time. The command to acknowledgement
+    latency is recorded for the statistics.
+    """
+
+    def __init__(self, hass: HomeAssistant, timeout: float, history: int = 100) -> None:
+        """Initialize the tracker."""
+        self._hass = hass
+        self._timeout = timeout
+        self._pending: dict[int, PendingCommand] = {}
+        self._latencies: deque[float] = deque(maxlen=history)
+
+        # 统计信息
+        self.sent = 0
+        self.acknowledged = 0
+        self.timed_out = 0
+
+    @callback
+    def async_track(
+        self,
+        seq: int,
+        dp_id: int,
+        predicate: AckPredicate | None = None,
+        timeout: float | None = None,
+    ) -> asyncio.Future:
+        """Start tracking a command and return the future of its acknowledgement."""
+        future = self._hass.loop.create_future()
+        pending = PendingCommand(seq, dp_id, time.monotonic(), future, predicate)
+        pending.timeout = timeout or self._timeout
+        pending.timer = self._hass.loop.call_later(
+            pending.timeout, self._async_timeout, seq
+        )
+        self._pending[seq] = pending
+        self.sent += 1
+        return future
+
+    @callback
+    def async_process(self, dp_id: int, data: Any) -> None:
+        """Resolve the commands acknowledged by a robot side message."""
+        if not self._pending:
+            return
+        seq = data.get("seq") if isinstance(data, dict) else None
+        for pending in list(self._pending.values()):
+            if pending.seq == seq or (
+                pending.predicate is not None and pending.predicate(dp_id, data)
+            ):
+                latency = time.monotonic() - pending.sent_at
+                self.acknowledged += 1
+                self._latencies.append(latency)
+                _LOGGER.debug(
+                    "Command %d on dp_%d acknowledged after %.3fs",
+                    pending.seq, pending.dp_id, latency,
+                )
+                self._async_resolve(pending, data)
+
+    @callback
+    def _async_resolve(self, pending: PendingCommand, response: Any) -> None:
+        self._pending.pop(pending.seq, None)
+        if pending.timer is not None:
+            pending.timer.cancel()
+        if not pending.future.done():
+            pending.future.set_result(response)
+
+    @callback
+    def _async_timeout(self, seq: int) -> None:
+        pending = self._pending.get(seq)
+        if pending is None:
+            return
+        self.timed_out += 1
+        _LOGGER.warning(
+            "Command %d on dp_%d not acknowledged within %ss",
+            seq, pending.dp_id, pending.timeout,
+        )
+        self._async_resolve(pending, None)
+
+    @callback
+    def async_cancel_all(self) -> None:
+        """Stop tracking all pending commands."""
+        for pending in list(self._pending.values()):
+            self._async_resolve(pending, None)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return acknowledgement statistics for diagnostics."""
+        latencies = sorted(self._latencies)
+        stats: dict[str, Any] = {
+            "timeout": self._timeout,
+            "sent": self.sent,
+            "acknowledged": self.acknowledged,
+            "timed_out": self.timed_out,
+            "pending": len(self._pending),
+        }
+        if latencies:
+            stats["latency"] = {
+                "samples": len(latencies),
+                "min": latencies[0],
+                "mean": sum(latencies) / len(latencies),
+                "p50": latencies[len(latencies) // 2],
+                "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                "max": latencies[-1],
+            }
+        return stats
@@ -8,13 +8,33 @@ from typing import Any
 import paho.mqtt.client as mqtt_client
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow as BaseConfigFlow
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow as BaseConfigFlow,
+    OptionsFlow,
+)
 # 移除 ConfigFlowResult 导入
 from homeassistant.const import CONF_HOST, CONF_PASSWORD
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import MQTT_PORT, MQTT_USERNAME, DOMAIN
+from .const import (
+    MQTT_PORT,
+    MQTT_USERNAME,
+    DOMAIN,
+    CONF_MQTT_TRANSPORT,
+    CONF_SUBSCRIPTION_MODE,
+    CONF_TRACE_LOG_SAMPLE_RATE,
+    CONF_PERSISTENT_SESSION,
+    DEFAULT_MQTT_TRANSPORT,
+    DEFAULT_SUBSCRIPTION_MODE,
+    DEFAULT_TRACE_LOG_SAMPLE_RATE,
+    DEFAULT_PERSISTENT_SESSION,
+    MQTT_TRANSPORT_ASYNCIO,
+    MQTT_TRANSPORT_THREAD,
+    SUBSCRIPTION_MODE_DEMAND,
+    SUBSCRIPTION_MODE_WILDCARD,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -87,6 +107,54 @@ class ConfigFlow(BaseConfigFlow, domain=DOMAIN):
             errors=errors
         )
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
+
+class OptionsFlowHandler(OptionsFlow):
+    """Handle TerraMow options."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ):
+        """Manage the TerraMow options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_MQTT_TRANSPORT,
+                    default=options.get(CONF_MQTT_TRANSPORT, DEFAULT_MQTT_TRANSPORT),
+                ): vol.In([MQTT_TRANSPORT_ASYNCIO, MQTT_TRANSPORT_THREAD]),
+                vol.Required(
+                    CONF_SUBSCRIPTION_MODE,
+                    default=options.get(CONF_SUBSCRIPTION_MODE, DEFAULT_SUBSCRIPTION_MODE),
+                ): vol.In([SUBSCRIPTION_MODE_DEMAND, SUBSCRIPTION_MODE_WILDCARD]),
+                vol.Required(
+                    CONF_TRACE_LOG_SAMPLE_RATE,
+                    default=options.get(
+                        CONF_TRACE_LOG_SAMPLE_RATE, DEFAULT_TRACE_LOG_SAMPLE_RATE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                vol.Required(
+                    CONF_PERSISTENT_SESSION,
+                    default=options.get(
+                        CONF_PERSISTENT_SESSION, DEFAULT_PERSISTENT_SESSION
+                    ),
+                ): bool,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
+
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
@@ -10,6 +10,91 @@ MQTT_USERNAME = "terramow"
 MAP_INFO_TOPIC = "map/current/info"
 MODEL_NAME_TOPIC = "model/name"
 
+# 默认型号名称，保持向后兼容
+DEFAULT_DEVICE_MODEL = "TerraMow S1200"
+
+# MQTT传输模式
+# asyncio: 在HA事件循环中直接驱动socket，消息无需跨线程调度
+# thread: 在独立线程中运行loop_forever（兼容回退方案）
+CONF_MQTT_TRANSPORT = "mqtt_transport"
+MQTT_TRANSPORT_ASYNCIO = "asyncio"
+MQTT_TRANSPORT_THREAD = "thread"
+DEFAULT_MQTT_TRANSPORT = MQTT_TRANSPORT_ASYNCIO
+
+# 订阅模式
+# wildcard: 使用单个 data_point/+/robot 通配符订阅
+# demand: 只订阅已注册回调的数据点，并随回调注册增减
+CONF_SUBSCRIPTION_MODE = "subscription_mode"
+SUBSCRIPTION_MODE_WILDCARD = "wildcard"
+SUBSCRIPTION_MODE_DEMAND = "demand"
+DEFAULT_SUBSCRIPTION_MODE = SUBSCRIPTION_MODE_DEMAND
+
+# 跟踪缓冲区：每个数据点保留最近的消息，每 N 条写一次调试日志（0 表示不写日志）
+CONF_TRACE_LOG_SAMPLE_RATE = "trace_log_sample_rate"
+DEFAULT_TRACE_LOG_SAMPLE_RATE = 10
+TRACE_BUFFER_SIZE = 20
+
+# 持久会话：使用固定的client id并关闭clean session，断线期间代理保留订阅
+CONF_PERSISTENT_SESSION = "persistent_session"
+DEFAULT_PERSISTENT_SESSION = False
+MQTT_CLIENT_ID_PREFIX = "terramow_ha_"
+
+# 断线重连等待时间 (单位: 秒)
+# 首次重试很快，之后从基础间隔开始指数退避直到上限，每次加入随机抖动
+MQTT_RECONNECT_FIRST_DELAY = 0.5
+MQTT_RECONNECT_BASE_DELAY = 2
+MQTT_RECONNECT_MAX_DELAY = 300
+
+# 集成设置时等待MQTT连接的超时时间，超时后稍后重试设置 (单位: 秒)
+SETUP_CONNECT_TIMEOUT = 10
+
+# 卸载后保留MQTT连接和数据缓存的时间，期间重新加载集成可直接复用 (单位: 秒)
+RELOAD_GRACE_PERIOD = 30
+DATA_PARKED_RUNTIMES = f"{DOMAIN}_parked_runtimes"
+
+# 断线期间缓存的待发送消息：最大数量和默认有效期 (单位: 秒)
+OUTBOUND_BUFFER_SIZE = 32
+OUTBOUND_TTL = 60
+
+# 等待机器人确认命令的超时时间 (单位: 秒)
+COMMAND_ACK_TIMEOUT = 10
+
+# 控制命令（开始/暂停/回充）限速：每秒令牌数和令牌桶容量
+COMMAND_RATE = 1.0
+COMMAND_BURST = 1
+
+# 等待机器人响应数据点请求的超时时间 (单位: 秒)
+REQUEST_TIMEOUT = 5
+
+# 服务: 重新查询版本兼容性信息（唯一有查询/响应行为的数据点）
+SERVICE_REFRESH_COMPATIBILITY_INFO = "refresh_compatibility_info"
+
+# MQTT接收与事件循环之间的消息队列
+# drop_oldest: 只保留最新值，新消息替换旧消息（遥测数据）
+# never: 每条消息都按顺序保留，从不丢弃
+# 每个键的最新值都不会被丢弃，超过队列大小时只记录溢出次数
+DROP_POLICY_OLDEST = "drop_oldest"
+DROP_POLICY_NEVER = "never"
+HANDOFF_QUEUE_SIZE = 32
+HANDOFF_DROP_POLICIES = {
+    107: DROP_POLICY_NEVER,  # 任务状态
+    MAP_INFO_TOPIC: DROP_POLICY_NEVER,
+}
+
+# 在事件循环中接收时，超过该大小的消息放到executor中解码 (单位: 字节)
+DECODE_EXECUTOR_THRESHOLD = 16 * 1024
+
+# 合并dp_155全局参数写入的时间窗口 (单位: 秒)
+GLOBAL_PARAMS_WRITE_DELAY = 0.5
+
+# 数据快照存储，重启后立即恢复实体状态；保存延迟 (单位: 秒)
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+
+# 等待设备确认dp_155字段写入的超时时间，超时后恢复为设备上报的值 (单位: 秒)
+# 包含合并窗口和排在前一条消息之后等待的时间
+PENDING_WRITE_TIMEOUT = 15
+
 # 版本兼容性相关常量
 # 当前插件支持的HA版本号
 CURRENT_HA_VERSION = 2
@@ -0,0 +1,237 @@
+"""Data coordinator for the TerraMow integration."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DEFAULT_DEVICE_MODEL,
+    DOMAIN,
+    MAP_INFO_TOPIC,
+    MODEL_NAME_TOPIC,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .models import (
+    BatteryStatus,
+    GlobalParams,
+    MapInfo,
+    MapStatus,
+    Schedule,
+    Statistics,
+    WorkData,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# 数据键: 数据点ID (int) 或特殊主题 (str)
+DataKey = int | str
+
+
+class TerraMowDataCoordinator:
+    """Hold the latest value of every data point of one mower.
+
+    The coordinator is owned by the config entry. Entities register the data
+    points they read; a reverse index from data point to listeners ensures
+    that an update only refreshes the entities depending on it.
+
+    The latest values are saved to a snapshot in the HA storage, debounced,
+    and restored on setup before the MQTT connection is up. Restored values
+    are stale until the robot reports the data point again.
+
+    The typed models of a data point are built on first access and cached
+    until the next payload arrives. The decoded payload is kept as well:
+    the snapshot, the dp_155 read-modify-write and the comparison of
+    retained messages need every field, including those not modeled.
+    """
+
+    def __init__(self, hass: HomeAssistant, host: str, entry_id: str) -> None:
+        """Initialize the coordinator."""
+        self.hass = hass
+        self.host = host
+        self.data: dict[DataKey, Any] = {}
+        self._models: dict[DataKey, Any] = {}  # 由当前数据构建的模型缓存
+        self._stale: set[DataKey] = set()  # 从快照恢复、尚未收到实时数据的键
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self._listeners: dict[DataKey, list[CALLBACK_TYPE]] = {}
+        self._demand_handlers: list[Callable[[DataKey, bool], None]] = []
+
+    def get(self, key: DataKey, default: Any = None) -> Any:
+        """Return the latest value of a data point."""
+        return self.data.get(key, default)
+
+    def is_current(self, key: DataKey, value: Any) -> bool:
+        """Return True if value equals the live value of a data point."""
+        return key not in self._stale and self.data.get(key) == value
+
+    def has_listeners(self, key: DataKey) -> bool:
+        """Return True if any entity depends on the data point."""
+        return key in self._listeners
+
+    def is_stale(self, key: DataKey) -> bool:
+        """Return True if the value was restored and not yet confirmed live."""
+        return key in self._stale
+
+    async def async_restore(self) -> None:
+        """Restore the values of the last snapshot."""
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return
+        for key, value in snapshot.items():
+            # JSON对象的键都是字符串，数据点ID还原为int
+            data_key: DataKey = int(key) if key.isdigit() else key
+            if data_key not in self.data:
+                self.data[data_key] = value
+                self._stale.add(data_key)
+        _LOGGER.debug("Restored %d values from the snapshot", len(self._stale))
+
+    @callback
+    def async_set_data(self, key: DataKey, value: Any) -> None:
+        """Store a new value and refresh the entities depending on it."""
+        self.data[key] = value
+        self._models.pop(key, None)
+        self._stale.discard(key)
+        self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        self.async_update_listeners(key)
+
+    async def async_remove_snapshot(self) -> None:
+        """Remove the snapshot, including a save that is still pending."""
+        await self._store.async_remove()
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the data to save."""
+        return {str(key): value for key, value in self.data.items()}
+
+    @callback
+    def async_update_listeners(self, key: DataKey) -> None:
+        """Refresh the entities depending on a data point."""
+        for listener in list(self._listeners.get(key, [])):
+            listener()
+
+    @callback
+    def async_add_listener(
+        self, keys: Iterable[DataKey], listener: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Call listener whenever one of the given data points is updated.
+
+        Returns a function that removes the listener again.
+        """
+        keys = tuple(keys)
+        for key in keys:
+            listeners = self._listeners.setdefault(key, [])
+            listeners.append(listener)
+            if len(listeners) == 1:
+                self._async_demand_changed(key, True)
+
+        @callback
+        def remove_listener() -> None:
+            for key in keys:
+                listeners = self._listeners.get(key)
+                if listeners and listener in listeners:
+                    listeners.remove(listener)
+                    if not listeners:
+                        del self._listeners[key]
+                        self._async_demand_changed(key, False)
+
+        return remove_listener
+
+    @callback
+    def async_add_demand_handler(
+        self, handler: Callable[[DataKey, bool], None]
+    ) -> CALLBACK_TYPE:
+        """Call handler when a data point gains its first or loses its last listener."""
+        self._demand_handlers.append(handler)
+        for key in self._listeners:
+            handler(key, True)
+
+        @callback
+        def remove_handler() -> None:
+            if handler in self._demand_handlers:
+                self._demand_handlers.remove(handler)
+
+        return remove_handler
+
+    @callback
+    def _async_demand_changed(self, key: DataKey, wanted: bool) -> None:
+        for handler in list(self._demand_handlers):
+            handler(key, wanted)
+
+    def _model[M](self, key: DataKey, model: type[M]) -> M | None:
+        """Return the cached model of a data point, None without data."""
+        try:
+            return self._models[key]
+        except KeyError:
+            pass
+        value = self.data.get(key)
+        if not value:
+            return None
+        instance = self._models[key] = model.from_dict(value)
+        return instance
+
+    def _int_value(self, key: DataKey, default: int | None = None) -> int | None:
+        """Return the int_value of a single value data point, None without data."""
+        value = self.data.get(key)
+        return value.get("int_value", default) if value else None
+
+    @property
+    def battery_level(self) -> int | None:
+        """Return battery level from dp_8."""
+        return self._int_value(8)
+
+    @property
+    def battery_status(self) -> BatteryStatus | None:
+        """Return battery status from dp_108."""
+        return self._model(108, BatteryStatus)
+
+    @property
+    def current_work_data(self) -> WorkData | None:
+        """Return current work data from dp_113."""
+        return self._model(113, WorkData)
+
+    @property
+    def map_status(self) -> MapStatus | None:
+        """Return map status from dp_117."""
+        return self._model(117, MapStatus)
+
+    @property
+    def statistics_data(self) -> Statistics | None:
+        """Return statistics data from dp_124."""
+        return self._model(124, Statistics)
+
+    @property
+    def base_station_time(self) -> int | None:
+        """Return used base station time in minutes from dp_125."""
+        return self._int_value(125, 0)
+
+    @property
+    def blade_time(self) -> int | None:
+        """Return used blade time in minutes from dp_126."""
+        return self._int_value(126, 0)
+
+    @property
+    def schedule_data(self) -> Schedule | None:
+        """Return schedule data from dp_138."""
+        return self._model(138, Schedule)
+
+    @property
+    def global_params(self) -> GlobalParams | None:
+        """Return global parameters from dp_155."""
+        return self._model(155, GlobalParams)
+
+    @property
+    def map_info(self) -> MapInfo | None:
+        """Return the current map info."""
+        return self._model(MAP_INFO_TOPIC, MapInfo)
+
+    @property
+    def device_model(self) -> str:
+        """Return the commercial model name of the device."""
+        return self.data.get(MODEL_NAME_TOPIC) or DEFAULT_DEVICE_MODEL
@@ -0,0 +1,99 @@
+"""Payload decoding stage for the TerraMow integration."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from . import codec
+from .transport import is_event_loop_thread
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PayloadDecoder:
+    """Decode payloads before they are handed over to the event loop.
+
+    Payloads are decoded inline on the MQTT receive side. When the receive
+    side is the event loop itself (asyncio transport), payloads of at least
+    ``executor_threshold`` bytes are decoded in the executor instead, so a
+    large map document cannot stall the loop. A generation number per key
+    discards an executor result that was overtaken by a newer message.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        deliver: Callable[[Any, Any], None],
+        executor_threshold: int,
+    ) -> None:
+        """Initialize the decoder; deliver receives key and decoded value."""
+        self._hass = hass
+        self._deliver = deliver
+        self._executor_threshold = executor_threshold
+        self._generations: dict[Any, int] = {}
+
+        # 统计信息
+        self.inline_decodes = 0
+        self.executor_decodes = 0
+        self.stale_discarded = 0
+        self.errors = 0
+
+    def submit(
+        self, key: Any, payload: bytes, decode: Callable[[bytes], Any] = codec.loads
+    ) -> None:
+        """Decode payload and deliver the result for key."""
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+
+        if len(payload) >= self._executor_threshold and is_event_loop_thread(
+            self._hass
+        ):
+            self.executor_decodes += 1
+            future = self._hass.async_add_executor_job(decode, payload)
+            future.add_done_callback(partial(self._async_decoded, key, generation))
+            return
+
+        self.inline_decodes += 1
+        try:
+            value = decode(payload)
+        except ValueError as err:
+            self._decode_failed(key, payload, err)
+            return
+        self._deliver(key, value)
+
+    def _async_decoded(self, key: Any, generation: int, future: Any) -> None:
+        """Deliver the result of an executor decode unless it is outdated."""
+        if self._generations.get(key) != generation:
+            # 解码期间已收到更新的消息
+            self.stale_discarded += 1
+            return
+        if future.cancelled():
+            return
+        try:
+            value = future.result()
+        except ValueError as err:
+            self._decode_failed(key, None, err)
+            return
+        self._deliver(key, value)
+
+    def _decode_failed(self, key: Any, payload: bytes | None, err: Exception) -> None:
+        self.errors += 1
+        if payload is not None:
+            _LOGGER.error("Invalid payload for %s: %s (%s)", key, payload[:200], err)
+        else:
+            _LOGGER.error("Invalid payload for %s: %s", key, err)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return decoder statistics for diagnostics."""
+        return {
+            "executor_threshold": self._executor_threshold,
+            "inline_decodes": self.inline_decodes,
+            "executor_decodes": self.executor_decodes,
+            "stale_discarded": self.stale_discarded,
+            "errors": self.errors,
+        }
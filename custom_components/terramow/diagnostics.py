@@ -0,0 +1,50 @@
+"""Diagnostics support for the TerraMow integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from . import TerraMowBasicData, codec
+from .const import DOMAIN
+
+TO_REDACT = {CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    basic_data: TerraMowBasicData = hass.data[DOMAIN][entry.entry_id]
+    lawn_mower = basic_data.lawn_mower
+
+    diagnostics: dict[str, Any] = {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": dict(entry.options),
+        "mqtt_transport": basic_data.mqtt_transport,
+        "data_points": sorted(map(str, basic_data.coordinator.data)),
+        "setup_timings": basic_data.setup_timings,
+    }
+    if lawn_mower is not None:
+        diagnostics["connection"] = lawn_mower.reconnect.as_dict()
+        diagnostics["subscriptions"] = lawn_mower.subscriptions.as_dict()
+        diagnostics["suppressed_duplicates"] = lawn_mower.fingerprints.as_dict()
+        diagnostics["retained"] = {
+            "received": lawn_mower.retained_received,
+            "unchanged": lawn_mower.retained_unchanged,
+        }
+        diagnostics["decoder"] = {
+            "codec": codec.CODEC_NAME,
+            **lawn_mower.decoder.as_dict(),
+        }
+        diagnostics["handoff_queue"] = lawn_mower.handoff.as_dict()
+        diagnostics["outbound_buffer"] = lawn_mower.outbox.as_dict()
+        diagnostics["commands"] = lawn_mower.commands.as_dict()
+        diagnostics["command_limiter"] = lawn_mower.command_limiter.as_dict()
+        diagnostics["global_params_writer"] = lawn_mower.params_writer.as_dict()
+        diagnostics["trace"] = lawn_mower.trace.as_dict()
+    return diagnostics
@@ -0,0 +1,68 @@
+"""Base entity for the TerraMow integration."""
+
+from __future__ import annotations
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+
+from . import TerraMowBasicData
+from .coordinator import DataKey, TerraMowDataCoordinator
+from .models import GlobalParams
+
+
+class TerraMowDataPointEntity(Entity):
+    """Entity that is refreshed when one of its data points changes.
+
+    Subclasses list the data points they read in ``_data_point_ids``; the
+    entity state is written once per update of any of them instead of being
+    polled. Values are read from the coordinator of the config entry.
+    """
+
+    _attr_should_poll = False
+    _data_point_ids: tuple[DataKey, ...] = ()
+
+    basic_data: TerraMowBasicData
+
+    @property
+    def coordinator(self) -> TerraMowDataCoordinator:
+        """Return the data coordinator of the device."""
+        return self.basic_data.coordinator
+
+    @property
+    def global_params(self) -> GlobalParams | None:
+        """Return dp_155 with the requested values of unconfirmed writes applied."""
+        lawn_mower = self.basic_data.lawn_mower
+        if lawn_mower is None or not lawn_mower.params_writer.pending_writes.has_pending:
+            return self.coordinator.global_params
+        # 只在写入等待确认期间构建临时模型
+        return GlobalParams.from_dict(
+            lawn_mower.params_writer.pending_writes.apply(self.coordinator.get(155))
+        )
+
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while a data point only holds a restored value."""
+        return any(self.coordinator.is_stale(key) for key in self._data_point_ids)
+
+    def is_write_pending(self, key: str) -> bool:
+        """Return True if a write of a dp_155 field waits for confirmation."""
+        lawn_mower = self.basic_data.lawn_mower
+        return (
+            lawn_mower is not None
+            and lawn_mower.params_writer.pending_writes.is_pending(key)
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates of the data points of this entity."""
+        await super().async_added_to_hass()
+        if self._data_point_ids:
+            self.async_on_remove(
+                self.coordinator.async_add_listener(
+                    self._data_point_ids, self._handle_data_point_update
+                )
+            )
+
+    @callback
+    def _handle_data_point_update(self) -> None:
+        """Write the entity state after one of its data points changed."""
+        self.async_write_ha_state()
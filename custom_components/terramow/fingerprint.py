@@ -0,0 +1,44 @@
+"""Payload change detection for the TerraMow integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class PayloadFingerprints:
+    """Detect payloads that are byte-identical to the last one of a topic.
+
+    The firmware republishes some data points with unchanged content (status
+    heartbeats, retained messages after a reconnect). A fingerprint made of
+    the payload length and its hash is kept per topic so such duplicates can
+    be dropped before they are decoded or scheduled on the event loop.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the fingerprint table."""
+        self._fingerprints: dict[str, tuple[int, int]] = {}
+        self.checked = 0
+        self.suppressed = 0
+        self.suppressed_by_topic: dict[str, int] = {}
+
+    def is_duplicate(self, topic: str, payload: bytes) -> bool:
+        """Return True if payload equals the last payload of the topic.
+
+        A payload that differs is remembered as the new reference.
+        """
+        self.checked += 1
+        fingerprint = (len(payload), hash(payload))
+        if self._fingerprints.get(topic) == fingerprint:
+            self.suppressed += 1
+            self.suppressed_by_topic[topic] = self.suppressed_by_topic.get(topic, 0) + 1
+            return True
+        self._fingerprints[topic] = fingerprint
+        return False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return suppression statistics for diagnostics."""
+        return {
+            "checked": self.checked,
+            "suppressed": self.suppressed,
+            "suppressed_by_topic": dict(self.suppressed_by_topic),
+        }
@@ -0,0 +1,318 @@
+"""Coalescing writer for the dp_155 global parameters of the TerraMow integration."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .coordinator import TerraMowDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# 决定嵌套配置中哪个子配置有效的字段
+MODE_KEYS = ("mode", "type")
+
+
+def merge_params(target: dict, changes: dict) -> dict:
+    """Merge changes into target recursively; lists and scalars are replaced.
+
+    When changes switch the mode or type of a config, the sub-configs of the
+    previous mode are dropped: the robot echoes only the sub-config of the
+    active mode, so a write keeping them would never be confirmed.
+    """
+    if any(key in changes and changes[key] != target.get(key) for key in MODE_KEYS):
+        for key in [key for key, value in target.items() if isinstance(value, dict)]:
+            if key not in changes:
+                del target[key]
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge_params(target[key], value)
+        elif isinstance(value, dict):
+            target[key] = merge_params({}, value)
+        else:
+            target[key] = value
+    return target
+
+
+def is_applied(value: Any, known: Any) -> bool:
+    """Return True if every leaf of value already equals the known value."""
+    if isinstance(value, dict):
+        return isinstance(known, dict) and all(
+            key in known and is_applied(sub_value, known[key])
+            for key, sub_value in value.items()
+        )
+    return value == known
+
+
+@dataclass
+class PendingWrite:
+    """A dp_155 field value waiting for the robot to confirm it."""
+
+    value: Any
+    requested_at: float
+    timer: asyncio.TimerHandle | None = field(default=None, repr=False)
+
+
+class PendingWriteTracker:
+    """Show requested dp_155 values until the robot confirms them.
+
+    Every top level field written is pending until a dp_155 echo contains
+    the requested value, and the entities show the requested value in the
+    meantime. A field that is not confirmed within ``timeout`` seconds is
+    rolled back to the value last reported by the robot. The time to
+    confirm is recorded per field.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TerraMowDataCoordinator,
+        timeout: float,
+        history: int = 20,
+    ) -> None:
+        """Initialize the tracker."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._timeout = timeout
+        self._history = history
+        self._pending: dict[str, PendingWrite] = {}
+        self._confirm_times: dict[str, deque[float]] = {}
+
+        # 统计信息
+        self.confirmed = 0
+        self.rolled_back = 0
+
+    @property
+    def has_pending(self) -> bool:
+        """Return True if any write waits for confirmation."""
+        return bool(self._pending)
+
+    def is_pending(self, key: str) -> bool:
+        """Return True if a write of the field waits for confirmation."""
+        return key in self._pending
+
+    def apply(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Return params with the requested values of pending fields applied."""
+        if not self._pending:
+            return params
+        params = copy.deepcopy(params or {})
+        for key, pending in self._pending.items():
+            merge_params(params, {key: pending.value})
+        return params
+
+    @callback
+    def async_request(self, changes: dict[str, Any]) -> None:
+        """Mark the written fields pending and show their requested values."""
+        now = time.monotonic()
+        for key, value in changes.items():
+            pending = self._pending.get(key)
+            if pending is not None:
+                # 同一字段的多次写入合并，重新计时
+                if pending.timer is not None:
+                    pending.timer.cancel()
+                if isinstance(value, dict) and isinstance(pending.value, dict):
+                    value = merge_params(copy.deepcopy(pending.value), value)
+            pending = self._pending[key] = PendingWrite(copy.deepcopy(value), now)
+            pending.timer = self._hass.loop.call_later(
+                self._timeout, self._async_timeout, key
+            )
+        self._coordinator.async_update_listeners(155)
+
+    @callback
+    def async_reconcile(self, params: dict[str, Any]) -> None:
+        """Confirm the pending fields that params report as applied."""
+        for key, pending in list(self._pending.items()):
+            if not is_applied(pending.value, params.get(key)):
+                continue
+            del self._pending[key]
+            if pending.timer is not None:
+                pending.timer.cancel()
+            confirm_time = time.monotonic() - pending.requested_at
+            self.confirmed += 1
+            self._confirm_times.setdefault(
+                key, deque(maxlen=self._history)
+            ).append(confirm_time)
+            _LOGGER.debug("Write of %s confirmed after %.3fs", key, confirm_time)
+
+    @callback
+    def _async_timeout(self, key: str) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        self.rolled_back += 1
+        _LOGGER.warning(
+            "Write of %s not confirmed within %ss, showing the reported value again",
+            key, self._timeout,
+        )
+        self._coordinator.async_update_listeners(155)
+
+    @callback
+    def async_cancel_all(self) -> None:
+        """Stop tracking all pending fields."""
+        for pending in self._pending.values():
+            if pending.timer is not None:
+                pending.timer.cancel()
+        self._pending = {}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return confirmation statistics for diagnostics."""
+        return {
+            "timeout": self._timeout,
+            "pending": sorted(self._pending),
+            "confirmed": self.confirmed,
+            "rolled_back": self.rolled_back,
+            "time_to_confirm": {
+                key: {
+                    "samples": len(times),
+                    "last": times[-1],
+                    "mean": sum(times) / len(times),
+                    "max": max(times),
+                }
+                for key, times in self._confirm_times.items()
+            },
+        }
+
+
+class GlobalParamsWriter:
+    """Merge dp_155 writes of a device into as few publishes as possible.
+
+    Writes made within ``delay`` seconds of the first one are merged into a
+    single message. Before publishing, top level fields whose values already
+    match the last known global parameters are stripped, and nothing is sent
+    when no field is left.
+
+    Messages are sent strictly one after another: while a message waits for
+    the robot to echo it, new writes keep being merged and are sent once the
+    echo arrived or timed out. ``latest`` returns the parameters including
+    all writes not yet echoed, so changes are read-modify-written on top of
+    each other instead of on the last echo. Reading ``latest`` and calling
+    ``async_write`` without awaiting in between is atomic in the event loop.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TerraMowDataCoordinator,
+        send: Callable[[dict], asyncio.Future],
+        delay: float,
+        confirm_timeout: float,
+    ) -> None:
+        """Initialize the writer.
+
+        send publishes a dp_155 command and returns a future that resolves
+        with the echo of the robot, or None if it did not arrive in time.
+        """
+        self._hass = hass
+        self._coordinator = coordinator
+        self._send = send
+        self._delay = delay
+        self._pending: dict[str, Any] = {}
+        self._in_flight: dict[str, Any] | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        # 设备确认前，实体显示请求的值
+        self.pending_writes = PendingWriteTracker(hass, coordinator, confirm_timeout)
+
+        # 统计信息
+        self.writes = 0
+        self.publishes = 0
+        self.stripped_fields = 0
+        self.unconfirmed = 0
+
+    @property
+    def latest(self) -> dict[str, Any]:
+        """Return the global parameters with all unconfirmed writes applied."""
+        params = copy.deepcopy(self._coordinator.get(155) or {})
+        if self._in_flight:
+            merge_params(params, self._in_flight)
+        return merge_params(params, self._pending)
+
+    @callback
+    def async_write(self, changes: dict[str, Any]) -> None:
+        """Queue changes of the global parameters."""
+        self.writes += 1
+        merge_params(self._pending, changes)
+        self.pending_writes.async_request(changes)
+        self._async_schedule_flush()
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        # 上一条消息确认前不发送新消息，确认后再调度
+        if self._timer is None and self._in_flight is None and self._pending:
+            self._timer = self._hass.loop.call_later(self._delay, self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Publish the merged changes that differ from the known parameters."""
+        self._timer = None
+        if self._in_flight is not None:
+            return
+        pending, self._pending = self._pending, {}
+        known = self._coordinator.get(155) or {}
+        # 已与设备参数相同的字段不会再有确认消息
+        self.pending_writes.async_reconcile(known)
+
+        command = {}
+        for key, value in pending.items():
+            if is_applied(value, known.get(key)):
+                # 与设备当前参数相同，无需发送
+                self.stripped_fields += 1
+            else:
+                command[key] = value
+        if not command:
+            _LOGGER.debug("Global parameter changes already applied, nothing to send")
+            return
+
+        self.publishes += 1
+        self._in_flight = command
+        _LOGGER.debug("Publishing global parameter changes: %s", command)
+        self._send(command).add_done_callback(self._async_sent)
+
+    @callback
+    def _async_sent(self, future: asyncio.Future) -> None:
+        """Send the next message once the previous one was echoed or timed out."""
+        if self._in_flight is None:
+            # 写入已被取消
+            return
+        if future.cancelled() or future.result() is None:
+            self.unconfirmed += 1
+            _LOGGER.warning("Global parameter changes not confirmed: %s", self._in_flight)
+        self._in_flight = None
+        self._async_schedule_flush()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the changes that were not confirmed yet."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = {}
+        self._in_flight = None
+        self.pending_writes.async_cancel_all()
+
+    @property
+    def saved_publishes(self) -> int:
+        """Return how many publishes were saved by merging and stripping."""
+        return self.writes - self.publishes
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return writer statistics for diagnostics."""
+        return {
+            "delay": self._delay,
+            "pending": sorted(self._pending),
+            "in_flight": sorted(self._in_flight or {}),
+            "writes": self.writes,
+            "publishes": self.publishes,
+            "saved_publishes": self.saved_publishes,
+            "stripped_fields": self.stripped_fields,
+            "unconfirmed": self.unconfirmed,
+            "pending_writes": self.pending_writes.as_dict(),
+        }
@@ -0,0 +1,110 @@
+"""Bounded handoff between MQTT receive and the event loop."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DROP_POLICY_NEVER, DROP_POLICY_OLDEST
+from .transport import is_event_loop_thread
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HandoffQueue:
+    """Hand decoded messages over to the event loop with bounded backlog.
+
+    Keys (data point IDs or special topics) with the drop-oldest policy have
+    a single slot: a message replaces the pending value of its key, so their
+    backlog is bounded by the number of keys. Keys with the never-drop policy
+    queue every message in order. The latest value of a key is never
+    discarded: its payload fingerprint is already recorded, so an identical
+    republish would be suppressed and the state lost until the payload
+    changes. Going over the size limit is counted as overflow instead. All
+    pending entries are flushed in one event loop callback per tick.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        flush: Callable[[Any, Any], None],
+        maxsize: int,
+        policies: Mapping[Any, str] | None = None,
+    ) -> None:
+        """Initialize the queue; flush is called with key and value in the loop."""
+        self._hass = hass
+        self._flush = flush
+        self._maxsize = maxsize
+        self._policies = dict(policies or {})
+        self._lock = threading.Lock()
+        # 可丢弃的键直接作为条目键；不可丢弃的消息使用 (键, 序号) 保证每条都保留
+        self._pending: OrderedDict[Any, tuple[Any, Any]] = OrderedDict()
+        self._counter = itertools.count()
+        self._flush_scheduled = False
+
+        # 统计信息
+        self.messages_put = 0
+        self.messages_coalesced = 0
+        self.flushes = 0
+        self.high_water = 0
+        self.overflow = 0
+
+    def policy(self, key: Any) -> str:
+        """Return the drop policy of a key."""
+        return self._policies.get(key, DROP_POLICY_OLDEST)
+
+    def put(self, key: Any, value: Any) -> None:
+        """Queue the newest value of key and schedule a flush if needed."""
+        with self._lock:
+            self.messages_put += 1
+            if self.policy(key) == DROP_POLICY_NEVER:
+                self._pending[(key, next(self._counter))] = (key, value)
+            else:
+                if key in self._pending:
+                    self.messages_coalesced += 1
+                    del self._pending[key]
+                self._pending[key] = (key, value)
+            if len(self._pending) > self._maxsize:
+                # 不丢弃任何键的最新值，允许超出上限
+                self.overflow += 1
+            self.high_water = max(self.high_water, len(self._pending))
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+
+        if is_event_loop_thread(self._hass):
+            self._hass.loop.call_soon(self._async_flush)
+        else:
+            self._hass.loop.call_soon_threadsafe(self._async_flush)
+
+    def _async_flush(self) -> None:
+        """Deliver all pending values in the event loop."""
+        with self._lock:
+            pending = self._pending
+            self._pending = OrderedDict()
+            self._flush_scheduled = False
+            self.flushes += 1
+
+        for key, value in pending.values():
+            try:
+                self._flush(key, value)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error dispatching %s", key)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return queue statistics for diagnostics."""
+        return {
+            "depth": len(self._pending),
+            "maxsize": self._maxsize,
+            "high_water": self.high_water,
+            "messages_put": self.messages_put,
+            "messages_coalesced": self.messages_coalesced,
+            "flushes": self.flushes,
+            "overflow": self.overflow,
+        }
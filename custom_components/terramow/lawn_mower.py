@@ -1,87 +1,74 @@
+import asyncio
 import threading
 import paho.mqtt.client as mqtt_client
 import logging
-import time
-import re
-import json
 import random
-from typing import Callable, Any
+from collections.abc import Callable
+from typing import Any
 from homeassistant.components.lawn_mower import LawnMowerEntity
 from homeassistant.components.lawn_mower.const import LawnMowerActivity, LawnMowerEntityFeature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HassJob, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers import device_registry as dr
 
 from . import TerraMowBasicData
 from homeassistant.config_entries import ConfigEntry
-from .const import MQTT_PORT, MQTT_USERNAME, DOMAIN, COMPATIBILITY_INFO_DP, CompatibilityStatus, MODEL_NAME_TOPIC
+from .const import (
+    MQTT_PORT,
+    MQTT_USERNAME,
+    MQTT_CLIENT_ID_PREFIX,
+    DOMAIN,
+    COMPATIBILITY_INFO_DP,
+    CompatibilityStatus,
+    MODEL_NAME_TOPIC,
+    MAP_INFO_TOPIC,
+    MQTT_TRANSPORT_THREAD,
+    MQTT_RECONNECT_FIRST_DELAY,
+    MQTT_RECONNECT_BASE_DELAY,
+    MQTT_RECONNECT_MAX_DELAY,
+    HANDOFF_QUEUE_SIZE,
+    HANDOFF_DROP_POLICIES,
+    DECODE_EXECUTOR_THRESHOLD,
+    TRACE_BUFFER_SIZE,
+    COMMAND_ACK_TIMEOUT,
+    REQUEST_TIMEOUT,
+    GLOBAL_PARAMS_WRITE_DELAY,
+    PENDING_WRITE_TIMEOUT,
+    COMMAND_RATE,
+    COMMAND_BURST,
+    OUTBOUND_BUFFER_SIZE,
+    OUTBOUND_TTL,
+)
+from . import codec
+from .commands import AckPredicate, CommandTracker
+from .decoder import PayloadDecoder
+from .fingerprint import PayloadFingerprints
+from .global_params import GlobalParamsWriter, is_applied
+from .handoff import HandoffQueue
+from .models import (
+    BatteryStatus,
+    GlobalParams,
+    MapInfo,
+    MapStatus,
+    Mission,
+    MissionState,
+    MissionStatus,
+    Schedule,
+    Statistics,
+    SubMission,
+    WorkData,
+)
+from .outbox import OutboundBuffer
+from .ratelimit import CommandRateLimiter
+from .reconnect import ReconnectPolicy
+from .routing import TopicRouter
+from .subscription import SubscriptionManager
+from .trace import TRACE_RECEIVED, TRACE_SENT, TraceBuffer
+from .transport import AsyncioMqttLoop, is_event_loop_thread
 
 _LOGGER = logging.getLogger(__name__)
 
-# 定义正则表达式模式
-TOPIC_PATTERN = re.compile(r"^data_point/(\d+)/robot$")
-
-from enum import Enum
-
-class Mission(Enum):
-    MISSION_IDLE = "MISSION_IDLE"
-    MISSION_RECHARGE = "MISSION_RECHARGE"
-    MISSION_GLOBAL_CLEAN = "MISSION_GLOBAL_CLEAN"
-    MISSION_BUILD_MAP = "MISSION_BUILD_MAP"
-    MISSION_BUILD_MAP_AND_CLEAN = "MISSION_BUILD_MAP_AND_CLEAN"
-    MISSION_TEMPORARY_CLEAN = "MISSION_TEMPORARY_CLEAN"
-    MISSION_BACK_TO_STARTING_POINT = "MISSION_BACK_TO_STARTING_POINT"
-    MISSION_REMOTE_CONTROL_CLEAN = "MISSION_REMOTE_CONTROL_CLEAN"
-    MISSION_SCHEDULE_GLOBAL_CLEAN = "MISSION_SCHEDULE_GLOBAL_CLEAN"
-    MISSION_SCHEDULE_BUILD_MAP_AND_CLEAN = "MISSION_SCHEDULE_BUILD_MAP_AND_CLEAN"
-    MISSION_SELECT_REGION_CLEAN = "MISSION_SELECT_REGION_CLEAN"
-    MISSION_CREATE_CUSTOM_PASSAGE = "MISSION_CREATE_CUSTOM_PASSAGE"
-    MISSION_BACKUP_MAP = "MISSION_BACKUP_MAP"
-    MISSION_RELOCATE_BASE_STATION = "MISSION_RELOCATE_BASE_STATION"
-    MISSION_USER_AUTO_CALIBRATION = "MISSION_USER_AUTO_CALIBRATION"
-    MISSION_RESTORE_BACKUP_MAP = "MISSION_RESTORE_BACKUP_MAP"
-    MISSION_SCHEDULE_SELECT_REGION_CLEAN = "MISSION_SCHEDULE_SELECT_REGION_CLEAN"
-    MISSION_DRAW_REGION_CLEAN = "MISSION_DRAW_REGION_CLEAN"
-    MISSION_EDGE_TRIM_CLEAN = "MISSION_EDGE_TRIM_CLEAN"
-    MISSION_UPDATE_BACKUP_MAP = "MISSION_UPDATE_BACKUP_MAP"
-
-class SubMission(Enum):
-    SUB_MISSION_IDLE = "SUB_MISSION_IDLE"
-    SUB_MISSION_RELOCATION = "SUB_MISSION_RELOCATION"
-    SUB_MISSION_RETURN_TO_BASE = "SUB_MISSION_RETURN_TO_BASE"
-    SUB_MISSION_OUT_OF_STATION = "SUB_MISSION_OUT_OF_STATION"
-    SUB_MISSION_REMOTE_CONTROL = "SUB_MISSION_REMOTE_CONTROL"
-    SUB_MISSION_SAVING_MAP = "SUB_MISSION_SAVING_MAP"
-    SUB_MISSION_SETTING_BLADE_HEIGHT = "SUB_MISSION_SETTING_BLADE_HEIGHT"
-    SUB_MISSION_CHARGING = "SUB_MISSION_CHARGING"
-    SUB_MISSION_REMOTE_CONTROL_CLEAN = "SUB_MISSION_REMOTE_CONTROL_CLEAN"
-    SUB_MISSION_DEFOGGING = "SUB_MISSION_DEFOGGING"
-    SUB_MISSION_WAIT_FOR_DAYLIGHT = "SUB_MISSION_WAIT_FOR_DAYLIGHT"
-    SUB_MISSION_COOLING_DOWN_MOTOR = "SUB_MISSION_COOLING_DOWN_MOTOR"
-    SUB_MISSION_WAIT_FOR_RAIN_TO_STOP = "SUB_MISSION_WAIT_FOR_RAIN_TO_STOP"
-    SUB_MISSION_FLEXIBLE_STATION_WAIT = "SUB_MISSION_FLEXIBLE_STATION_WAIT"
-
-class MissionState(Enum):
-    MISSION_STATE_IDLE = "MISSION_STATE_IDLE"
-    MISSION_STATE_RUNNING = "MISSION_STATE_RUNNING"
-    MISSION_STATE_PAUSE = "MISSION_STATE_PAUSE"
-    MISSION_STATE_ABORT = "MISSION_STATE_ABORT"
-    MISSION_STATE_COMPLETE = "MISSION_STATE_COMPLETE"
-
-class PowerMode(Enum):
-    POWER_MODE_RUNNING = "POWER_MODE_RUNNING"
-    POWER_MODE_STANDBY = "POWER_MODE_STANDBY"
-    POWER_MODE_HIBERNATE = "POWER_MODE_HIBERNATE"
-
-class BackToStationReason(Enum):
-    BACK_TO_STATION_REASON_NONE = "BACK_TO_STATION_REASON_NONE"
-    BACK_TO_STATION_REASON_LOW_BATTERY = "BACK_TO_STATION_REASON_LOW_BATTERY"
-    BACK_TO_STATION_REASON_RAINING = "BACK_TO_STATION_REASON_RAINING"
-    BACK_TO_STATION_REASON_MOW_MOTOR_OVERHEAT = "BACK_TO_STATION_REASON_MOW_MOTOR_OVERHEAT"
-    BACK_TO_STATION_REASON_WHEEL_OVERHEAT = "BACK_TO_STATION_REASON_WHEEL_OVERHEAT"
-    BACK_TO_STATION_REASON_NIGHT_TIME = "BACK_TO_STATION_REASON_NIGHT_TIME"
-
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -90,48 +77,63 @@ async def async_setup_entry(
     """Set up the TerraMow entity."""
     # 从 hass.data 获取数据而不是 config_entry.runtime_data
     basic_data = hass.data[DOMAIN][config_entry.entry_id]
-    
-    # 创建实体
-    entity = TerraMowLawnMowerEntity(basic_data, hass)
 
-    # 添加实体
-    async_add_entities([entity])
+    # MQTT连接已在集成设置时创建，实体只附加到该连接，平台重新加载时连接保持不变
+    async_add_entities([TerraMowLawnMowerEntity(basic_data.lawn_mower)])
 
-    # 启动 MQTT 客户端
-    entity.start_mqtt_client()
+class TerraMowLawnMower:
+    """MQTT connection, data cache and commands of one mower.
 
-class TerraMowLawnMowerEntity(LawnMowerEntity):
-    _attr_has_entity_name = True
-    # 使用默认图标
-    _attr_icon = "mdi:robot-mower"
-    _attr_translation_key = "lawn_mower"
+    The runtime belongs to the config entry rather than to an entity, so a
+    reload of the platforms reattaches new entities to the running
+    connection. The lawn mower entity attaches itself as ``entity`` to get
+    its state written.
+    """
 
     def __init__(
         self,
         basic_data: TerraMowBasicData,
         hass: HomeAssistant,
     ) -> None:
-        """Initialize a lawn mower."""
-        super().__init__()
+        """Initialize the runtime of a lawn mower."""
         self.basic_data = basic_data
         self.host = self.basic_data.host
         self.password = self.basic_data.password
         self.hass = hass
         self._activity = LawnMowerActivity.DOCKED  # 默认状态
         self.mqtt_client = None
+        self.mqtt_transport = self.basic_data.mqtt_transport
         self._stop_event = threading.Event()  # 用于停止重连循环
+        self._mqtt_task: asyncio.Task | None = None  # asyncio传输模式下的连接任务
+        self._connect_future: asyncio.Future | None = None  # executor中执行的connect()
+        self._mqtt_disconnected = asyncio.Event()  # asyncio传输模式下的断线通知
+        self._mqtt_connected = asyncio.Event()  # 已连接并通过认证
+        # 重连退避策略和连接状态统计
+        self.reconnect = ReconnectPolicy(
+            MQTT_RECONNECT_FIRST_DELAY, MQTT_RECONNECT_BASE_DELAY, MQTT_RECONNECT_MAX_DELAY
+        )
         self.callbacks: dict[int, list[Callable]] = {}  # 存储 dp_id 和对应的回调函数列表
+        self.coordinator = self.basic_data.coordinator  # 存储所有数据点的最新数据
+        self.subscriptions = SubscriptionManager(self.basic_data.subscription_mode)
+        self.router = TopicRouter()  # 主题到分发目标的映射表
+        self.outbox = OutboundBuffer(OUTBOUND_BUFFER_SIZE, OUTBOUND_TTL)  # 断线期间缓存待发送消息
+        self.fingerprints = PayloadFingerprints()  # 用于丢弃内容未变化的重复消息
+        self.trace = TraceBuffer(TRACE_BUFFER_SIZE, self.basic_data.trace_log_sample_rate)
+        # 有界消息队列，每轮事件循环统一分发一次
+        self.handoff = HandoffQueue(
+            hass, self._async_dispatch, HANDOFF_QUEUE_SIZE, HANDOFF_DROP_POLICIES
+        )
+        # 在接收端解码，大消息在executor中解码
+        self.decoder = PayloadDecoder(
+            hass, self.handoff.put, DECODE_EXECUTOR_THRESHOLD
+        )
         self.map_callbacks: list[Callable] = []  # 存储地图信息回调函数
-        self._map_info: dict[str, Any] = {}  # 存储当前地图信息
-        self._global_params: dict[str, Any] = {}  # 存储dp_155全局作业参数
-        self._map_status: dict[str, Any] = {}  # 存储dp_117地图状态
-        self._current_work_data: dict[str, Any] = {}  # 存储dp_113当前作业数据
-        self._statistics_data: dict[str, Any] = {}  # 存储dp_124作业统计数据
-        self._base_station_time: dict[str, Any] = {}  # 存储dp_125基站使用时间
-        self._blade_time: dict[str, Any] = {}  # 存储dp_126刀盘使用时间
-        self._schedule_data: dict[str, Any] = {}  # 存储dp_138即将到来的预约
-        self._battery_status: dict[str, Any] = {} # Store dp_108 battery status
-        self._device_model: str = "TerraMow S1200"  # 默认型号名称，保持向后兼容
+        self.entity: TerraMowLawnMowerEntity | None = None  # 当前附加的割草机实体
+        self._subscriptions_held = False  # 平台重新加载期间保留订阅
+        # 实体依赖的数据点同样需要订阅
+        self._remove_demand_handler = self.coordinator.async_add_demand_handler(
+            self._on_data_point_demand
+        )
         self.basic_data.lawn_mower = self
 
         # 机器人状态
@@ -141,39 +143,30 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
         self.has_error = False
 
         self.cmd_seq = random.randint(0, 0xFFFFFFFF)  # 生成随机的指令序号
+        self.commands = CommandTracker(hass, COMMAND_ACK_TIMEOUT)  # 跟踪命令确认和延迟
+        self._pending_requests: dict[int, int] = {}  # 等待响应的数据点及请求数量
+        self._retained_keys: set[int | str] = set()  # 待与缓存比较的保留消息
+        self.retained_received = 0
+        self.retained_unchanged = 0
+        # 合并短时间内的dp_155写入，只发送与设备参数不同的字段，并按顺序逐条确认
+        self.params_writer = GlobalParamsWriter(
+            hass, self.coordinator, self._async_send_global_params,
+            GLOBAL_PARAMS_WRITE_DELAY, PENDING_WRITE_TIMEOUT,
+        )
 
-        self._last_control_time = time.monotonic()
-        self._control_interval = 1.0 # 控制间隔时间
+        # 控制命令限速，过快的命令排队，只保留最新的意图
+        self.command_limiter = CommandRateLimiter(hass, COMMAND_RATE, COMMAND_BURST)
 
         self._has_returning = hasattr(LawnMowerActivity, 'RETURNING')
         if not self._has_returning:
             _LOGGER.info("LawnMowerActivity.RETURNING not available in this HA version")
 
-        _LOGGER.info("TerraMowLawnMowerEntity created with host %s", self.host)
+        _LOGGER.info("TerraMowLawnMower created with host %s", self.host)
         _LOGGER.debug("Initialization params: host=%s, password=%s", self.host, self.password)
         _LOGGER.debug("Initial state: activity=%s, mission=%s, sub_mission=%s", 
                      self._activity, self.mission, self.sub_mission)
 
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
-            name='TerraMow',
-            manufacturer='TerraMow',
-            model=self._device_model
-        )
-
-    def _can_accept_command(self):
-        """Check if control commands can be accepted"""
-        now = time.monotonic()
-        if now - self._last_control_time < self._control_interval:
-            _LOGGER.info("Request too quick, skip it")
-            return False
-        self._last_control_time = now
-        return True
-
     def _get_mow_missions(self):
         """Get the list of mowing missions"""
         return [
@@ -196,12 +189,6 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
             Mission.MISSION_BACK_TO_STARTING_POINT
         ]
 
-    @property
-    def unique_id(self):
-        """Return a unique ID for this entity."""
-        return f"lawn_mower.terramow@{self.host}"
-
-
     @property
     def activity(self) -> LawnMowerActivity:
         """Return the current activity of the lawn mower."""
@@ -215,29 +202,59 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
         _LOGGER.info("Activity changed from %s to %s", old_activity, value)
         _LOGGER.debug("State change details: mission=%s, sub_mission=%s, mission_state=%s, has_error=%s",
                      self.mission, self.sub_mission, self.mission_state, self.has_error)
-        self.schedule_update_ha_state()
+        self._write_state()
 
-    @property
-    def supported_features(self) -> LawnMowerEntityFeature:
-        """Flag lawn mower features that are supported."""
-        return LawnMowerEntityFeature.START_MOWING | LawnMowerEntityFeature.PAUSE | LawnMowerEntityFeature.DOCK
+    def _write_state(self) -> None:
+        """Write the state of the attached entity."""
+        if self.entity is not None:
+            self.entity.write_state()
+
+    def _call_in_loop(self, func: Callable[[], Any]) -> None:
+        """Call a function in the event loop from any thread."""
+        if is_event_loop_thread(self.hass):
+            func()
+        else:
+            self.hass.loop.call_soon_threadsafe(func)
+
+    def _run_job(self, target: Callable, *args: Any) -> None:
+        """Run a callback on the event loop, hopping threads only when needed."""
+        if is_event_loop_thread(self.hass):
+            self.hass.async_run_hass_job(HassJob(target), *args)
+        else:
+            self.hass.add_job(target, *args)
 
     def start_mqtt_client(self):
-        """Start the MQTT client in a separate thread."""
-        _LOGGER.info("Starting MQTT client, connecting to %s:%d", self.host, MQTT_PORT)
+        """Start the MQTT client using the configured transport."""
+        _LOGGER.info("Starting MQTT client (%s transport), connecting to %s:%d",
+                     self.mqtt_transport, self.host, MQTT_PORT)
         _LOGGER.debug("MQTT connection params: username=%s, password=%s", MQTT_USERNAME, self.password)
         
-        self.mqtt_client = mqtt_client.Client()
+        if self.basic_data.persistent_session:
+            # 固定client id并保留会话，重连时代理保留订阅，无需重新接收保留消息
+            self.mqtt_client = mqtt_client.Client(
+                client_id=f"{MQTT_CLIENT_ID_PREFIX}{self.host}", clean_session=False
+            )
+        else:
+            self.mqtt_client = mqtt_client.Client()
         self.mqtt_client.username_pw_set(MQTT_USERNAME, self.password)
         self.mqtt_client.on_connect = self.on_mqtt_connect
         self.mqtt_client.on_disconnect = self.on_mqtt_disconnect
         self.mqtt_client.on_message = self.on_mqtt_message
-
-        # Start MQTT loop thread
-        _LOGGER.debug("Starting MQTT thread")
-        self.mqtt_thread = threading.Thread(target=self.mqtt_loop)
-        self.mqtt_thread.daemon = True
-        self.mqtt_thread.start()
+        self.mqtt_client.on_subscribe = self.subscriptions.on_subscribe
+
+        if self.mqtt_transport == MQTT_TRANSPORT_THREAD:
+            # Start MQTT loop thread
+            _LOGGER.debug("Starting MQTT thread")
+            self.mqtt_thread = threading.Thread(target=self.mqtt_loop)
+            self.mqtt_thread.daemon = True
+            self.mqtt_thread.start()
+        else:
+            # 在事件循环中直接驱动MQTT socket
+            _LOGGER.debug("Starting MQTT event loop task")
+            AsyncioMqttLoop(self.hass, self.mqtt_client)
+            self._mqtt_task = self.hass.async_create_background_task(
+                self._async_mqtt_loop(), f"{DOMAIN}_mqtt_{self.host}"
+            )
 
         self.register_all_callbacks()
         _LOGGER.debug("MQTT client startup completed")
@@ -246,13 +263,6 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
         """Register all callbacks for data points."""
         self.register_callback(107, self.on_mission_status)
         self.register_callback(155, self.on_global_params)
-        self.register_callback(117, self.on_map_status)
-        self.register_callback(113, self.on_current_work_data)
-        self.register_callback(124, self.on_statistics_data)
-        self.register_callback(125, self.on_base_station_time)
-        self.register_callback(126, self.on_blade_time)
-        self.register_callback(138, self.on_schedule_data)
-        self.register_callback(108, self.on_battery_status)
         self.register_callback(COMPATIBILITY_INFO_DP, self.on_compatibility_info)
 
     def update_activity_from_state(self):
@@ -285,22 +295,19 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
             self.activity = LawnMowerActivity.DOCKED
 
         if last_activity != self.activity:
-            self.schedule_update_ha_state()
+            self._write_state()
 
-    async def on_global_params(self, payload: str):
+    @callback
+    def on_global_params(self, data: dict):
         """Handle global parameter updates (dp_155)."""
-        _LOGGER.debug("Raw global params payload: %s", payload)
-        try:
-            data = json.loads(payload)
-            old_params = self._global_params
-            self._global_params = data
-            _LOGGER.info("Global parameters updated: %s", data)
-            
-            # 检查主方向模式是否有变化，通知模式选择器
-            self._notify_mode_selector_if_changed(old_params, data)
-            
-        except json.JSONDecodeError:
-            _LOGGER.error("Invalid JSON payload for dp_155: %s", payload)
+        # 回调在协调器保存新数据之前执行，此处仍为旧参数
+        old_params = self.coordinator.get(155)
+
+        # 确认设备已应用的待确认写入，随后协调器保存新数据并刷新实体
+        self.params_writer.pending_writes.async_reconcile(data)
+        
+        # 检查主方向模式是否有变化，通知模式选择器
+        self._notify_mode_selector_if_changed(old_params, data)
     
     def _notify_mode_selector_if_changed(self, old_params: dict, new_params: dict) -> None:
         """如果主方向模式有变化，通知模式选择器"""
@@ -312,7 +319,7 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
                 _LOGGER.debug("Main direction mode changed from %s to %s, notifying mode selector", old_mode, new_mode)
                 
                 # 通过Home Assistant事件通知模式选择器
-                self.hass.bus.fire(f"{DOMAIN}_device_mode_confirmed", {
+                self.hass.bus.async_fire(f"{DOMAIN}_device_mode_confirmed", {
                     "device_host": self.host,
                     "confirmed_mode": new_mode,
                     "old_mode": old_mode,
@@ -322,105 +329,10 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
         except Exception as e:
             _LOGGER.warning("Error notifying mode selector: %s", e)
 
-    async def on_map_status(self, payload: str):
-        """Handle map status updates (dp_117)."""
-        _LOGGER.debug("Raw map status payload: %s", payload)
-        try:
-            data = json.loads(payload)
-            self._map_status = data
-            _LOGGER.info("Map status updated: %s", data)
-        except json.JSONDecodeError:
-            _LOGGER.error("Invalid JSON payload for dp_117: %s", payload)
-
-    async def on_current_work_data(self, payload: str):
-        """Handle current work data updates (dp_113)."""
-        _LOGGER.debug("Raw current work data payload: %s", payload)
-        try:
-            data = json.loads(payload)
-            self._current_work_data = data
-            _LOGGER.info("Current work data updated: %s", data)
-        except json.JSONDecodeError:
-            _LOGGER.error("Invalid JSON payload for dp_113: %s", payload)
-
-    async def on_statistics_data(self, payload: str):
-        """Handle statistics data updates (dp_124)."""
-        _LOGGER.debug("Raw statistics data payload: %s", payload)
-        try:
-            data = json.loads(payload)
-            self._statistics_data = data
-            _LOGGER.info("Statistics data updated: %s", data)
-        except json.JSONDecodeError:
-            _LOGGER.error("Invalid JSON payload for dp_124: %s", payload)
-
-    async def on_base_station_time(self, payload: str):
-        """Handle base station time updates (dp_125)."""
-        _LOGGER.debug("Raw base station time payload: %s", payload)
-        try:
-            data = json.loads(payload)
-            self._base_station_time = data
-            _LOGGER.info("Base station time updated: %s", data)
-        except json.JSONDecodeError:
-            _LOGGER.error("Invalid JSON payload for dp_125: %s", payload)
-
-    async def on_blade_time(self, payload: str):
-        """Handle blade time updates (dp_126)."""
-        _LOGGER.debug("Raw blade time payload: %s", payload)
-        try:
-            data = json.loads(payload)
-            self._blade_time = data
-            _LOGGER.info("Blade time updated: %s", data)
-        except json.JSONDecodeError:
-            _LOGGER.error("Invalid JSON payload for dp_126: %s", payload)
-
-    async def on_schedule_data(self, payload: str):
-        """Handle schedule data updates (dp_138)."""
-        _LOGGER.debug("Raw schedule data payload: %s", payload)
-        try:
-            data = json.loads(payload)
-            self._schedule_data = data
-            _LOGGER.info("Schedule data updated: %s", data)
-        except json.JSONDecodeError:
-            _LOGGER.error("Invalid JSON payload for dp_138: %s", payload)
-
-    async def on_battery_status(self, payload: str):
-        """Handle battery status updates (dp_108)."""
-        _LOGGER.debug("Raw battery status payload: %s", payload)
-        try:
-            data = json.loads(payload)
-            self._battery_status = data
-            _LOGGER.info("Battery status updated: %s", data)
-        except json.JSONDecodeError:
-            _LOGGER.error("Invalid JSON payload for dp_108: %s", payload)
-
-    async def on_mission_status(self, payload: str):
+    @callback
+    def on_mission_status(self, data: dict):
         """Handle mission status updates."""
-        _LOGGER.debug("Raw mission status payload: %s", payload)
-        try:
-            data = json.loads(payload)
-            _LOGGER.info("Received mission status: %s", data)
-        except json.JSONDecodeError:
-            _LOGGER.error("Invalid JSON payload: %s", payload)
-            return
-
-        # Define a mapping from field names to enum classes
-        enum_mapping = {
-            "mission": Mission,
-            "sub_mission": SubMission,
-            "state": MissionState,
-            "power_mode": PowerMode,
-            "back_to_station_reason": BackToStationReason
-        }
-
-        # Convert enum strings to enum members
-        for key, enum_class in enum_mapping.items():
-            if key in data:
-                old_value = data[key]
-                try:
-                    data[key] = enum_class(data[key])
-                    _LOGGER.debug("Converted %s: %s -> %s", key, old_value, data[key])
-                except (ValueError, KeyError) as e:
-                    _LOGGER.error("Invalid value for %s: %s (error: %s)", key, data[key], e)
-                    data[key] = None
+        status = MissionStatus.from_dict(data)
 
         # Store old values for logging
         old_mission = self.mission
@@ -428,10 +340,15 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
         old_mission_state = self.mission_state
         old_has_error = self.has_error
 
-        self.mission = data.get("mission", self.mission)
-        self.sub_mission = data.get("sub_mission", self.sub_mission)
-        self.mission_state = data.get("state", self.mission_state)
-        self.has_error = data.get("has_error", self.has_error)
+        # 未上报或无法识别的字段保持原值
+        if status.mission is not None:
+            self.mission = status.mission
+        if status.sub_mission is not None:
+            self.sub_mission = status.sub_mission
+        if status.state is not None:
+            self.mission_state = status.state
+        if status.has_error is not None:
+            self.has_error = status.has_error
 
         _LOGGER.debug("Mission state updated: mission=%s->%s, sub_mission=%s->%s, state=%s->%s, error=%s->%s",
                      old_mission, self.mission, old_sub_mission, self.sub_mission,
@@ -439,11 +356,10 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
 
         self.update_activity_from_state()
 
-    async def on_compatibility_info(self, payload: str):
+    @callback
+    def on_compatibility_info(self, data: dict):
         """Handle compatibility info updates (dp_112)."""
-        _LOGGER.debug("Raw compatibility info payload: %s", payload)
         try:
-            data = json.loads(payload)
             _LOGGER.info("Received version compatibility info: %s", data)
 
             # 进行版本兼容性检查
@@ -462,112 +378,229 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
             if compatibility_status == CompatibilityStatus.INCOMPATIBLE:
                 _LOGGER.error("Version completely incompatible, recommend checking firmware and plugin versions")
 
-        except json.JSONDecodeError:
-            _LOGGER.error("Failed to parse compatibility info JSON: %s", payload)
         except Exception as e:
             _LOGGER.error("Error processing version compatibility info: %s", e)
 
+    async def _async_mqtt_loop(self) -> None:
+        """MQTT main loop with auto-reconnect, driven by the event loop."""
+        while not self._stop_event.is_set():
+            self._mqtt_disconnected.clear()
+            try:
+                _LOGGER.info("Attempting to connect to MQTT Broker %s", self.host)
+                self.subscriptions.mark_connect_started()
+                # connect() 包含DNS解析和TCP握手，放到executor中执行
+                self._connect_future = self.hass.async_add_executor_job(
+                    self.mqtt_client.connect, self.host, MQTT_PORT, 60
+                )
+                # 取消任务无法停止executor线程，connect()由async_stop等待结束
+                await asyncio.shield(self._connect_future)
+                _LOGGER.info("Connected to MQTT Broker")
+                await self._mqtt_disconnected.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _LOGGER.error("MQTT connection error: %s", e)
+                self.reconnect.on_connect_failed(str(e))
+                # 设置错误状态
+                self.activity = LawnMowerActivity.ERROR
+            if not self._stop_event.is_set():
+                delay = self.reconnect.next_delay()
+                _LOGGER.debug("Reconnecting in %.1fs", delay)
+                await asyncio.sleep(delay)  # 等待后重试
+
     def mqtt_loop(self):
-        """MQTT main loop with auto-reconnect."""
+        """MQTT main loop with auto-reconnect.
+
+        The client is driven with loop() instead of loop_forever(), whose
+        built-in reconnect ignores the reconnect policy, so both transports
+        retry with the same quick first delay, backoff and jitter.
+        """
         while not self._stop_event.is_set():
             try:
-                if self.mqtt_client and not self.mqtt_client.is_connected():
-                    _LOGGER.info("Attempting to connect to MQTT Broker %s", self.host)
-                    self.mqtt_client.connect(self.host, MQTT_PORT, 60)
+                _LOGGER.info("Attempting to connect to MQTT Broker %s", self.host)
+                self.subscriptions.mark_connect_started()
+                self.mqtt_client.connect(self.host, MQTT_PORT, 60)
+                if self._stop_event.is_set():
+                    # 连接期间已停止，断开迟到建立的连接后退出
+                    self.mqtt_client.disconnect()
+                else:
                     _LOGGER.info("Connected to MQTT Broker")
-                if self.mqtt_client:
-                    self.mqtt_client.loop_forever()
+                # 连接断开（或被拒绝）前持续处理网络事件
+                rc = mqtt_client.MQTT_ERR_SUCCESS
+                while rc == mqtt_client.MQTT_ERR_SUCCESS:
+                    rc = self.mqtt_client.loop(timeout=1.0)
             except Exception as e:
                 _LOGGER.error(f"MQTT connection error: {e}")
+                self.reconnect.on_connect_failed(str(e))
                 # 设置错误状态
                 self.activity = LawnMowerActivity.ERROR
-                self.schedule_update_ha_state()
-                time.sleep(5)  # 等待 5 秒后重试
+            if not self._stop_event.is_set():
+                delay = self.reconnect.next_delay()
+                _LOGGER.debug("Reconnecting in %.1fs", delay)
+                self._stop_event.wait(delay)  # 等待后重试，停止时立即返回
 
-    def on_mqtt_connect(self, client, _userdata, _flags, rc):  # type: ignore[misc]
+    def on_mqtt_connect(self, client, _userdata, flags, rc):  # type: ignore[misc]
         """Callback when connected to MQTT Broker."""
         if rc == 0:
-            _LOGGER.info("MQTT connected")
-            # 订阅主题
-            for dp_id in range(201):
-                topic = f"data_point/{dp_id}/robot"
-                client.subscribe(topic)
-            # 订阅地图信息主题
-            client.subscribe("map/current/info")
-            _LOGGER.info("Subscribed to map/current/info topic")
-            
-            # 订阅设备型号主题
-            client.subscribe(MODEL_NAME_TOPIC)
-            _LOGGER.info("Subscribed to %s topic", MODEL_NAME_TOPIC)
+            session_present = bool(flags.get("session present"))
+            _LOGGER.info("MQTT connected (session present: %s)", session_present)
+            self.reconnect.on_connected()
+            self._call_in_loop(self._mqtt_connected.set)
+            # 订阅数据点、地图信息和设备型号主题（单个SUBSCRIBE报文），
+            # 代理保留了会话时只订阅变化的主题
+            self.subscriptions.on_connect(client, session_present)
+            # 按顺序发送断线期间缓存的消息
+            self.outbox.on_connect(client)
             
             # 主动请求版本兼容性信息
-            self._request_compatibility_info()
+            self._run_job(self.async_request_compatibility_info)
             
             self.update_activity_from_state()
         else:
             _LOGGER.error(f"MQTT connection failed with code {rc}")
+            self.reconnect.on_connect_failed(mqtt_client.connack_string(rc))
             # 设置错误状态
             self.activity = LawnMowerActivity.ERROR
-            self.schedule_update_ha_state()
 
     def on_mqtt_disconnect(self, _client, _userdata, rc):  # type: ignore[misc]
         """Callback when disconnected from MQTT Broker."""
+        self.subscriptions.on_disconnect()
+        self.outbox.on_disconnect()
+        self.reconnect.on_disconnected(
+            mqtt_client.error_string(rc) if rc != 0 else None
+        )
+        self._call_in_loop(self._mqtt_connected.clear)
+        if self.mqtt_transport != MQTT_TRANSPORT_THREAD:
+            # 通知连接任务进行重连
+            self._call_in_loop(self._mqtt_disconnected.set)
         if rc != 0:
             _LOGGER.warning(f"Unexpected MQTT disconnection: {rc}")
             # 断开连接后自动重连
             # 设置错误状态
             self.activity = LawnMowerActivity.ERROR
-            self.schedule_update_ha_state()
 
     def on_mqtt_message(self, _client, _userdata, msg):  # type: ignore[misc]
         """Callback when a message is received."""
         topic = msg.topic
-        payload = msg.payload.decode()
-
-        _LOGGER.debug("Received MQTT message: topic=%s, payload=%s", topic, payload)
-
-        # 处理地图信息主题
-        if topic == "map/current/info":
-            _LOGGER.info("Received map info message, size: %d bytes", len(payload))
-            self._handle_map_info(payload)
-            return
-        
-        # 处理设备型号主题
-        if topic == MODEL_NAME_TOPIC:
-            _LOGGER.info("Received device model message: %s", payload)
-            self._handle_model_name(payload)
-            return
+        payload = msg.payload
 
-        # 使用正则表达式解析 data_point topic
-        match = TOPIC_PATTERN.fullmatch(topic)
-        if not match:
-            _LOGGER.warning("Invalid topic format: %s", topic)
+        # 通过预先生成的主题表查找，无需逐条解析主题
+        route = self.router.routes.get(topic)
+        self.subscriptions.record_message(len(payload), route is not None)
+        if route is None:
             return
 
-        try:
-            dp_id = int(match.group(1))
-            _LOGGER.debug("Parsed dp_id: %d from topic: %s", dp_id, topic)
-        except ValueError:
-            _LOGGER.warning("Invalid dp_id in topic: %s", topic)
+        # 内容与上一条完全相同的消息无需解码和分发，
+        # 但等待请求响应的数据点即使内容未变化也要分发
+        if route.key not in self._pending_requests and self.fingerprints.is_duplicate(
+            topic, payload
+        ):
             return
 
-        # 调用对应的回调函数
-        callbacks = self.callbacks.get(dp_id)
-        if callbacks:
-            _LOGGER.debug("Calling %d callbacks for dp_id %d", len(callbacks), dp_id)
-            for callback in callbacks:
-                self.hass.add_job(callback, payload)
+        if msg.retain and route.key not in self._pending_requests:
+            # 重新订阅后收到的保留消息，解码后与缓存的数据比较
+            self._retained_keys.add(route.key)
+
+        # 热路径中不格式化日志，只记录到跟踪缓冲区
+        self.trace.record(route.key, TRACE_RECEIVED, payload)
+        # 每条消息只解码一次，事件循环只接收解码后的数据；
+        # 地图信息可能很大，在事件循环中接收时放到executor中解码
+        self.decoder.submit(route.key, payload, route.decode)
+
+    @callback
+    def _async_dispatch(self, key: int | str, value: Any) -> None:
+        """Deliver a message flushed from the handoff queue."""
+        if key in self._retained_keys:
+            self._retained_keys.discard(key)
+            self.retained_received += 1
+            if self.coordinator.is_current(key, value):
+                # 保留消息与缓存的数据相同，无需通知实体；
+                # 从快照恢复的数据仍需确认为实时数据
+                self.retained_unchanged += 1
+                return
+        if key == MAP_INFO_TOPIC:
+            self._async_update_map_info(value)
+        elif key == MODEL_NAME_TOPIC:
+            self._async_set_device_model(value)
         else:
-            _LOGGER.debug("No callback registered for dp_id: %d", dp_id)
+            self._async_dispatch_data_point(key, value)
+
+    @callback
+    def _async_dispatch_data_point(self, dp_id: int, data: Any) -> None:
+        """Run the callbacks of a data point, then store it in the coordinator.
+
+        The coordinator refreshes only the entities depending on the data point.
+        """
+        for dp_callback in list(self.callbacks.get(dp_id, [])):
+            self.hass.async_run_hass_job(HassJob(dp_callback), data)
+
+        # 回调更新状态后再检查命令是否已被确认
+        self.commands.async_process(dp_id, data)
+
+        restored = self.coordinator.is_stale(dp_id)
+        self.coordinator.async_set_data(dp_id, data)
+        if restored and dp_id == 107:
+            # 任务状态已确认为实时数据，即使活动未变化也要更新assumed_state
+            self._write_state()
 
     def register_callback(self, dp_id: int, callback: Callable):
-        """Register a callback function for a specific dp_id."""
+        """Register a callback function for a specific dp_id.
+
+        The callback receives the decoded payload, which is shared by all
+        consumers of the data point and must not be modified.
+        """
         if not callable(callback):
             raise ValueError("Callback must be a callable function.")
         if dp_id not in self.callbacks:
             self.callbacks[dp_id] = []
         self.callbacks[dp_id].append(callback)
+        self._update_data_point_consumers(dp_id)
         _LOGGER.info(f"Callback registered for dp_id: {dp_id}")
+        # 如果已有该数据点的缓存数据，立即触发回调
+        if dp_id in self.coordinator.data:
+            self._run_job(callback, self.coordinator.get(dp_id))
+
+    def unregister_callback(self, dp_id: int, callback: Callable):
+        """Remove a callback function registered for a specific dp_id."""
+        callbacks = self.callbacks.get(dp_id)
+        if not callbacks or callback not in callbacks:
+            return
+        callbacks.remove(callback)
+        if not callbacks:
+            del self.callbacks[dp_id]
+            self._update_data_point_consumers(dp_id)
+        _LOGGER.info("Callback unregistered for dp_id: %d", dp_id)
+
+    @callback
+    def _on_data_point_demand(self, key: int | str, wanted: bool) -> None:
+        """Follow the data points the entities depend on."""
+        # 地图信息和设备型号主题始终订阅，只需跟踪数据点
+        if isinstance(key, int):
+            self._update_data_point_consumers(key)
+
+    def _update_data_point_consumers(self, dp_id: int) -> None:
+        """Subscribe and route a data point only while it has consumers."""
+        if (
+            dp_id in self.callbacks
+            or dp_id in self._pending_requests
+            or self.coordinator.has_listeners(dp_id)
+        ):
+            self.router.add_data_point(dp_id)
+            self.subscriptions.add_data_point(dp_id)
+        elif not self._subscriptions_held:
+            # 已无消费者，取消订阅该数据点
+            self.router.remove_data_point(dp_id)
+            self.subscriptions.remove_data_point(dp_id)
+
+    def hold_subscriptions(self) -> None:
+        """Keep all subscriptions while the platforms are reloaded."""
+        self._subscriptions_held = True
+
+    def release_subscriptions(self) -> None:
+        """Drop the subscriptions no entity uses after the reload."""
+        self._subscriptions_held = False
+        for dp_id in self.router.data_points():
+            self._update_data_point_consumers(dp_id)
 
     def register_map_callback(self, callback: Callable):
         """Register a callback function for map info updates."""
@@ -576,25 +609,27 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
         self.map_callbacks.append(callback)
         _LOGGER.info("Map callback registered")
         # 如果已有地图数据，立即触发回调
-        if self._map_info:
-            self.hass.add_job(callback, self._map_info)
-
-    def _handle_map_info(self, payload: str):
-        """Handle map info message."""
-        try:
-            map_info = json.loads(payload)
-            self._map_info = map_info
-            _LOGGER.info("Map info updated: id=%s, name=%s, state=%s", 
-                        map_info.get('id'), map_info.get('name'), map_info.get('map_state'))
-
-            # 通知所有地图回调
-            for callback in self.map_callbacks:
-                self.hass.add_job(callback, map_info)
-
-        except json.JSONDecodeError:
-            _LOGGER.error("Failed to parse map info JSON: %s", payload[:200])
-        except Exception as e:
-            _LOGGER.error("Error handling map info: %s", e)
+        map_info = self.coordinator.map_info
+        if map_info is not None:
+            self._run_job(callback, map_info)
+
+    def unregister_map_callback(self, callback: Callable):
+        """Remove a registered map info callback."""
+        if callback in self.map_callbacks:
+            self.map_callbacks.remove(callback)
+            _LOGGER.info("Map callback unregistered")
+
+    @callback
+    def _async_update_map_info(self, data: dict[str, Any]) -> None:
+        """Store new map info and notify all map callbacks."""
+        self.coordinator.async_set_data(MAP_INFO_TOPIC, data)
+        map_info = self.coordinator.map_info
+        if map_info is None:
+            return
+        _LOGGER.debug("Map info updated: id=%s, name=%s, state=%s", 
+                    map_info.id, map_info.name, map_info.map_state)
+        for map_callback in list(self.map_callbacks):
+            self.hass.async_run_hass_job(HassJob(map_callback), map_info)
 
     async def _async_update_device_model(self, model_name: str):
         """异步更新设备注册表中的模型信息."""
@@ -615,70 +650,66 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
         except Exception as e:
             _LOGGER.error("Error updating device registry: %s", e)
 
-    def _handle_model_name(self, payload: str):
-        """Handle device model name message."""
-        try:
-            # payload 直接是型号名称字符串
-            model_name = payload.strip()
-            if model_name:
-                old_model = self._device_model
-                self._device_model = model_name
-                _LOGGER.info("Device model updated: %s -> %s", old_model, model_name)
-                
-                # 使用 hass.add_job 调度异步设备注册表更新操作到主事件循环
-                self.hass.add_job(self._async_update_device_model, model_name)
-                
-                # 触发实体状态更新
-                self.schedule_update_ha_state()
-            else:
-                _LOGGER.warning("Received empty model name, keeping default")
-        except Exception as e:
-            _LOGGER.error("Error handling model name: %s", e)
+    @callback
+    def _async_set_device_model(self, model_name: str) -> None:
+        """Store the device model and update the device registry."""
+        if not model_name:
+            _LOGGER.warning("Received empty model name, keeping default")
+            return
+        _LOGGER.info("Device model updated: %s -> %s",
+                     self.coordinator.device_model, model_name)
+        self.coordinator.async_set_data(MODEL_NAME_TOPIC, model_name)
+
+        # 调度异步设备注册表更新操作
+        self.hass.async_create_task(self._async_update_device_model(model_name))
+
+        # 触发实体状态更新
+        self._write_state()
 
     @property
-    def map_info(self) -> dict:
+    def map_info(self) -> MapInfo | None:
         """Get current map info."""
-        return self._map_info
+        return self.coordinator.map_info
 
     @property
-    def global_params(self) -> dict:
+    def global_params(self) -> GlobalParams | None:
         """Get current global parameters from dp_155."""
-        return self._global_params
+        return self.coordinator.global_params
 
     @property
-    def map_status(self) -> dict:
+    def map_status(self) -> MapStatus | None:
         """Get current map status from dp_117."""
-        return self._map_status
+        return self.coordinator.map_status
 
     @property
-    def current_work_data(self) -> dict:
+    def current_work_data(self) -> WorkData | None:
         """Get current work data from dp_113."""
-        return self._current_work_data
+        return self.coordinator.current_work_data
 
     @property
-    def statistics_data(self) -> dict:
+    def statistics_data(self) -> Statistics | None:
         """Get statistics data from dp_124."""
-        return self._statistics_data
+        return self.coordinator.statistics_data
 
     @property
-    def base_station_time(self) -> dict:
+    def base_station_time(self) -> int | None:
         """Get base station time from dp_125."""
-        return self._base_station_time
+        return self.coordinator.base_station_time
 
     @property
-    def blade_time(self) -> dict:
+    def blade_time(self) -> int | None:
         """Get blade time from dp_126."""
-        return self._blade_time
+        return self.coordinator.blade_time
 
     @property
-    def schedule_data(self) -> dict:
+    def schedule_data(self) -> Schedule | None:
         """Get schedule data from dp_138."""
-        return self._schedule_data
+        return self.coordinator.schedule_data
 
     @property
-    def battery_status(self) -> dict:
+    def battery_status(self) -> BatteryStatus | None:
         """Get current battery status from dp_108."""
-        return self._battery_status
+        return self.coordinator.battery_status
 
     @property
     def compatibility_status(self) -> str:
@@ -695,124 +726,337 @@ class TerraMowLawnMowerEntity(LawnMowerEntity):
         """Return firmware version information."""
         return self.basic_data.firmware_version or {}
 
-    def publish_data_point(self, dp_id: int, data: dict):
-        """Publish data to a specific data point."""
+    def publish_data_point(self, dp_id: int, data: dict, ttl: float | None = None):
+        """Publish data to a specific data point.
+
+        While the broker is not connected the message is buffered and sent on
+        the next connect, unless it is older than ttl seconds by then.
+        """
         topic = f"data_point/{dp_id}/app"
-        _LOGGER.info(f"Publishing data to topic {topic}: {data}")
-        payload = json.dumps(data)
-        if self.mqtt_client:
-            self.mqtt_client.publish(topic, payload)
-        else:
-            _LOGGER.error("MQTT client is not initialized")
+        payload = codec.dumps(data)
+        self.trace.record(dp_id, TRACE_SENT, payload)
+        self.outbox.publish(topic, payload, ttl)
 
     def get_cmd_seq(self):
         """Generate a new command sequence number."""
         self.cmd_seq += 1
         return self.cmd_seq
 
-    def start_mowing(self):
-        """Start mowing implementation for lawn_mower entity."""
-        if not self._can_accept_command():
-            logging.warning("Request too quick, skip start mowing command")
+    @callback
+    def async_send_command(
+        self,
+        dp_id: int,
+        command: dict,
+        predicate: AckPredicate | None = None,
+        timeout: float | None = None,
+        ttl: float | None = None,
+    ) -> asyncio.Future:
+        """Publish a command stamped with a seq and track its acknowledgement.
+
+        The returned future resolves with the robot side message acknowledging
+        the command, or None if the robot did not respond in time.
+        """
+        future = self.commands.async_track(command['seq'], dp_id, predicate, timeout)
+        self.publish_data_point(dp_id, command, ttl)
+        return future
+
+    @callback
+    def _async_send_global_params(self, command: dict) -> asyncio.Future:
+        """Publish a dp_155 command and track the echo applying it."""
+        # dp_155命令不带seq，序号只用于跟踪
+        future = self.commands.async_track(
+            self.get_cmd_seq(), 155,
+            lambda dp_id, data: dp_id == 155 and is_applied(command, data),
+        )
+        self.publish_data_point(155, command)
+        return future
+
+    async def async_request(
+        self, dp_id: int, payload: dict | None = None, timeout: float = REQUEST_TIMEOUT
+    ) -> Any:
+        """Send a request on a data point and return the robot's response.
+
+        The response is the next robot side message of the data point. The
+        data point is routed and bypasses duplicate suppression while the
+        request is pending, so an unchanged answer still arrives. Raises
+        TimeoutError if the robot does not respond within timeout seconds.
+        """
+        self._pending_requests[dp_id] = self._pending_requests.get(dp_id, 0) + 1
+        self._update_data_point_consumers(dp_id)
+        try:
+            request = {'seq': self.get_cmd_seq(), **(payload or {})}
+            # 超时后响应已无人等待，缓存的请求随之过期
+            response = await self.async_send_command(
+                dp_id, request, lambda rx_dp_id, _data: rx_dp_id == dp_id, timeout, timeout
+            )
+        finally:
+            self._pending_requests[dp_id] -= 1
+            if not self._pending_requests[dp_id]:
+                del self._pending_requests[dp_id]
+                self._update_data_point_consumers(dp_id)
+        if response is None:
+            raise TimeoutError(f"No response on dp_{dp_id} within {timeout}s")
+        return response
+
+    async def _async_wait_for_ack(self, name: str, future: asyncio.Future | None) -> None:
+        """Wait until the robot acknowledged a command."""
+        if future is None:
             return
-
+        if await future is None:
+            _LOGGER.warning("No response from the robot to %s command", name)
+
+    def _mission_ack(
+        self, state: MissionState, missions: list[Mission] | None = None
+    ) -> AckPredicate:
+        """Return a predicate matching a mission status in the given state.
+
+        The status must have changed since the command was sent, so a robot
+        that already is in the target state does not acknowledge the command
+        with an unrelated status report.
+        """
+        sent_status = (self.mission, self.sub_mission, self.mission_state)
+        changed = False
+
+        def predicate(dp_id: int, _data: Any) -> bool:
+            nonlocal changed
+            if dp_id != 107:
+                return False
+            # 任务状态回调已在确认检查之前执行
+            changed = changed or (
+                (self.mission, self.sub_mission, self.mission_state) != sent_status
+            )
+            return (
+                changed
+                and self.mission_state == state
+                and (missions is None or self.mission in missions)
+            )
+        return predicate
+
+    async def async_start_mowing(self) -> None:
+        """Start mowing and wait for the robot to confirm."""
+        await self.command_limiter.async_submit("start mowing", self._async_start_mowing)
+
+    async def _async_start_mowing(self) -> None:
+        """Send the start mowing command matching the current mission state."""
+        future = None
         if self.mission in self._get_mow_missions():
             if self.sub_mission == SubMission.SUB_MISSION_FLEXIBLE_STATION_WAIT:
                 _LOGGER.info("SubMissionWaitInStation resume mow")
-                self._resume_mow()
+                future = self._resume_mow()
             else:
                 if self.mission_state == MissionState.MISSION_STATE_RUNNING:
                     _LOGGER.info("Now is mowing, can not start mow again")
                 elif self.mission_state == MissionState.MISSION_STATE_PAUSE:
                     _LOGGER.info("Mission paused, resume mow")
-                    self._resume_mow()
+                    future = self._resume_mow()
         else:
             _LOGGER.info("START CLEAN : Sending start command")
-            self._start_normal_mow()
+            future = self._start_normal_mow()
+        await self._async_wait_for_ack("start mowing", future)
 
-    def pause(self):
-        """Pause mowing implementation for lawn_mower entity."""
-        if not self._can_accept_command():
-            logging.warning("Request too quick, skip pause command")
-            return
+    async def async_pause(self) -> None:
+        """Pause mowing and wait for the robot to confirm."""
+        await self.command_limiter.async_submit("pause", self._async_pause)
 
+    async def _async_pause(self) -> None:
+        """Send the pause command matching the current mission state."""
+        future = None
         if self.mission in self._get_mow_missions():
             if self.sub_mission == SubMission.SUB_MISSION_FLEXIBLE_STATION_WAIT:
                 _LOGGER.info("SubMissionWaitInStation, now is not ok to pause mow")
             else:
                 if self.mission_state == MissionState.MISSION_STATE_RUNNING:
                     _LOGGER.info("PAUSE CLEAN : Sending pause command")
-                    self._send_pause_command()
+                    future = self._send_pause_command()
                 elif self.mission_state == MissionState.MISSION_STATE_PAUSE:
                     _LOGGER.info("Now is paused, can not pause mow again")
         else:
             if self.mission_state == MissionState.MISSION_STATE_RUNNING:
                 _LOGGER.info("PAUSE CLEAN : Sending pause command")
-                self._send_pause_command()
+                future = self._send_pause_command()
             elif self.mission_state == MissionState.MISSION_STATE_PAUSE:
                 _LOGGER.info("Now is paused, can not pause mow again")
+        await self._async_wait_for_ack("pause", future)
 
-    def dock(self):
-        """Docking implementation for lawn_mower entity."""
-        if not self._can_accept_command():
-            logging.warning("Request too quick, skip dock command")
-            return
+    async def async_dock(self) -> None:
+        """Return to the base station and wait for the robot to confirm."""
+        await self.command_limiter.async_submit("dock", self._async_dock)
 
+    async def _async_dock(self) -> None:
+        """Send the dock command matching the current mission state."""
+        future = None
         if self.mission in self._get_recharge_missions():
             if self.mission_state == MissionState.MISSION_STATE_RUNNING:
                 _LOGGER.info("Now is not ok to start recharge")
             elif self.mission_state == MissionState.MISSION_STATE_PAUSE:
                 _LOGGER.info("ResumeRecharge : Resuming recharge")
-                self._resume_recharge()
+                future = self._resume_recharge()
         else:
             _LOGGER.info("StartRecharge : Sending recharge command")
-            self._start_normal_recharge()
+            future = self._start_normal_recharge()
+        await self._async_wait_for_ack("dock", future)
 
-    def _start_normal_mow(self):
+    def _start_normal_mow(self) -> asyncio.Future:
         """Start normal mowing"""
         command = {
             'seq': self.get_cmd_seq(),
             'mode': 'START_MODE_GLOBAL_CLEAN',
             'global_clean': {'restart': False}
         }
-        self.publish_data_point(103, command)
+        return self.async_send_command(
+            103, command,
+            self._mission_ack(MissionState.MISSION_STATE_RUNNING, self._get_mow_missions()),
+        )
 
-    def _resume_mow(self):
+    def _resume_mow(self) -> asyncio.Future:
         """Resume mowing"""
         command = {'seq': self.get_cmd_seq()}
-        self.publish_data_point(106, command)
+        return self.async_send_command(
+            106, command, self._mission_ack(MissionState.MISSION_STATE_RUNNING)
+        )
 
-    def _send_pause_command(self):
+    def _send_pause_command(self) -> asyncio.Future:
         """Send pause command"""
         command = {'seq': self.get_cmd_seq()}
-        self.publish_data_point(105, command)
+        return self.async_send_command(
+            105, command, self._mission_ack(MissionState.MISSION_STATE_PAUSE)
+        )
 
-    def _start_normal_recharge(self):
+    def _start_normal_recharge(self) -> asyncio.Future:
         """Start normal recharging"""
         command = {
             'seq': self.get_cmd_seq(),
             'mode': 'START_MODE_RETURN'
         }
-        self.publish_data_point(103, command)
+        return self.async_send_command(
+            103, command,
+            self._mission_ack(MissionState.MISSION_STATE_RUNNING, self._get_recharge_missions()),
+        )
 
-    def _resume_recharge(self):
+    def _resume_recharge(self) -> asyncio.Future:
         """Resume recharging"""
         # 继续回充等效于继续割草
-        return self._resume_mow();
+        return self._resume_mow()
+
+    async def async_wait_connected(self, timeout: float) -> bool:
+        """Wait until the broker accepted the connection; False on timeout."""
+        try:
+            await asyncio.wait_for(self._mqtt_connected.wait(), timeout)
+        except TimeoutError:
+            return False
+        return True
 
-    async def async_will_remove_from_hass(self):
-        """Clean up resources when the entity is removed."""
+    async def async_stop(self) -> None:
+        """Stop the MQTT client and release the runtime resources."""
         _LOGGER.info("Stopping MQTT client")
         self._stop_event.set()
+        self._remove_demand_handler()
+        self.command_limiter.async_cancel()
+        self.commands.async_cancel_all()
+        self.params_writer.async_cancel()
+        if self._mqtt_task:
+            self._mqtt_task.cancel()
+            self._mqtt_task = None
+        if self._connect_future is not None:
+            # 等待仍在执行的connect()结束，随后的disconnect()会关闭迟到建立的连接
+            try:
+                await self._connect_future
+            except Exception as e:
+                _LOGGER.debug("Pending MQTT connect ended with: %s", e)
+            self._connect_future = None
         if self.mqtt_client:
             self.mqtt_client.disconnect()
 
-    def _request_compatibility_info(self):
-        """Request version compatibility information."""
+    async def async_request_compatibility_info(self):
+        """Request version compatibility information.
+
+        This is the only data point with a documented query/response; the
+        others are only reported by the robot or are writable.
+        """
         try:
             _LOGGER.info("Requesting version compatibility information")
-            # 发送空的请求来获取兼容性信息
-            request_data = {"seq": self.get_cmd_seq()}
-            self.publish_data_point(COMPATIBILITY_INFO_DP, request_data)
+            # 发送空的请求来获取兼容性信息，响应由 on_compatibility_info 处理
+            await self.async_request(COMPATIBILITY_INFO_DP)
+        except TimeoutError as e:
+            _LOGGER.warning("Version compatibility information not received: %s", e)
         except Exception as e:
             _LOGGER.error("Failed to request version compatibility information: %s", e)
+
+
+class TerraMowLawnMowerEntity(LawnMowerEntity):
+    """Lawn mower entity attached to the runtime of the config entry."""
+
+    _attr_has_entity_name = True
+    # 使用默认图标
+    _attr_icon = "mdi:robot-mower"
+    _attr_translation_key = "lawn_mower"
+    _attr_should_poll = False
+
+    def __init__(self, lawn_mower: TerraMowLawnMower) -> None:
+        """Initialize the entity."""
+        super().__init__()
+        self.lawn_mower = lawn_mower
+        self.host = lawn_mower.host
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={('TerraMowLawnMower', self.host)}, # Corrected typo in identifier
+            name='TerraMow',
+            manufacturer='TerraMow',
+            model=self.lawn_mower.coordinator.device_model
+        )
+
+    @property
+    def unique_id(self):
+        """Return a unique ID for this entity."""
+        return f"lawn_mower.terramow@{self.host}"
+
+    @property
+    def activity(self) -> LawnMowerActivity:
+        """Return the current activity of the lawn mower."""
+        return self.lawn_mower.activity
+
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while the mission status is only restored from the snapshot."""
+        return self.lawn_mower.coordinator.is_stale(107)
+
+    @property
+    def supported_features(self) -> LawnMowerEntityFeature:
+        """Flag lawn mower features that are supported."""
+        return LawnMowerEntityFeature.START_MOWING | LawnMowerEntityFeature.PAUSE | LawnMowerEntityFeature.DOCK
+
+    async def async_added_to_hass(self) -> None:
+        """Attach to the runtime to receive activity changes."""
+        await super().async_added_to_hass()
+        self.lawn_mower.entity = self
+        self.async_on_remove(self._async_detach)
+
+    @callback
+    def _async_detach(self) -> None:
+        if self.lawn_mower.entity is self:
+            self.lawn_mower.entity = None
+
+    def write_state(self) -> None:
+        """Write the entity state from the event loop or from the MQTT thread."""
+        if self.hass is None or self.entity_id is None:
+            # 实体尚未添加到HA
+            return
+        if is_event_loop_thread(self.hass):
+            self.async_write_ha_state()
+        else:
+            self.schedule_update_ha_state()
+
+    async def async_start_mowing(self) -> None:
+        """Start mowing."""
+        await self.lawn_mower.async_start_mowing()
+
+    async def async_pause(self) -> None:
+        """Pause mowing."""
+        await self.lawn_mower.async_pause()
+
+    async def async_dock(self) -> None:
+        """Return to the base station."""
+        await self.lawn_mower.async_dock()
@@ -18,6 +18,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 
 from . import TerraMowBasicData, DOMAIN
+from .const import MAP_INFO_TOPIC
+from .entity import TerraMowDataPointEntity
+from .models import MapInfo
 # 移除硬编码的映射，使用翻译系统
 
 async def async_setup_entry(
@@ -37,9 +40,12 @@ async def async_setup_entry(
     
     async_add_entities(entities)
 
-class TerraMowMapSensorBase(SensorEntity):
+class TerraMowMapSensorBase(TerraMowDataPointEntity, SensorEntity):
     """地图传感器基类"""
     
+    # 地图信息更新时由协调器推送
+    _data_point_ids = (MAP_INFO_TOPIC,)
+    
     def __init__(
         self,
         basic_data: TerraMowBasicData,
@@ -49,11 +55,6 @@ class TerraMowMapSensorBase(SensorEntity):
         self.basic_data = basic_data
         self.host = basic_data.host
         self.hass = hass
-        self._map_info: dict[str, Any] = {}
-        
-        # 注册地图信息回调
-        if hasattr(basic_data, 'lawn_mower') and basic_data.lawn_mower:
-            basic_data.lawn_mower.register_map_callback(self._on_map_info)
     
     @property
     def device_info(self) -> DeviceInfo:
@@ -62,18 +63,19 @@ class TerraMowMapSensorBase(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
-    async def _on_map_info(self, map_info: dict[str, Any]) -> None:
-        """处理地图信息更新"""
-        self._map_info = map_info
-        self.async_write_ha_state()
+    @property
+    def _map_info(self) -> MapInfo | None:
+        """当前地图信息"""
+        return self.coordinator.map_info
 
-class TerraMowMapStatusSensor(SensorEntity):
+class TerraMowMapStatusSensor(TerraMowDataPointEntity, SensorEntity):
     """地图状态传感器 - 使用dp_117数据"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (117,)
     _attr_icon = "mdi:map"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_translation_key = "map_status"
@@ -97,7 +99,7 @@ class TerraMowMapStatusSensor(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -108,35 +110,29 @@ class TerraMowMapStatusSensor(SensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
+        map_status = self.coordinator.map_status
+        if map_status is None:
             return None
             
-        map_status = self.basic_data.lawn_mower.map_status
-        if not map_status:
-            return None
-            
-        return map_status.get('map_state')
+        return map_status.map_state
     
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return {}
-            
-        map_status = self.basic_data.lawn_mower.map_status
-        if not map_status:
+        map_status = self.coordinator.map_status
+        if map_status is None:
             return {}
         
         return {
-            'is_map_detected': map_status.get('is_map_detected', False),
-            'map_id': map_status.get('map_id'),
-            'map_number': map_status.get('map_number', 0),
-            'is_backing_up_map': map_status.get('is_backing_up_map', False),
-            'backup_map_id': map_status.get('backup_map_id'),
-            'main_direction_angle': map_status.get('main_direction_angle'),
-            'is_spot_mode_map': map_status.get('is_spot_mode_map', False),
-            'spot_mode_map_number': map_status.get('spot_mode_map_number', 0),
-            'is_able_to_run_build_map': map_status.get('is_able_to_run_build_map', False),
+            'is_map_detected': map_status.is_map_detected,
+            'map_id': map_status.map_id,
+            'map_number': map_status.map_number,
+            'is_backing_up_map': map_status.is_backing_up_map,
+            'backup_map_id': map_status.backup_map_id,
+            'main_direction_angle': map_status.main_direction_angle,
+            'is_spot_mode_map': map_status.is_spot_mode_map,
+            'spot_mode_map_number': map_status.spot_mode_map_number,
+            'is_able_to_run_build_map': map_status.is_able_to_run_build_map,
         }
 
 class TerraMowMapAreaSensor(TerraMowMapSensorBase):
@@ -165,11 +161,11 @@ class TerraMowMapAreaSensor(TerraMowMapSensorBase):
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
-        if not self._map_info:
+        if self._map_info is None:
             return None
         
         # total_area单位为0.1平方米，转换为平方米
-        total_area = self._map_info.get('total_area', 0)
+        total_area = self._map_info.total_area
         return round(total_area / 10, 1) if total_area else None
 
 
@@ -198,26 +194,24 @@ class TerraMowCleanModeSensor(TerraMowMapSensorBase):
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        if not self._map_info:
+        if self._map_info is None:
             return None
         
-        clean_info = self._map_info.get('clean_info', {})
-        mode = clean_info.get('mode', '')
+        mode = self._map_info.clean_mode
         
         return mode if mode else None
     
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        if not self._map_info:
+        if self._map_info is None:
             return {}
         
-        clean_info = self._map_info.get('clean_info', {})
         attrs = {}
         
         # 根据不同的作业模式显示详细信息
-        if 'select_region' in clean_info:
-            region_ids = clean_info['select_region'].get('region_id', [])
+        if self._map_info.selected_region_ids is not None:
+            region_ids = list(self._map_info.selected_region_ids)
             attrs['selected_regions'] = region_ids
             attrs['selected_regions_count'] = len(region_ids)
         
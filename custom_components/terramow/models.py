@@ -0,0 +1,354 @@
+"""Typed models of the TerraMow data point payloads.
+
+Each model is built once per received payload (see the coordinator) and
+read by the entities as plain attributes. The models are slotted and
+immutable; they are shared by all entities of a mower.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Mission(Enum):
+    MISSION_IDLE = "MISSION_IDLE"
+    MISSION_RECHARGE = "MISSION_RECHARGE"
+    MISSION_GLOBAL_CLEAN = "MISSION_GLOBAL_CLEAN"
+    MISSION_BUILD_MAP = "MISSION_BUILD_MAP"
+    MISSION_BUILD_MAP_AND_CLEAN = "MISSION_BUILD_MAP_AND_CLEAN"
+    MISSION_TEMPORARY_CLEAN = "MISSION_TEMPORARY_CLEAN"
+    MISSION_BACK_TO_STARTING_POINT = "MISSION_BACK_TO_STARTING_POINT"
+    MISSION_REMOTE_CONTROL_CLEAN = "MISSION_REMOTE_CONTROL_CLEAN"
+    MISSION_SCHEDULE_GLOBAL_CLEAN = "MISSION_SCHEDULE_GLOBAL_CLEAN"
+    MISSION_SCHEDULE_BUILD_MAP_AND_CLEAN = "MISSION_SCHEDULE_BUILD_MAP_AND_CLEAN"
+    MISSION_SELECT_REGION_CLEAN = "MISSION_SELECT_REGION_CLEAN"
+    MISSION_CREATE_CUSTOM_PASSAGE = "MISSION_CREATE_CUSTOM_PASSAGE"
+    MISSION_BACKUP_MAP = "MISSION_BACKUP_MAP"
+    MISSION_RELOCATE_BASE_STATION = "MISSION_RELOCATE_BASE_STATION"
+    MISSION_USER_AUTO_CALIBRATION = "MISSION_USER_AUTO_CALIBRATION"
+    MISSION_RESTORE_BACKUP_MAP = "MISSION_RESTORE_BACKUP_MAP"
+    MISSION_SCHEDULE_SELECT_REGION_CLEAN = "MISSION_SCHEDULE_SELECT_REGION_CLEAN"
+    MISSION_DRAW_REGION_CLEAN = "MISSION_DRAW_REGION_CLEAN"
+    MISSION_EDGE_TRIM_CLEAN = "MISSION_EDGE_TRIM_CLEAN"
+    MISSION_UPDATE_BACKUP_MAP = "MISSION_UPDATE_BACKUP_MAP"
+
+
+class SubMission(Enum):
+    SUB_MISSION_IDLE = "SUB_MISSION_IDLE"
+    SUB_MISSION_RELOCATION = "SUB_MISSION_RELOCATION"
+    SUB_MISSION_RETURN_TO_BASE = "SUB_MISSION_RETURN_TO_BASE"
+    SUB_MISSION_OUT_OF_STATION = "SUB_MISSION_OUT_OF_STATION"
+    SUB_MISSION_REMOTE_CONTROL = "SUB_MISSION_REMOTE_CONTROL"
+    SUB_MISSION_SAVING_MAP = "SUB_MISSION_SAVING_MAP"
+    SUB_MISSION_SETTING_BLADE_HEIGHT = "SUB_MISSION_SETTING_BLADE_HEIGHT"
+    SUB_MISSION_CHARGING = "SUB_MISSION_CHARGING"
+    SUB_MISSION_REMOTE_CONTROL_CLEAN = "SUB_MISSION_REMOTE_CONTROL_CLEAN"
+    SUB_MISSION_DEFOGGING = "SUB_MISSION_DEFOGGING"
+    SUB_MISSION_WAIT_FOR_DAYLIGHT = "SUB_MISSION_WAIT_FOR_DAYLIGHT"
+    SUB_MISSION_COOLING_DOWN_MOTOR = "SUB_MISSION_COOLING_DOWN_MOTOR"
+    SUB_MISSION_WAIT_FOR_RAIN_TO_STOP = "SUB_MISSION_WAIT_FOR_RAIN_TO_STOP"
+    SUB_MISSION_FLEXIBLE_STATION_WAIT = "SUB_MISSION_FLEXIBLE_STATION_WAIT"
+
+
+class MissionState(Enum):
+    MISSION_STATE_IDLE = "MISSION_STATE_IDLE"
+    MISSION_STATE_RUNNING = "MISSION_STATE_RUNNING"
+    MISSION_STATE_PAUSE = "MISSION_STATE_PAUSE"
+    MISSION_STATE_ABORT = "MISSION_STATE_ABORT"
+    MISSION_STATE_COMPLETE = "MISSION_STATE_COMPLETE"
+
+
+class PowerMode(Enum):
+    POWER_MODE_RUNNING = "POWER_MODE_RUNNING"
+    POWER_MODE_STANDBY = "POWER_MODE_STANDBY"
+    POWER_MODE_HIBERNATE = "POWER_MODE_HIBERNATE"
+
+
+class BackToStationReason(Enum):
+    BACK_TO_STATION_REASON_NONE = "BACK_TO_STATION_REASON_NONE"
+    BACK_TO_STATION_REASON_LOW_BATTERY = "BACK_TO_STATION_REASON_LOW_BATTERY"
+    BACK_TO_STATION_REASON_RAINING = "BACK_TO_STATION_REASON_RAINING"
+    BACK_TO_STATION_REASON_MOW_MOTOR_OVERHEAT = "BACK_TO_STATION_REASON_MOW_MOTOR_OVERHEAT"
+    BACK_TO_STATION_REASON_WHEEL_OVERHEAT = "BACK_TO_STATION_REASON_WHEEL_OVERHEAT"
+    BACK_TO_STATION_REASON_NIGHT_TIME = "BACK_TO_STATION_REASON_NIGHT_TIME"
+
+
+def _enum[E: Enum](enum_class: type[E], value: Any) -> E | None:
+    """Convert a protocol enum string, None if missing or unknown."""
+    if value is None:
+        return None
+    try:
+        return enum_class(value)
+    except ValueError:
+        _LOGGER.error("Invalid value for %s: %s", enum_class.__name__, value)
+        return None
+
+
+def _clock(data: dict[str, Any] | None) -> str | None:
+    """Format a {hour, minute} time as HH:MM."""
+    if not data or "hour" not in data or "minute" not in data:
+        return None
+    return f"{data['hour']:02d}:{data['minute']:02d}"
+
+
+@dataclass(slots=True, frozen=True)
+class MissionStatus:
+    """Mission status (dp_107); None for fields not reported."""
+
+    mission: Mission | None = None
+    sub_mission: SubMission | None = None
+    state: MissionState | None = None
+    power_mode: PowerMode | None = None
+    back_to_station_reason: BackToStationReason | None = None
+    has_error: bool | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> MissionStatus:
+        """Build the model from the decoded payload."""
+        return cls(
+            mission=_enum(Mission, data.get("mission")),
+            sub_mission=_enum(SubMission, data.get("sub_mission")),
+            state=_enum(MissionState, data.get("state")),
+            power_mode=_enum(PowerMode, data.get("power_mode")),
+            back_to_station_reason=_enum(
+                BackToStationReason, data.get("back_to_station_reason")
+            ),
+            has_error=data.get("has_error"),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class BatteryStatus:
+    """Battery status (dp_108)."""
+
+    state: str | None = None
+    temperature: str | None = None
+    charger_connected: bool | None = None
+    is_switch_on: bool | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BatteryStatus:
+        """Build the model from the decoded payload."""
+        # 设备协议字段名拼写为 tempreture
+        temperature = data.get("tempreture")
+        return cls(
+            state=data.get("state"),
+            temperature=(
+                temperature.replace("TEMPRETURE", "TEMPERATURE")
+                if temperature is not None else None
+            ),
+            charger_connected=data.get("charger_connected"),
+            is_switch_on=data.get("is_switch_on"),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class WorkData:
+    """Data of the current mowing session (dp_113); areas in 0.1 m²."""
+
+    type: str = ""
+    clean_area: int = 0
+    total_area: int = 0
+    work_duration: int | None = None
+    is_completed: bool | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> WorkData:
+        """Build the model from the decoded payload."""
+        return cls(
+            type=data.get("type", ""),
+            clean_area=data.get("clean_area", 0),
+            total_area=data.get("total_area", 0),
+            work_duration=data.get("work_duration"),
+            is_completed=data.get("is_completed"),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class MapStatus:
+    """Map status (dp_117)."""
+
+    map_state: str | None = None
+    is_map_detected: bool = False
+    map_id: int | None = None
+    map_number: int = 0
+    is_backing_up_map: bool = False
+    backup_map_id: int | None = None
+    main_direction_angle: int | None = None
+    is_spot_mode_map: bool = False
+    spot_mode_map_number: int = 0
+    is_able_to_run_build_map: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> MapStatus:
+        """Build the model from the decoded payload."""
+        return cls(
+            map_state=data.get("map_state"),
+            is_map_detected=data.get("is_map_detected", False),
+            map_id=data.get("map_id"),
+            map_number=data.get("map_number", 0),
+            is_backing_up_map=data.get("is_backing_up_map", False),
+            backup_map_id=data.get("backup_map_id"),
+            main_direction_angle=data.get("main_direction_angle"),
+            is_spot_mode_map=data.get("is_spot_mode_map", False),
+            spot_mode_map_number=data.get("spot_mode_map_number", 0),
+            is_able_to_run_build_map=data.get("is_able_to_run_build_map", False),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Statistics:
+    """Mowing statistics (dp_124)."""
+
+    duration: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Statistics:
+        """Build the model from the decoded payload."""
+        return cls(duration=data.get("duration"))
+
+
+@dataclass(slots=True, frozen=True)
+class Schedule:
+    """Next scheduled mowing (dp_138); times formatted as HH:MM."""
+
+    exist: bool = False
+    item_id: int | None = None
+    shift_id: int | None = None
+    start_time: str | None = None
+    end_time: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Schedule:
+        """Build the model from the decoded payload."""
+        return cls(
+            exist=data.get("exist", False),
+            item_id=data.get("item_id"),
+            shift_id=data.get("shift_id"),
+            start_time=_clock(data.get("start_time")),
+            end_time=_clock(data.get("end_time")),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class MainDirectionConfig:
+    """Main direction configuration of the global parameters."""
+
+    mode: str | None = None
+    current_angle: int | None = None
+    single_angle: int | None = None
+    multiple_angles: tuple[int, ...] | None = None
+    auto_rotate_interval: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> MainDirectionConfig:
+        """Build the model from the main_direction_angle_config field."""
+        multiple_angles = data.get("multiple_mode_config", {}).get("angles")
+        return cls(
+            mode=data.get("mode"),
+            current_angle=data.get("current_angle"),
+            single_angle=data.get("single_mode_config", {}).get("angle"),
+            multiple_angles=(
+                tuple(multiple_angles) if multiple_angles is not None else None
+            ),
+            auto_rotate_interval=data.get("auto_rotate_mode_config", {}).get(
+                "angle_interval"
+            ),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class GlobalParams:
+    """Global parameters (dp_155); None for fields not reported."""
+
+    mow_height: int | None = None
+    mow_spacing: int | None = None
+    edge_cutting_distance: int | None = None
+    mow_speed: str | None = None
+    blade_disk_speed: str | None = None
+    main_direction: MainDirectionConfig = field(default_factory=MainDirectionConfig)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> GlobalParams:
+        """Build the model from the decoded payload."""
+        return cls(
+            mow_height=data.get("mow_height", {}).get("value"),
+            mow_spacing=data.get("mow_spacing", {}).get("value"),
+            edge_cutting_distance=data.get("edge_cutting_distance", {}).get("value"),
+            mow_speed=data.get("mow_speed", {}).get("speed_type"),
+            blade_disk_speed=data.get("blade_disk_speed", {}).get("speed_type"),
+            main_direction=MainDirectionConfig.from_dict(
+                data.get("main_direction_angle_config", {})
+            ),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class SubRegion:
+    """A sub-region (zone) of a map region."""
+
+    id: int | None = None
+    name: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SubRegion:
+        """Build the model from a sub_regions entry."""
+        return cls(id=data.get("id"), name=data.get("name", ""))
+
+
+@dataclass(slots=True, frozen=True)
+class Region:
+    """A region of the map with its sub-regions."""
+
+    id: int | None = None
+    name: str = ""
+    sub_regions: tuple[SubRegion, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Region:
+        """Build the model from a regions entry."""
+        return cls(
+            id=data.get("id"),
+            name=data.get("name", ""),
+            sub_regions=tuple(
+                SubRegion.from_dict(sub_region)
+                for sub_region in data.get("sub_regions", [])
+            ),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class MapInfo:
+    """Map information of the current map; areas in 0.1 m²."""
+
+    id: int | None = None
+    name: str | None = None
+    map_state: str | None = None
+    total_area: int = 0
+    regions: tuple[Region, ...] = ()
+    clean_mode: str = ""
+    # 仅在选区作业时存在
+    selected_region_ids: tuple[int, ...] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> MapInfo:
+        """Build the model from the decoded map info."""
+        clean_info = data.get("clean_info", {})
+        select_region = clean_info.get("select_region")
+        return cls(
+            id=data.get("id"),
+            name=data.get("name"),
+            map_state=data.get("map_state"),
+            total_area=data.get("total_area", 0),
+            regions=tuple(Region.from_dict(region) for region in data.get("regions", [])),
+            clean_mode=clean_info.get("mode", ""),
+            selected_region_ids=(
+                tuple(select_region.get("region_id", []))
+                if select_region is not None else None
+            ),
+        )
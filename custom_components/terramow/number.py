@@ -1,6 +1,5 @@
 from __future__ import annotations
 import logging
-import json
 from typing import Any
 
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -20,6 +19,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 
 from . import TerraMowBasicData, DOMAIN
+from .entity import TerraMowDataPointEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,9 +46,11 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class TerraMowNumberBase(NumberEntity):
+class TerraMowNumberBase(TerraMowDataPointEntity, NumberEntity):
     """TerraMow数值控制基类"""
     
+    _data_point_ids = (155,)
+    
     def __init__(
         self,
         basic_data: TerraMowBasicData,
@@ -66,7 +68,7 @@ class TerraMowNumberBase(NumberEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
 
 
@@ -99,15 +101,11 @@ class MowingHeightNumber(TerraMowNumberBase):
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return None
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return None
             
-        mow_height = global_params.get('mow_height', {})
-        value = mow_height.get('value')
+        value = global_params.mow_height
         return float(value) if value is not None else None
     
     async def async_set_native_value(self, value: float) -> None:
@@ -116,7 +114,7 @@ class MowingHeightNumber(TerraMowNumberBase):
             _LOGGER.error("Lawn mower not available")
             return
         
-        # 发送设置命令到dp_155
+        # 写入dp_155，短时间内的多次设置合并为一条消息
         command = {
             'mow_height': {
                 'value': int(value)
@@ -124,7 +122,7 @@ class MowingHeightNumber(TerraMowNumberBase):
         }
         
         _LOGGER.info("Setting mowing height to %d mm", int(value))
-        self.basic_data.lawn_mower.publish_data_point(155, command)
+        self.basic_data.lawn_mower.params_writer.async_write(command)
 
 
 class EdgeCuttingDistanceNumber(TerraMowNumberBase):
@@ -156,15 +154,11 @@ class EdgeCuttingDistanceNumber(TerraMowNumberBase):
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return None
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return None
             
-        edge_cutting_distance = global_params.get('edge_cutting_distance', {})
-        value = edge_cutting_distance.get('value')
+        value = global_params.edge_cutting_distance
         return float(value) if value is not None else None
     
     async def async_set_native_value(self, value: float) -> None:
@@ -173,7 +167,7 @@ class EdgeCuttingDistanceNumber(TerraMowNumberBase):
             _LOGGER.error("Lawn mower not available")
             return
         
-        # 发送设置命令到dp_155
+        # 写入dp_155，短时间内的多次设置合并为一条消息
         command = {
             'edge_cutting_distance': {
                 'value': int(value)
@@ -181,7 +175,7 @@ class EdgeCuttingDistanceNumber(TerraMowNumberBase):
         }
         
         _LOGGER.info("Setting edge cutting distance to %d mm", int(value))
-        self.basic_data.lawn_mower.publish_data_point(155, command)
+        self.basic_data.lawn_mower.params_writer.async_write(command)
 
 
 class MowingSpacingNumber(TerraMowNumberBase):
@@ -213,15 +207,11 @@ class MowingSpacingNumber(TerraMowNumberBase):
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return None
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return None
             
-        mow_spacing = global_params.get('mow_spacing', {})
-        value = mow_spacing.get('value')
+        value = global_params.mow_spacing
         return float(value) if value is not None else None
     
     @property
@@ -245,7 +235,7 @@ class MowingSpacingNumber(TerraMowNumberBase):
             _LOGGER.error("Invalid mowing spacing value: %d mm. Valid range: 80-140mm", int_value)
             return
         
-        # 发送设置命令到dp_155
+        # 写入dp_155，短时间内的多次设置合并为一条消息
         command = {
             'mow_spacing': {
                 'value': int_value
@@ -253,7 +243,7 @@ class MowingSpacingNumber(TerraMowNumberBase):
         }
         
         _LOGGER.info("Setting mowing spacing to %d mm (will reset mowing progress)", int_value)
-        self.basic_data.lawn_mower.publish_data_point(155, command)
+        self.basic_data.lawn_mower.params_writer.async_write(command)
 
 
 class MainDirectionSingleAngleNumber(TerraMowNumberBase):
@@ -275,7 +265,12 @@ class MainDirectionSingleAngleNumber(TerraMowNumberBase):
         hass: HomeAssistant,
     ) -> None:
         super().__init__(basic_data, hass)
-        # 注册模式切换事件监听器
+        self._cached_mode = None  # 初始化缓存的模式
+    
+    async def async_added_to_hass(self) -> None:
+        """Register the mode change listener."""
+        await super().async_added_to_hass()
+        # 注册模式切换事件监听器，实体移除时注销
         self._register_mode_change_listener()
     
     def _register_mode_change_listener(self) -> None:
@@ -289,8 +284,9 @@ class MainDirectionSingleAngleNumber(TerraMowNumberBase):
                 # 立即更新实体状态
                 self.async_write_ha_state()
         
-        self.hass.bus.async_listen(f"{DOMAIN}_main_direction_mode_changed", on_mode_changed)
-        self._cached_mode = None  # 初始化缓存的模式
+        self.async_on_remove(
+            self.hass.bus.async_listen(f"{DOMAIN}_main_direction_mode_changed", on_mode_changed)
+        )
     
     def _get_current_mode_from_selector(self) -> str | None:
         """尝试从模式选择器获取当前模式"""
@@ -325,15 +321,11 @@ class MainDirectionSingleAngleNumber(TerraMowNumberBase):
             return current_mode == 'MAIN_DIRECTION_MODE_SINGLE'
         
         # 备用方案：从设备数据获取
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return False
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return False
         
-        main_direction_config = global_params.get('main_direction_angle_config', {})
-        mode = main_direction_config.get('mode', 'MAIN_DIRECTION_MODE_SINGLE')
+        mode = global_params.main_direction.mode or 'MAIN_DIRECTION_MODE_SINGLE'
         return mode == 'MAIN_DIRECTION_MODE_SINGLE'
     
     @property
@@ -342,13 +334,11 @@ class MainDirectionSingleAngleNumber(TerraMowNumberBase):
         if not self.available:
             return None
             
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return None
             
-        main_direction_config = global_params.get('main_direction_angle_config', {})
-        single_config = main_direction_config.get('single_mode_config', {})
-        angle = single_config.get('angle')
+        angle = global_params.main_direction.single_angle
         return float(angle) if angle is not None else None
     
     async def async_set_native_value(self, value: float) -> None:
@@ -364,7 +354,7 @@ class MainDirectionSingleAngleNumber(TerraMowNumberBase):
         # 确保角度值在0-359范围内
         angle_value = int(value) % 360
         
-        # 发送设置命令到dp_155
+        # 写入dp_155，短时间内的多次设置合并为一条消息
         command = {
             'main_direction_angle_config': {
                 'mode': 'MAIN_DIRECTION_MODE_SINGLE',
@@ -375,7 +365,7 @@ class MainDirectionSingleAngleNumber(TerraMowNumberBase):
         }
         
         _LOGGER.info("Setting single main direction angle to %d degrees", angle_value)
-        self.basic_data.lawn_mower.publish_data_point(155, command)
+        self.basic_data.lawn_mower.params_writer.async_write(command)
     
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -387,13 +377,12 @@ class MainDirectionSingleAngleNumber(TerraMowNumberBase):
         }
         
         # 添加当前角度信息
-        if hasattr(self.basic_data, 'lawn_mower') and self.basic_data.lawn_mower:
-            global_params = self.basic_data.lawn_mower.global_params
-            if global_params:
-                main_direction_config = global_params.get('main_direction_angle_config', {})
-                current_angle = main_direction_config.get('current_angle')
-                if current_angle is not None:
-                    attrs['current_robot_angle'] = current_angle
+        global_params = self.global_params
+        if global_params is not None:
+            main_direction_config = global_params.main_direction
+            current_angle = main_direction_config.current_angle
+            if current_angle is not None:
+                attrs['current_robot_angle'] = current_angle
         
         return attrs
 
@@ -417,7 +406,12 @@ class MainDirectionAutoRotateIntervalNumber(TerraMowNumberBase):
         hass: HomeAssistant,
     ) -> None:
         super().__init__(basic_data, hass)
-        # 注册模式切换事件监听器
+        self._cached_mode = None  # 初始化缓存的模式
+    
+    async def async_added_to_hass(self) -> None:
+        """Register the mode change listener."""
+        await super().async_added_to_hass()
+        # 注册模式切换事件监听器，实体移除时注销
         self._register_mode_change_listener()
     
     def _register_mode_change_listener(self) -> None:
@@ -431,8 +425,9 @@ class MainDirectionAutoRotateIntervalNumber(TerraMowNumberBase):
                 # 立即更新实体状态
                 self.async_write_ha_state()
         
-        self.hass.bus.async_listen(f"{DOMAIN}_main_direction_mode_changed", on_mode_changed)
-        self._cached_mode = None  # 初始化缓存的模式
+        self.async_on_remove(
+            self.hass.bus.async_listen(f"{DOMAIN}_main_direction_mode_changed", on_mode_changed)
+        )
     
     def _get_current_mode_from_selector(self) -> str | None:
         """尝试从模式选择器获取当前模式"""
@@ -467,15 +462,11 @@ class MainDirectionAutoRotateIntervalNumber(TerraMowNumberBase):
             return current_mode == 'MAIN_DIRECTION_MODE_AUTO_ROTATE'
         
         # 备用方案：从设备数据获取
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return False
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return False
         
-        main_direction_config = global_params.get('main_direction_angle_config', {})
-        mode = main_direction_config.get('mode', 'MAIN_DIRECTION_MODE_SINGLE')
+        mode = global_params.main_direction.mode or 'MAIN_DIRECTION_MODE_SINGLE'
         return mode == 'MAIN_DIRECTION_MODE_AUTO_ROTATE'
     
     @property
@@ -484,13 +475,11 @@ class MainDirectionAutoRotateIntervalNumber(TerraMowNumberBase):
         if not self.available:
             return None
             
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return None
             
-        main_direction_config = global_params.get('main_direction_angle_config', {})
-        auto_config = main_direction_config.get('auto_rotate_mode_config', {})
-        interval = auto_config.get('angle_interval')
+        interval = global_params.main_direction.auto_rotate_interval
         return float(interval) if interval is not None else None
     
     async def async_set_native_value(self, value: float) -> None:
@@ -505,7 +494,7 @@ class MainDirectionAutoRotateIntervalNumber(TerraMowNumberBase):
         
         interval_value = int(value)
         
-        # 发送设置命令到dp_155
+        # 写入dp_155，短时间内的多次设置合并为一条消息
         command = {
             'main_direction_angle_config': {
                 'mode': 'MAIN_DIRECTION_MODE_AUTO_ROTATE',
@@ -516,7 +505,7 @@ class MainDirectionAutoRotateIntervalNumber(TerraMowNumberBase):
         }
         
         _LOGGER.info("Setting auto rotate interval to %d degrees", interval_value)
-        self.basic_data.lawn_mower.publish_data_point(155, command)
+        self.basic_data.lawn_mower.params_writer.async_write(command)
     
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -528,13 +517,12 @@ class MainDirectionAutoRotateIntervalNumber(TerraMowNumberBase):
         }
         
         # 添加当前角度信息
-        if hasattr(self.basic_data, 'lawn_mower') and self.basic_data.lawn_mower:
-            global_params = self.basic_data.lawn_mower.global_params
-            if global_params:
-                main_direction_config = global_params.get('main_direction_angle_config', {})
-                current_angle = main_direction_config.get('current_angle')
-                if current_angle is not None:
-                    attrs['current_robot_angle'] = current_angle
+        global_params = self.global_params
+        if global_params is not None:
+            main_direction_config = global_params.main_direction
+            current_angle = main_direction_config.current_angle
+            if current_angle is not None:
+                attrs['current_robot_angle'] = current_angle
         
         return attrs
 
@@ -558,7 +546,12 @@ class MultipleDirectionAngle1Number(TerraMowNumberBase):
         hass: HomeAssistant,
     ) -> None:
         super().__init__(basic_data, hass)
-        # 注册模式切换事件监听器
+        self._cached_mode = None  # 初始化缓存的模式
+    
+    async def async_added_to_hass(self) -> None:
+        """Register the mode change listener."""
+        await super().async_added_to_hass()
+        # 注册模式切换事件监听器，实体移除时注销
         self._register_mode_change_listener()
     
     def _register_mode_change_listener(self) -> None:
@@ -572,8 +565,9 @@ class MultipleDirectionAngle1Number(TerraMowNumberBase):
                 # 立即更新实体状态
                 self.async_write_ha_state()
         
-        self.hass.bus.async_listen(f"{DOMAIN}_main_direction_mode_changed", on_mode_changed)
-        self._cached_mode = None  # 初始化缓存的模式
+        self.async_on_remove(
+            self.hass.bus.async_listen(f"{DOMAIN}_main_direction_mode_changed", on_mode_changed)
+        )
     
     def _get_current_mode_from_selector(self) -> str | None:
         """尝试从模式选择器获取当前模式"""
@@ -608,15 +602,11 @@ class MultipleDirectionAngle1Number(TerraMowNumberBase):
             return current_mode == 'MAIN_DIRECTION_MODE_MULTIPLE'
         
         # 备用方案：从设备数据获取
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return False
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return False
         
-        main_direction_config = global_params.get('main_direction_angle_config', {})
-        mode = main_direction_config.get('mode', 'MAIN_DIRECTION_MODE_SINGLE')
+        mode = global_params.main_direction.mode or 'MAIN_DIRECTION_MODE_SINGLE'
         return mode == 'MAIN_DIRECTION_MODE_MULTIPLE'
     
     @property
@@ -625,13 +615,13 @@ class MultipleDirectionAngle1Number(TerraMowNumberBase):
         if not self.available:
             return None
             
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return None
             
-        main_direction_config = global_params.get('main_direction_angle_config', {})
-        multiple_config = main_direction_config.get('multiple_mode_config', {})
-        angles = multiple_config.get('angles', [0, 90])
+        angles = global_params.main_direction.multiple_angles
+        if angles is None:
+            angles = (0, 90)
         
         # 返回第一个角度，如果数组为空则返回0
         return float(angles[0]) if len(angles) > 0 else 0.0
@@ -649,8 +639,8 @@ class MultipleDirectionAngle1Number(TerraMowNumberBase):
         # 确保角度值在0-359范围内
         angle1_value = int(value) % 360
         
-        # 获取当前的第二个角度
-        global_params = self.basic_data.lawn_mower.global_params or {}
+        # 基于包含未确认写入的最新参数获取第二个角度，避免覆盖尚未生效的修改
+        global_params = self.basic_data.lawn_mower.params_writer.latest
         main_direction_config = global_params.get('main_direction_angle_config', {})
         multiple_config = main_direction_config.get('multiple_mode_config', {})
         current_angles = multiple_config.get('angles', [0, 90])
@@ -663,7 +653,7 @@ class MultipleDirectionAngle1Number(TerraMowNumberBase):
             _LOGGER.warning("Angle1 (%d°) is same as Angle2 (%d°), this may not be effective", 
                           angle1_value, angle2_value)
         
-        # 发送设置命令到dp_155
+        # 写入dp_155，短时间内的多次设置合并为一条消息
         command = {
             'main_direction_angle_config': {
                 'mode': 'MAIN_DIRECTION_MODE_MULTIPLE',
@@ -674,7 +664,7 @@ class MultipleDirectionAngle1Number(TerraMowNumberBase):
         }
         
         _LOGGER.info("Setting multiple direction angles to [%d°, %d°]", angle1_value, angle2_value)
-        self.basic_data.lawn_mower.publish_data_point(155, command)
+        self.basic_data.lawn_mower.params_writer.async_write(command)
     
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -686,20 +676,18 @@ class MultipleDirectionAngle1Number(TerraMowNumberBase):
         }
         
         # 添加当前角度信息和第二角度信息
-        if hasattr(self.basic_data, 'lawn_mower') and self.basic_data.lawn_mower:
-            global_params = self.basic_data.lawn_mower.global_params
-            if global_params:
-                main_direction_config = global_params.get('main_direction_angle_config', {})
-                current_angle = main_direction_config.get('current_angle')
-                if current_angle is not None:
-                    attrs['current_robot_angle'] = current_angle
+        global_params = self.global_params
+        if global_params is not None:
+            main_direction_config = global_params.main_direction
+            current_angle = main_direction_config.current_angle
+            if current_angle is not None:
+                attrs['current_robot_angle'] = current_angle
                 
-                # 显示配对的第二个角度
-                multiple_config = main_direction_config.get('multiple_mode_config', {})
-                angles = multiple_config.get('angles', [])
-                if len(angles) > 1:
-                    attrs['paired_angle2'] = angles[1]
-                    attrs['angle_difference'] = abs(angles[1] - angles[0])
+            # 显示配对的第二个角度
+            angles = main_direction_config.multiple_angles or ()
+            if len(angles) > 1:
+                attrs['paired_angle2'] = angles[1]
+                attrs['angle_difference'] = abs(angles[1] - angles[0])
         
         return attrs
 
@@ -723,7 +711,12 @@ class MultipleDirectionAngle2Number(TerraMowNumberBase):
         hass: HomeAssistant,
     ) -> None:
         super().__init__(basic_data, hass)
-        # 注册模式切换事件监听器
+        self._cached_mode = None  # 初始化缓存的模式
+    
+    async def async_added_to_hass(self) -> None:
+        """Register the mode change listener."""
+        await super().async_added_to_hass()
+        # 注册模式切换事件监听器，实体移除时注销
         self._register_mode_change_listener()
     
     def _register_mode_change_listener(self) -> None:
@@ -737,8 +730,9 @@ class MultipleDirectionAngle2Number(TerraMowNumberBase):
                 # 立即更新实体状态
                 self.async_write_ha_state()
         
-        self.hass.bus.async_listen(f"{DOMAIN}_main_direction_mode_changed", on_mode_changed)
-        self._cached_mode = None  # 初始化缓存的模式
+        self.async_on_remove(
+            self.hass.bus.async_listen(f"{DOMAIN}_main_direction_mode_changed", on_mode_changed)
+        )
     
     def _get_current_mode_from_selector(self) -> str | None:
         """尝试从模式选择器获取当前模式"""
@@ -773,15 +767,11 @@ class MultipleDirectionAngle2Number(TerraMowNumberBase):
             return current_mode == 'MAIN_DIRECTION_MODE_MULTIPLE'
         
         # 备用方案：从设备数据获取
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return False
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return False
         
-        main_direction_config = global_params.get('main_direction_angle_config', {})
-        mode = main_direction_config.get('mode', 'MAIN_DIRECTION_MODE_SINGLE')
+        mode = global_params.main_direction.mode or 'MAIN_DIRECTION_MODE_SINGLE'
         return mode == 'MAIN_DIRECTION_MODE_MULTIPLE'
     
     @property
@@ -790,13 +780,13 @@ class MultipleDirectionAngle2Number(TerraMowNumberBase):
         if not self.available:
             return None
             
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return None
             
-        main_direction_config = global_params.get('main_direction_angle_config', {})
-        multiple_config = main_direction_config.get('multiple_mode_config', {})
-        angles = multiple_config.get('angles', [0, 90])
+        angles = global_params.main_direction.multiple_angles
+        if angles is None:
+            angles = (0, 90)
         
         # 返回第二个角度，如果数组长度不足则返回90
         return float(angles[1]) if len(angles) > 1 else 90.0
@@ -814,8 +804,8 @@ class MultipleDirectionAngle2Number(TerraMowNumberBase):
         # 确保角度值在0-359范围内
         angle2_value = int(value) % 360
         
-        # 获取当前的第一个角度
-        global_params = self.basic_data.lawn_mower.global_params or {}
+        # 基于包含未确认写入的最新参数获取第一个角度，避免覆盖尚未生效的修改
+        global_params = self.basic_data.lawn_mower.params_writer.latest
         main_direction_config = global_params.get('main_direction_angle_config', {})
         multiple_config = main_direction_config.get('multiple_mode_config', {})
         current_angles = multiple_config.get('angles', [0, 90])
@@ -828,7 +818,7 @@ class MultipleDirectionAngle2Number(TerraMowNumberBase):
             _LOGGER.warning("Angle2 (%d°) is same as Angle1 (%d°), this may not be effective", 
                           angle2_value, angle1_value)
         
-        # 发送设置命令到dp_155
+        # 写入dp_155，短时间内的多次设置合并为一条消息
         command = {
             'main_direction_angle_config': {
                 'mode': 'MAIN_DIRECTION_MODE_MULTIPLE',
@@ -839,7 +829,7 @@ class MultipleDirectionAngle2Number(TerraMowNumberBase):
         }
         
         _LOGGER.info("Setting multiple direction angles to [%d°, %d°]", angle1_value, angle2_value)
-        self.basic_data.lawn_mower.publish_data_point(155, command)
+        self.basic_data.lawn_mower.params_writer.async_write(command)
     
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -851,20 +841,18 @@ class MultipleDirectionAngle2Number(TerraMowNumberBase):
         }
         
         # 添加当前角度信息和第一角度信息
-        if hasattr(self.basic_data, 'lawn_mower') and self.basic_data.lawn_mower:
-            global_params = self.basic_data.lawn_mower.global_params
-            if global_params:
-                main_direction_config = global_params.get('main_direction_angle_config', {})
-                current_angle = main_direction_config.get('current_angle')
-                if current_angle is not None:
-                    attrs['current_robot_angle'] = current_angle
+        global_params = self.global_params
+        if global_params is not None:
+            main_direction_config = global_params.main_direction
+            current_angle = main_direction_config.current_angle
+            if current_angle is not None:
+                attrs['current_robot_angle'] = current_angle
                 
-                # 显示配对的第一个角度
-                multiple_config = main_direction_config.get('multiple_mode_config', {})
-                angles = multiple_config.get('angles', [])
-                if len(angles) > 0:
-                    attrs['paired_angle1'] = angles[0]
-                    if len(angles) > 1:
-                        attrs['angle_difference'] = abs(angles[1] - angles[0])
+            # 显示配对的第一个角度
+            angles = main_direction_config.multiple_angles or ()
+            if len(angles) > 0:
+                attrs['paired_angle1'] = angles[0]
+                if len(angles) > 1:
+                    attrs['angle_difference'] = abs(angles[1] - angles[0])
         
         return attrs
\ No newline at end of file
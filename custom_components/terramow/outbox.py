@@ -0,0 +1,107 @@
+"""Outbound message buffer for the TerraMow integration."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import paho.mqtt.client as mqtt_client
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OutboundBuffer:
+    """Publish messages, holding them while the broker is not connected.
+
+    While disconnected, messages are buffered per topic; a newer message to
+    the same data point replaces the buffered one but keeps the position of
+    the latest write. Each message expires after its own TTL. On connect the
+    buffer is flushed in order, skipping expired messages. The connection
+    state is only changed under the lock, so a message is either published
+    or flushed with the next connect.
+    """
+
+    def __init__(self, maxsize: int, default_ttl: float) -> None:
+        """Initialize the buffer."""
+        self._maxsize = maxsize
+        self._default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._client: mqtt_client.Client | None = None
+        # topic -> (过期时间, payload)
+        self._pending: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+        # 统计信息
+        self.high_water = 0
+        self.buffered = 0
+        self.deduplicated = 0
+        self.expired = 0
+        self.dropped = 0
+        self.flushed = 0
+
+    def publish(self, topic: str, payload: bytes, ttl: float | None = None) -> bool:
+        """Publish payload, or buffer it while disconnected; True if published."""
+        with self._lock:
+            if self._client is not None:
+                self._client.publish(topic, payload)
+                return True
+
+            self.buffered += 1
+            if self._pending.pop(topic, None) is not None:
+                # 同一数据点只保留最新的消息
+                self.deduplicated += 1
+            elif len(self._pending) >= self._maxsize:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            expires_at = time.monotonic() + (ttl if ttl is not None else self._default_ttl)
+            self._pending[topic] = (expires_at, payload)
+            self.high_water = max(self.high_water, len(self._pending))
+        _LOGGER.debug("Not connected, buffered message to %s", topic)
+        return False
+
+    def on_connect(self, client: mqtt_client.Client) -> None:
+        """Flush the buffered messages in order and publish directly from now on."""
+        with self._lock:
+            self._client = client
+            now = time.monotonic()
+            pending, self._pending = self._pending, OrderedDict()
+            flushed = 0
+            for topic, (expires_at, payload) in pending.items():
+                if expires_at < now:
+                    self.expired += 1
+                    continue
+                client.publish(topic, payload)
+                flushed += 1
+            self.flushed += flushed
+        if pending:
+            _LOGGER.info(
+                "Flushed %d buffered messages, %d expired", flushed, len(pending) - flushed
+            )
+
+    def on_disconnect(self) -> None:
+        """Buffer messages until the next connect."""
+        with self._lock:
+            self._client = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return buffer statistics for diagnostics."""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "connected": self._client is not None,
+                "maxsize": self._maxsize,
+                "default_ttl": self._default_ttl,
+                "occupancy": len(self._pending),
+                "pending": [
+                    {"topic": topic, "expires_in": round(expires_at - now, 1)}
+                    for topic, (expires_at, _payload) in self._pending.items()
+                ],
+                "high_water": self.high_water,
+                "buffered": self.buffered,
+                "deduplicated": self.deduplicated,
+                "expired": self.expired,
+                "dropped": self.dropped,
+                "flushed": self.flushed,
+            }
@@ -0,0 +1,137 @@
+"""Command rate limiting for the TerraMow integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandRateLimiter:
+    """Token bucket for control commands with a latest-intent-wins queue.
+
+    A command runs immediately while the bucket holds a token. Otherwise it
+    waits in a single queue slot until the next token is available; a
+    command submitted while another one is waiting replaces it, so only the
+    final intent is delivered. The futures of replaced commands resolve
+    together with the command that superseded them.
+    """
+
+    def __init__(self, hass: HomeAssistant, rate: float, burst: int) -> None:
+        """Initialize the limiter with rate tokens per second and burst tokens."""
+        self._hass = hass
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._queued: tuple[str, Callable[[], Awaitable[Any]]] | None = None
+        self._waiters: list[asyncio.Future] = []
+        self._timer: asyncio.TimerHandle | None = None
+
+        # 统计信息
+        self.queued = 0
+        self.merged = 0
+        self.delivered = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    @callback
+    def async_submit(
+        self, name: str, action: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Future:
+        """Run action as soon as the budget allows and return its future."""
+        future = self._hass.loop.create_future()
+        self._refill()
+        if self._queued is None and self._tokens >= 1:
+            self._async_deliver(name, action, [future])
+            return future
+
+        self.queued += 1
+        if self._queued is not None:
+            # 只保留最新的意图，被取代的命令随之完成
+            self.merged += 1
+            _LOGGER.info("Command %s superseded by %s", self._queued[0], name)
+        else:
+            _LOGGER.info("Request too quick, %s command queued", name)
+        self._queued = (name, action)
+        self._waiters.append(future)
+        if self._timer is None:
+            self._timer = self._hass.loop.call_later(
+                (1 - self._tokens) / self._rate, self._async_release
+            )
+        return future
+
+    @callback
+    def _async_release(self) -> None:
+        """Deliver the queued command once a token is available."""
+        self._timer = None
+        if self._queued is None:
+            return
+        self._refill()
+        if self._tokens < 1:
+            self._timer = self._hass.loop.call_later(
+                (1 - self._tokens) / self._rate, self._async_release
+            )
+            return
+        (name, action), self._queued = self._queued, None
+        waiters, self._waiters = self._waiters, []
+        self._async_deliver(name, action, waiters)
+
+    @callback
+    def _async_deliver(
+        self,
+        name: str,
+        action: Callable[[], Awaitable[Any]],
+        waiters: list[asyncio.Future],
+    ) -> None:
+        self._tokens -= 1
+        self.delivered += 1
+        _LOGGER.debug("Delivering %s command", name)
+        task = self._hass.async_create_task(action())
+
+        def resolve(task: asyncio.Task) -> None:
+            for waiter in waiters:
+                if waiter.done():
+                    continue
+                if task.cancelled():
+                    waiter.cancel()
+                elif task.exception() is not None:
+                    waiter.set_exception(task.exception())
+                else:
+                    waiter.set_result(task.result())
+
+        task.add_done_callback(resolve)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the queued command."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._queued = None
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return limiter statistics for diagnostics."""
+        self._refill()
+        return {
+            "rate": self._rate,
+            "burst": self._burst,
+            "tokens": round(self._tokens, 3),
+            "waiting": self._queued[0] if self._queued else None,
+            "queued": self.queued,
+            "merged": self.merged,
+            "delivered": self.delivered,
+        }
@@ -0,0 +1,95 @@
+"""Reconnect policy for the TerraMow integration."""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ReconnectPolicy:
+    """Compute reconnect delays and track the state of the MQTT connection.
+
+    The first retry after a connection loss happens after ``first_delay``
+    seconds, so a brief Wi-Fi drop is recovered quickly. Every further
+    failed attempt doubles the delay starting at ``base_delay``, up to
+    ``max_delay`` (e.g. a mower switched off for the winter). Each delay is
+    randomized between half and the full value. A successful connect resets
+    the backoff.
+    """
+
+    def __init__(self, first_delay: float, base_delay: float, max_delay: float) -> None:
+        """Initialize the policy."""
+        self._first_delay = first_delay
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self.attempts = 0  # 本轮连续失败的重连次数
+
+        # 连接状态统计
+        self._connected_since: float | None = None
+        self._disconnected_since: float | None = None
+        self.connects = 0
+        self.reconnects = 0
+        self.last_time_to_reconnect: float | None = None
+        self.last_error: str | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the broker is connected."""
+        return self._connected_since is not None
+
+    def next_delay(self) -> float:
+        """Return the delay before the next connect attempt."""
+        self.attempts += 1
+        if self.attempts == 1:
+            delay = self._first_delay
+        else:
+            delay = min(self._max_delay, self._base_delay * 2 ** (self.attempts - 2))
+        # 随机抖动，避免多台设备同时重连
+        return random.uniform(delay / 2, delay)
+
+    def on_connected(self) -> None:
+        """Reset the backoff after a successful connect."""
+        now = time.monotonic()
+        self.attempts = 0
+        self.connects += 1
+        if self._disconnected_since is not None:
+            self.reconnects += 1
+            self.last_time_to_reconnect = now - self._disconnected_since
+            self._disconnected_since = None
+            _LOGGER.info("Reconnected after %.1fs", self.last_time_to_reconnect)
+        self._connected_since = now
+
+    def on_disconnected(self, reason: str | None = None) -> None:
+        """Record a lost connection."""
+        if reason is not None:
+            self.last_error = reason
+        self._connected_since = None
+        if self._disconnected_since is None:
+            self._disconnected_since = time.monotonic()
+
+    def on_connect_failed(self, reason: str) -> None:
+        """Record a failed connect attempt."""
+        self.last_error = reason
+        self._connected_since = None
+        if self._disconnected_since is None:
+            self._disconnected_since = time.monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return connection statistics for diagnostics."""
+        now = time.monotonic()
+        return {
+            "connected": self.connected,
+            "uptime": now - self._connected_since if self._connected_since else None,
+            "disconnected_for": (
+                now - self._disconnected_since if self._disconnected_since else None
+            ),
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "failed_attempts": self.attempts,
+            "last_time_to_reconnect": self.last_time_to_reconnect,
+            "last_error": self.last_error,
+        }
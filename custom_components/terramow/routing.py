@@ -0,0 +1,53 @@
+"""Topic dispatch table for the TerraMow integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from . import codec
+from .const import MAP_INFO_TOPIC, MODEL_NAME_TOPIC
+from .subscription import data_point_topic
+
+
+def decode_text(payload: bytes) -> str:
+    """Decode a plain text payload."""
+    return payload.decode().strip()
+
+
+class Route(NamedTuple):
+    """Where the payload of a topic goes."""
+
+    key: int | str  # 数据点ID或特殊主题，用于分发
+    decode: Callable[[bytes], Any]
+
+
+class TopicRouter:
+    """Resolve a received topic to its route with a single dict lookup.
+
+    The table maps complete topic strings to routes. It always contains the
+    special topics and holds an entry for every data point with at least one
+    consumer; entries are added and removed as consumers come and go, so no
+    topic parsing happens per message.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the table with the special topics."""
+        self.routes: dict[str, Route] = {
+            MAP_INFO_TOPIC: Route(MAP_INFO_TOPIC, codec.loads),
+            MODEL_NAME_TOPIC: Route(MODEL_NAME_TOPIC, decode_text),
+        }
+
+    def add_data_point(self, dp_id: int) -> None:
+        """Route the topic of a data point that gained a consumer."""
+        self.routes[data_point_topic(dp_id)] = Route(dp_id, codec.loads)
+
+    def remove_data_point(self, dp_id: int) -> None:
+        """Stop routing the topic of a data point without consumers."""
+        self.routes.pop(data_point_topic(dp_id), None)
+
+    def data_points(self) -> list[int]:
+        """Return the routed data points."""
+        return sorted(
+            route.key for route in self.routes.values() if isinstance(route.key, int)
+        )
@@ -10,6 +10,8 @@ from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 
 from . import TerraMowBasicData, DOMAIN
+from .entity import TerraMowDataPointEntity
+from .models import MapInfo
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,6 +37,7 @@ class TerraMowZoneSelect(SelectEntity):
     """地图分区选择器 - Zone selector for mowing specific areas"""
     
     _attr_has_entity_name = True
+    _attr_should_poll = False  # 地图信息通过回调推送
     _attr_icon = "mdi:map-marker-multiple"
     _attr_entity_category = EntityCategory.CONFIG
 
@@ -53,13 +56,20 @@ class TerraMowZoneSelect(SelectEntity):
         self.basic_data = basic_data
         self.host = basic_data.host
         self.hass = hass
-        self._map_info: dict[str, Any] = {}
+        self._map_info: MapInfo | None = None
         self._current_option: str | None = None
         self._options = ["no_zones_available"]
-        
-        # 注册地图信息回调
-        if hasattr(basic_data, 'lawn_mower') and basic_data.lawn_mower:
-            basic_data.lawn_mower.register_map_callback(self._on_map_info)
+
+    async def async_added_to_hass(self) -> None:
+        """Register for map info updates."""
+        await super().async_added_to_hass()
+        lawn_mower = self.basic_data.lawn_mower
+        if lawn_mower:
+            # 注册地图信息回调，实体移除时注销，避免重新加载后回调到旧实体
+            lawn_mower.register_map_callback(self._on_map_info)
+            self.async_on_remove(
+                lambda: lawn_mower.unregister_map_callback(self._on_map_info)
+            )
     
     @property
     def device_info(self) -> DeviceInfo:
@@ -68,7 +78,7 @@ class TerraMowZoneSelect(SelectEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -136,7 +146,7 @@ class TerraMowZoneSelect(SelectEntity):
         else:
             _LOGGER.error("Cannot send zone clean command: lawn_mower not available")
     
-    async def _on_map_info(self, map_info: dict[str, Any]) -> None:
+    async def _on_map_info(self, map_info: MapInfo) -> None:
         """处理地图信息更新"""
         self._map_info = map_info
         self._update_options()
@@ -144,12 +154,12 @@ class TerraMowZoneSelect(SelectEntity):
     
     def _update_options(self) -> None:
         """根据地图信息更新可选分区列表"""
-        if not self._map_info:
+        if self._map_info is None:
             self._options = ["no_zones_available"]
             self._current_option = "no_zones_available"
             return
 
-        regions = self._map_info.get('regions', [])  # 设备协议字段名，保持不变
+        regions = self._map_info.regions
         if not regions:
             self._options = ["no_zones_available"]
             self._current_option = "no_zones_available"
@@ -160,10 +170,9 @@ class TerraMowZoneSelect(SelectEntity):
 
         for region in regions:
             # 只处理子分区（设备协议使用sub_regions字段名）
-            sub_regions = region.get('sub_regions', [])  # 设备协议字段名，保持不变
-            for sub_zone in sub_regions:
-                sub_zone_id = sub_zone.get('id')
-                sub_zone_name = sub_zone.get('name', f'Sub-zone {sub_zone_id}')
+            for sub_zone in region.sub_regions:
+                sub_zone_id = sub_zone.id
+                sub_zone_name = sub_zone.name
 
                 if sub_zone_name and sub_zone_name.strip():
                     sub_option = f"{sub_zone_name} (ID: {sub_zone_id})"
@@ -182,44 +191,39 @@ class TerraMowZoneSelect(SelectEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        if not self._map_info:
+        if self._map_info is None:
             return {}
 
-        regions = self._map_info.get('regions', [])  # 设备协议字段名，保持不变
-
         # 统计所有子分区
         all_sub_zones = []
-        for region in regions:
-            sub_regions = region.get('sub_regions', [])  # 设备协议字段名，保持不变
-            for sub_zone in sub_regions:
+        for region in self._map_info.regions:
+            for sub_zone in region.sub_regions:
                 sub_zone_info = {
-                    'id': sub_zone.get('id'),
-                    'name': sub_zone.get('name', ''),
-                    'parent_region_id': region.get('id'),  # 设备协议字段名，保持不变
-                    'parent_region_name': region.get('name', '')
+                    'id': sub_zone.id,
+                    'name': sub_zone.name,
+                    'parent_region_id': region.id,
+                    'parent_region_name': region.name
                 }
                 all_sub_zones.append(sub_zone_info)
 
         attrs = {
-            'map_id': self._map_info.get('id'),
+            'map_id': self._map_info.id,
             'sub_zones_count': len(all_sub_zones),
             'available_sub_zones': all_sub_zones
         }
 
         # 显示当前清洁信息
-        clean_info = self._map_info.get('clean_info', {})
-        if clean_info.get('mode') == 'MAP_CLEAN_INFO_MODE_SELECT_REGION':  # 设备协议常量，保持不变
-            select_region = clean_info.get('select_region', {})  # 设备协议字段名，保持不变
-            selected_zone_ids = select_region.get('region_id', [])  # 设备协议字段名，保持不变
-            attrs['currently_selected_zones'] = selected_zone_ids
+        if self._map_info.clean_mode == 'MAP_CLEAN_INFO_MODE_SELECT_REGION':  # 设备协议常量，保持不变
+            attrs['currently_selected_zones'] = list(self._map_info.selected_region_ids or ())
 
         return attrs
 
 
-class MowSpeedSelect(SelectEntity):
+class MowSpeedSelect(TerraMowDataPointEntity, SelectEntity):
     """割草行走速度选择器 - 使用dp_155数据"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (155,)
     _attr_icon = "mdi:speedometer"
     _attr_entity_category = EntityCategory.CONFIG
     _attr_translation_key = "mow_speed_setting"
@@ -249,7 +253,7 @@ class MowSpeedSelect(SelectEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -260,15 +264,11 @@ class MowSpeedSelect(SelectEntity):
     @property
     def current_option(self) -> str | None:
         """Return the current selected option."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return self._current_option
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return self._current_option
         
-        mow_speed = global_params.get('mow_speed', {})
-        speed_type = mow_speed.get('speed_type')
+        speed_type = global_params.mow_speed
         
         if speed_type and speed_type in self._attr_options:
             self._current_option = speed_type
@@ -285,7 +285,7 @@ class MowSpeedSelect(SelectEntity):
             _LOGGER.error("Lawn mower not available")
             return
         
-        # 发送设置命令到dp_155
+        # 写入dp_155，短时间内的多次设置合并为一条消息
         command = {
             'mow_speed': {
                 'speed_type': option
@@ -293,9 +293,8 @@ class MowSpeedSelect(SelectEntity):
         }
         
         _LOGGER.info("Setting mow speed to %s", option)
-        self.basic_data.lawn_mower.publish_data_point(155, command)
-        self._current_option = option
-        self.async_write_ha_state()
+        # 设备确认前显示请求的值
+        self.basic_data.lawn_mower.params_writer.async_write(command)
     
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -309,10 +308,11 @@ class MowSpeedSelect(SelectEntity):
         }
 
 
-class BladeSpeedSelect(SelectEntity):
+class BladeSpeedSelect(TerraMowDataPointEntity, SelectEntity):
     """刀盘转速选择器 - 使用dp_155数据"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (155,)
     _attr_icon = "mdi:fan"
     _attr_entity_category = EntityCategory.CONFIG
     _attr_translation_key = "blade_speed"
@@ -342,7 +342,7 @@ class BladeSpeedSelect(SelectEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -353,15 +353,11 @@ class BladeSpeedSelect(SelectEntity):
     @property
     def current_option(self) -> str | None:
         """Return the current selected option."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return self._current_option
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.global_params
+        if global_params is None:
             return self._current_option
         
-        blade_disk_speed = global_params.get('blade_disk_speed', {})
-        speed_type = blade_disk_speed.get('speed_type')
+        speed_type = global_params.blade_disk_speed
         
         if speed_type and speed_type in self._attr_options:
             self._current_option = speed_type
@@ -378,7 +374,7 @@ class BladeSpeedSelect(SelectEntity):
             _LOGGER.error("Lawn mower not available")
             return
         
-        # 发送设置命令到dp_155
+        # 写入dp_155，短时间内的多次设置合并为一条消息
         command = {
             'blade_disk_speed': {
                 'speed_type': option
@@ -386,9 +382,8 @@ class BladeSpeedSelect(SelectEntity):
         }
         
         _LOGGER.info("Setting blade speed to %s", option)
-        self.basic_data.lawn_mower.publish_data_point(155, command)
-        self._current_option = option
-        self.async_write_ha_state()
+        # 设备确认前显示请求的值
+        self.basic_data.lawn_mower.params_writer.async_write(command)
     
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -402,10 +397,11 @@ class BladeSpeedSelect(SelectEntity):
         }
 
 
-class MainDirectionModeSelect(SelectEntity):
+class MainDirectionModeSelect(TerraMowDataPointEntity, SelectEntity):
     """主方向模式选择器 - 使用dp_155数据"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (155,)
     _attr_icon = "mdi:compass"
     _attr_entity_category = EntityCategory.CONFIG
     _attr_translation_key = "main_direction_mode"
@@ -427,20 +423,6 @@ class MainDirectionModeSelect(SelectEntity):
         self.host = basic_data.host
         self.hass = hass
         self._current_option = "MAIN_DIRECTION_MODE_SINGLE"  # 默认单主方向
-        self._pending_mode: str | None = None  # 缓存待生效的模式
-        
-        # 注册设备确认事件监听器
-        self._register_device_confirmation_listener()
-    
-    def _register_device_confirmation_listener(self) -> None:
-        """注册设备确认事件监听器"""
-        async def on_device_confirmed(event):
-            if event.data.get("device_host") == self.host:
-                confirmed_mode = event.data.get("confirmed_mode")
-                if confirmed_mode:
-                    self.on_device_mode_confirmed(confirmed_mode)
-        
-        self.hass.bus.async_listen(f"{DOMAIN}_device_mode_confirmed", on_device_confirmed)
     
     @property
     def device_info(self) -> DeviceInfo:
@@ -449,7 +431,7 @@ class MainDirectionModeSelect(SelectEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -458,19 +440,13 @@ class MainDirectionModeSelect(SelectEntity):
         return f"lawn_mower.terramow@{self.host}.main_direction_mode"
     
     def get_effective_mode(self) -> str:
-        """获取当前生效的模式（包括待处理模式）"""
-        # 如果有待处理的模式，优先返回待处理模式
-        if self._pending_mode:
-            return self._pending_mode
-            
-        # 否则尝试从设备获取实际模式
-        if hasattr(self.basic_data, 'lawn_mower') and self.basic_data.lawn_mower:
-            global_params = self.basic_data.lawn_mower.global_params
-            if global_params:
-                main_direction_config = global_params.get('main_direction_angle_config', {})
-                device_mode = main_direction_config.get('mode')
-                if device_mode and device_mode in self._attr_options:
-                    return device_mode
+        """获取当前生效的模式（包括待确认的模式）"""
+        # 设备确认前返回请求的模式，否则返回设备上报的模式
+        global_params = self.global_params
+        if global_params is not None:
+            device_mode = global_params.main_direction.mode
+            if device_mode and device_mode in self._attr_options:
+                return device_mode
         
         return self._current_option
     
@@ -494,18 +470,8 @@ class MainDirectionModeSelect(SelectEntity):
         # 保存旧模式，用于事件通知
         old_mode = self._current_option
         
-        # 立即设置待处理状态，提供即时反馈
-        self._pending_mode = option
-        self._current_option = option
-        
-        # 立即更新当前实体状态
-        self.async_write_ha_state()
-        
-        # 通知相关角度控制器立即更新可用状态（传递旧模式和新模式）
-        self._notify_angle_controllers_mode_change(old_mode, option)
-        
-        # 获取当前的全局参数以保留其他配置
-        global_params = self.basic_data.lawn_mower.global_params or {}
+        # 基于包含未确认写入的最新参数保留其他配置，避免覆盖尚未生效的修改
+        global_params = self.basic_data.lawn_mower.params_writer.latest
         current_main_direction = global_params.get('main_direction_angle_config', {})
         
         # 构建主方向配置
@@ -533,16 +499,17 @@ class MainDirectionModeSelect(SelectEntity):
                 'angle_interval': current_auto_config.get('angle_interval', 15)
             }
         
-        # 发送设置命令到dp_155
+        # 写入dp_155，短时间内的多次设置合并为一条消息
         command = {
             'main_direction_angle_config': main_direction_config
         }
         
         _LOGGER.info("Setting main direction mode from %s to %s", old_mode, option)
-        self.basic_data.lawn_mower.publish_data_point(155, command)
+        # 立即显示请求的模式，设备确认后结束待确认状态，超时未确认则恢复
+        self.basic_data.lawn_mower.params_writer.async_write(command)
         
-        # 设置超时清理待处理状态（防止设备响应失败导致状态卡死）
-        self.hass.async_create_task(self._clear_pending_mode_after_timeout())
+        # 通知相关角度控制器立即更新可用状态（传递旧模式和新模式）
+        self._notify_angle_controllers_mode_change(old_mode, option)
     
     def _notify_angle_controllers_mode_change(self, old_mode: str, new_mode: str) -> None:
         """通知相关角度控制器模式已改变"""
@@ -595,28 +562,6 @@ class MainDirectionModeSelect(SelectEntity):
         except Exception as e:
             _LOGGER.warning("Failed to force update related entities: %s", e)
     
-    async def _clear_pending_mode_after_timeout(self) -> None:
-        """超时后清理待处理状态"""
-        import asyncio
-        await asyncio.sleep(10)  # 10秒超时
-        if self._pending_mode:
-            _LOGGER.info("Clearing pending mode %s after timeout", self._pending_mode)
-            self._pending_mode = None
-            self.async_write_ha_state()
-    
-    def on_device_mode_confirmed(self, confirmed_mode: str) -> None:
-        """设备确认模式更改后的回调"""
-        if self._pending_mode == confirmed_mode:
-            _LOGGER.debug("Device confirmed mode change to %s, clearing pending state", confirmed_mode)
-            self._pending_mode = None
-            self.async_write_ha_state()
-        elif self._pending_mode:
-            _LOGGER.warning("Device confirmed mode %s but pending mode was %s", 
-                          confirmed_mode, self._pending_mode)
-            self._pending_mode = None
-            self._current_option = confirmed_mode
-            self.async_write_ha_state()
-    
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
@@ -629,30 +574,33 @@ class MainDirectionModeSelect(SelectEntity):
         }
         
         # 添加状态信息
-        if self._pending_mode:
+        reported_params = self.coordinator.global_params
+        reported_mode = (
+            reported_params.main_direction.mode if reported_params is not None else None
+        )
+        effective_mode = self.get_effective_mode()
+        if self.is_write_pending('main_direction_angle_config') and effective_mode != reported_mode:
             attrs['status'] = 'changing_mode'
-            attrs['pending_mode'] = self._pending_mode
+            attrs['pending_mode'] = effective_mode
         else:
             attrs['status'] = 'active'
         
         # 添加当前配置的详细信息
-        if hasattr(self.basic_data, 'lawn_mower') and self.basic_data.lawn_mower:
-            global_params = self.basic_data.lawn_mower.global_params
-            if global_params:
-                main_direction_config = global_params.get('main_direction_angle_config', {})
-                current_angle = main_direction_config.get('current_angle')
-                if current_angle is not None:
-                    attrs['current_angle'] = current_angle
+        global_params = self.global_params
+        if global_params is not None:
+            main_direction_config = global_params.main_direction
+            current_angle = main_direction_config.current_angle
+            if current_angle is not None:
+                attrs['current_angle'] = current_angle
                 
-                mode = main_direction_config.get('mode')
-                if mode == 'MAIN_DIRECTION_MODE_SINGLE':
-                    single_config = main_direction_config.get('single_mode_config', {})
-                    attrs['single_angle'] = single_config.get('angle', 0)
-                elif mode == 'MAIN_DIRECTION_MODE_MULTIPLE':
-                    multiple_config = main_direction_config.get('multiple_mode_config', {})
-                    attrs['multiple_angles'] = multiple_config.get('angles', [])
-                elif mode == 'MAIN_DIRECTION_MODE_AUTO_ROTATE':
-                    auto_config = main_direction_config.get('auto_rotate_mode_config', {})
-                    attrs['auto_rotate_interval'] = auto_config.get('angle_interval', 15)
+            mode = main_direction_config.mode
+            if mode == 'MAIN_DIRECTION_MODE_SINGLE':
+                single_angle = main_direction_config.single_angle
+                attrs['single_angle'] = single_angle if single_angle is not None else 0
+            elif mode == 'MAIN_DIRECTION_MODE_MULTIPLE':
+                attrs['multiple_angles'] = list(main_direction_config.multiple_angles or ())
+            elif mode == 'MAIN_DIRECTION_MODE_AUTO_ROTATE':
+                interval = main_direction_config.auto_rotate_interval
+                attrs['auto_rotate_interval'] = interval if interval is not None else 15
         
         return attrs
\ No newline at end of file
@@ -1,6 +1,5 @@
 from __future__ import annotations
 import logging
-import json
 
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceInfo
@@ -28,10 +27,18 @@ from . import TerraMowBasicData, DOMAIN
 from .const import (
     BLADE_MAINTENANCE_CYCLE_MINUTES,
     BASE_STATION_MAINTENANCE_CYCLE_MINUTES,
+    COMPATIBILITY_INFO_DP,
 )
+from .entity import TerraMowDataPointEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def _or_unknown(value: Any) -> Any:
+    """Return 'unknown' for a field the device did not report."""
+    return 'unknown' if value is None else value
+
+
 class BatteryStateEnum(StrEnum):
     """Battery state type."""
     BATTERY_STATE_CHARGED = "BATTERY_STATE_CHARGED"
@@ -45,10 +52,11 @@ batteryStateDescription = SensorEntityDescription(
     options= [state.value for state in BatteryStateEnum]
 )
 
-class BatterySensor(SensorEntity):
+class BatterySensor(TerraMowDataPointEntity, SensorEntity):
     """Representation of the battery sensor."""
 
     _attr_has_entity_name = True
+    _data_point_ids = (8, 108)
     _attr_icon = "mdi:battery"
     _attr_translation_key = "battery"
     _attr_native_unit_of_measurement = PERCENTAGE
@@ -71,9 +79,6 @@ class BatterySensor(SensorEntity):
         self.basic_data = basic_data
         self.host = self.basic_data.host
         self.hass = hass
-        self._attr_native_value: int | None = None  # 初始化电池电量值
-        self.basic_data.lawn_mower.register_callback(8, self.set_capacity)
-        # self.basic_data.lawn_mower.register_callback(108, self.set_battery_attributes) # This is now handled by the lawn_mower entity
 
         _LOGGER.info("BatterySensor entity created")
 
@@ -84,7 +89,7 @@ class BatterySensor(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
 
     @property
@@ -93,44 +98,31 @@ class BatterySensor(SensorEntity):
         return f"lawn_mower.terramow@{self.host}.battery"
 
 
-    def set_capacity(self, payload :str) -> None:
-        """Handle battery capacity status updates."""
-        try:
-            data = json.loads(payload)
-            self._attr_native_value = data.get('int_value', self._attr_native_value)
-            _LOGGER.info(f"Received battery capacity status: {data}")
-
-        except json.JSONDecodeError:
-            _LOGGER.error(f"Invalid JSON payload: {payload}")
-            return
-
     @property
     def native_value(self) -> int | None:
         """Return value of sensor."""
-        return self._attr_native_value
+        return self.coordinator.battery_level
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return {}
-
-        battery_status = self.basic_data.lawn_mower.battery_status
-        if not battery_status:
+        battery_status = self.coordinator.battery_status
+        if battery_status is None:
             return {}
 
         return {
-            'state': battery_status.get('state', 'unknown'),
-            'temperature': battery_status.get('tempreture', 'unknown').replace('TEMPRETURE', 'TEMPERATURE'),
-            'charger_connected': battery_status.get('charger_connected', 'unknown'),
-            'is_switch_on': battery_status.get('is_switch_on', 'unknown')
+            'state': _or_unknown(battery_status.state),
+            'temperature': _or_unknown(battery_status.temperature),
+            'charger_connected': _or_unknown(battery_status.charger_connected),
+            'is_switch_on': _or_unknown(battery_status.is_switch_on)
         }
 
 
-class TotalMowingTimeSensor(SensorEntity):
+class TotalMowingTimeSensor(TerraMowDataPointEntity, SensorEntity):
     """Total mowing time sensor - uses dp_124 data"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (124,)
     _attr_icon = "mdi:clock"
     _attr_native_unit_of_measurement = UnitOfTime.SECONDS
     _attr_device_class = SensorDeviceClass.DURATION
@@ -155,7 +147,7 @@ class TotalMowingTimeSensor(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -166,20 +158,18 @@ class TotalMowingTimeSensor(SensorEntity):
     @property
     def native_value(self) -> int | None:
         """Return the state of the sensor."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
+        statistics_data = self.coordinator.statistics_data
+        if statistics_data is None:
             return None
             
-        statistics_data = self.basic_data.lawn_mower.statistics_data
-        if not statistics_data:
-            return None
-            
-        return statistics_data.get('duration')
+        return statistics_data.duration
 
 
-class CurrentSessionAreaSensor(SensorEntity):
+class CurrentSessionAreaSensor(TerraMowDataPointEntity, SensorEntity):
     """Current session mowing area sensor - uses dp_113 data"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (113,)
     _attr_icon = "mdi:vector-square"
     _attr_native_unit_of_measurement = UnitOfArea.SQUARE_METERS
     _attr_device_class = None
@@ -204,7 +194,7 @@ class CurrentSessionAreaSensor(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -215,47 +205,42 @@ class CurrentSessionAreaSensor(SensorEntity):
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return None
-            
-        current_work_data = self.basic_data.lawn_mower.current_work_data
-        if not current_work_data:
+        current_work_data = self.coordinator.current_work_data
+        if current_work_data is None:
             return None
         
         # clean_area单位为0.1平方米，转换为平方米
-        clean_area = current_work_data.get('clean_area', 0)
+        clean_area = current_work_data.clean_area
         return round(clean_area / 10, 1) if clean_area else None
     
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return {}
-            
-        current_work_data = self.basic_data.lawn_mower.current_work_data
-        if not current_work_data:
+        current_work_data = self.coordinator.current_work_data
+        if current_work_data is None:
             return {}
         
         attrs = {}
-        work_type = current_work_data.get('type', '')
+        work_type = current_work_data.type
         if work_type:
             attrs['work_type'] = work_type
         
-        total_area = current_work_data.get('total_area', 0)
+        total_area = current_work_data.total_area
         if total_area:
             attrs['total_area'] = round(total_area / 10, 1)
         
-        is_completed = current_work_data.get('is_completed')
+        is_completed = current_work_data.is_completed
         if is_completed is not None:
             attrs['is_completed'] = is_completed
             
         return attrs
 
 
-class CurrentSessionTimeSensor(SensorEntity):
+class CurrentSessionTimeSensor(TerraMowDataPointEntity, SensorEntity):
     """Current session mowing time sensor - uses dp_113 data"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (113,)
     _attr_icon = "mdi:timer"
     _attr_native_unit_of_measurement = UnitOfTime.SECONDS
     _attr_device_class = SensorDeviceClass.DURATION
@@ -280,7 +265,7 @@ class CurrentSessionTimeSensor(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -291,20 +276,18 @@ class CurrentSessionTimeSensor(SensorEntity):
     @property
     def native_value(self) -> int | None:
         """Return the state of the sensor."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return None
-            
-        current_work_data = self.basic_data.lawn_mower.current_work_data
-        if not current_work_data:
+        current_work_data = self.coordinator.current_work_data
+        if current_work_data is None:
             return None
             
-        return current_work_data.get('work_duration')
+        return current_work_data.work_duration
 
 
-class RemainingBladeTimeSensor(SensorEntity):
+class RemainingBladeTimeSensor(TerraMowDataPointEntity, SensorEntity):
     """Remaining blade usage time sensor - uses dp_126 data"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (126,)
     _attr_icon = "mdi:saw-blade"
     _attr_native_unit_of_measurement = UnitOfTime.MINUTES
     _attr_device_class = SensorDeviceClass.DURATION
@@ -329,7 +312,7 @@ class RemainingBladeTimeSensor(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -340,14 +323,10 @@ class RemainingBladeTimeSensor(SensorEntity):
     @property
     def native_value(self) -> int | None:
         """Return the state of the sensor."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return None
-            
-        blade_time = self.basic_data.lawn_mower.blade_time
-        if not blade_time:
+        used_time = self.coordinator.blade_time
+        if used_time is None:
             return None
 
-        used_time = blade_time.get('int_value', 0)
         # 刀盘推荐清洁周期为240小时,即14400分钟
         remaining_time = BLADE_MAINTENANCE_CYCLE_MINUTES - used_time
         return max(0, remaining_time)
@@ -355,14 +334,10 @@ class RemainingBladeTimeSensor(SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return {}
-            
-        blade_time = self.basic_data.lawn_mower.blade_time
-        if not blade_time:
+        used_time = self.coordinator.blade_time
+        if used_time is None:
             return {}
 
-        used_time = blade_time.get('int_value', 0)
         return {
             'used_time': used_time,
             'recommended_cycle': BLADE_MAINTENANCE_CYCLE_MINUTES,
@@ -371,10 +346,11 @@ class RemainingBladeTimeSensor(SensorEntity):
         }
 
 
-class RemainingBaseStationTimeSensor(SensorEntity):
+class RemainingBaseStationTimeSensor(TerraMowDataPointEntity, SensorEntity):
     """Remaining base station cleaning time sensor - uses dp_125 data"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (125,)
     _attr_icon = "mdi:home-clock"
     _attr_native_unit_of_measurement = UnitOfTime.MINUTES
     _attr_device_class = SensorDeviceClass.DURATION
@@ -399,7 +375,7 @@ class RemainingBaseStationTimeSensor(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -410,14 +386,10 @@ class RemainingBaseStationTimeSensor(SensorEntity):
     @property
     def native_value(self) -> int | None:
         """Return the state of the sensor."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return None
-            
-        base_station_time = self.basic_data.lawn_mower.base_station_time
-        if not base_station_time:
+        used_time = self.coordinator.base_station_time
+        if used_time is None:
             return None
         
-        used_time = base_station_time.get('int_value', 0)
         # 基站推荐清洁周期为30天，即43200分钟
         remaining_time = BASE_STATION_MAINTENANCE_CYCLE_MINUTES - used_time
         return max(0, remaining_time)
@@ -425,14 +397,10 @@ class RemainingBaseStationTimeSensor(SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return {}
-            
-        base_station_time = self.basic_data.lawn_mower.base_station_time
-        if not base_station_time:
+        used_time = self.coordinator.base_station_time
+        if used_time is None:
             return {}
         
-        used_time = base_station_time.get('int_value', 0)
         return {
             'used_time': used_time,
             'recommended_cycle': BASE_STATION_MAINTENANCE_CYCLE_MINUTES,  # 30 days in minutes
@@ -441,10 +409,11 @@ class RemainingBaseStationTimeSensor(SensorEntity):
         }
 
 
-class TerraMowMowHeightSensor(SensorEntity):
+class TerraMowMowHeightSensor(TerraMowDataPointEntity, SensorEntity):
     """割草高度传感器 - 使用dp_155数据"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (155,)
     _attr_icon = "mdi:arrow-up-down"
     _attr_native_unit_of_measurement = UnitOfLength.MILLIMETERS
     _attr_device_class = SensorDeviceClass.DISTANCE
@@ -469,7 +438,7 @@ class TerraMowMowHeightSensor(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -480,21 +449,18 @@ class TerraMowMowHeightSensor(SensorEntity):
     @property
     def native_value(self) -> int | None:
         """Return the state of the sensor."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return None
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.coordinator.global_params
+        if global_params is None:
             return None
             
-        mow_height = global_params.get('mow_height', {})
-        return mow_height.get('value')
+        return global_params.mow_height
 
 
-class TerraMowMowSpeedSensor(SensorEntity):
+class TerraMowMowSpeedSensor(TerraMowDataPointEntity, SensorEntity):
     """割草速度传感器 - 使用dp_155数据"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (155,)
     _attr_icon = "mdi:speedometer"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_translation_key = "mow_speed"
@@ -518,7 +484,7 @@ class TerraMowMowSpeedSensor(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -529,51 +495,41 @@ class TerraMowMowSpeedSensor(SensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return None
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.coordinator.global_params
+        if global_params is None:
             return None
             
-        mow_speed = global_params.get('mow_speed', {})
-        speed_type = mow_speed.get('speed_type')
-        return speed_type
+        return global_params.mow_speed
     
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return {}
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.coordinator.global_params
+        if global_params is None:
             return {}
         
         attrs = {}
         
         # 割草间距
-        mow_spacing = global_params.get('mow_spacing', {})
-        if 'value' in mow_spacing:
-            attrs['mow_spacing'] = mow_spacing['value']
+        if global_params.mow_spacing is not None:
+            attrs['mow_spacing'] = global_params.mow_spacing
             
         # 沿边割草距离
-        edge_cutting_distance = global_params.get('edge_cutting_distance', {})
-        if 'value' in edge_cutting_distance:
-            attrs['edge_cutting_distance'] = edge_cutting_distance['value']
+        if global_params.edge_cutting_distance is not None:
+            attrs['edge_cutting_distance'] = global_params.edge_cutting_distance
             
         # 刀盘转速
-        blade_disk_speed = global_params.get('blade_disk_speed', {})
-        if 'speed_type' in blade_disk_speed:
-            attrs['blade_disk_speed'] = blade_disk_speed['speed_type']
+        if global_params.blade_disk_speed is not None:
+            attrs['blade_disk_speed'] = global_params.blade_disk_speed
         
         return attrs
 
 
-class NextScheduledStartSensor(SensorEntity):
+class NextScheduledStartSensor(TerraMowDataPointEntity, SensorEntity):
     """Next scheduled start sensor - uses dp_138 data"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (138,)
     _attr_icon = "mdi:calendar-clock"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_translation_key = "next_scheduled_start"
@@ -596,7 +552,7 @@ class NextScheduledStartSensor(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -607,57 +563,45 @@ class NextScheduledStartSensor(SensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return None
-            
-        schedule_data = self.basic_data.lawn_mower.schedule_data
-        if not schedule_data:
+        schedule_data = self.coordinator.schedule_data
+        if schedule_data is None:
             return None
         
         # 检查是否存在预约
-        if not schedule_data.get('exist', False):
+        if not schedule_data.exist:
             return None
         
-        start_time = schedule_data.get('start_time', {})
-        if not start_time or 'hour' not in start_time or 'minute' not in start_time:
-            return None
-        
-        # 返回格式化的时间字符串
-        hour = start_time['hour']
-        minute = start_time['minute']
-        return f"{hour:02d}:{minute:02d}"
+        # 格式化的时间字符串
+        return schedule_data.start_time
     
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return {}
-            
-        schedule_data = self.basic_data.lawn_mower.schedule_data
-        if not schedule_data:
+        schedule_data = self.coordinator.schedule_data
+        if schedule_data is None:
             return {}
         
         attrs = {}
         
-        if schedule_data.get('exist', False):
+        if schedule_data.exist:
             attrs['has_schedule'] = True
-            attrs['item_id'] = schedule_data.get('item_id')
-            attrs['shift_id'] = schedule_data.get('shift_id')
+            attrs['item_id'] = schedule_data.item_id
+            attrs['shift_id'] = schedule_data.shift_id
             
             # 结束时间
-            end_time = schedule_data.get('end_time', {})
-            if end_time and 'hour' in end_time and 'minute' in end_time:
-                attrs['end_time'] = f"{end_time['hour']:02d}:{end_time['minute']:02d}"
+            if schedule_data.end_time is not None:
+                attrs['end_time'] = schedule_data.end_time
         else:
             attrs['has_schedule'] = False
         
         return attrs
 
 
-class VersionCompatibilitySensor(SensorEntity):
+class VersionCompatibilitySensor(TerraMowDataPointEntity, SensorEntity):
     """版本兼容性状态传感器."""
 
     _attr_has_entity_name = True
+    _data_point_ids = (COMPATIBILITY_INFO_DP,)
     _attr_icon = "mdi:update"
     _attr_translation_key = "version_compatibility"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
@@ -678,7 +622,7 @@ class VersionCompatibilitySensor(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
 
     @property
@@ -769,10 +713,11 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class MainDirectionStatusSensor(SensorEntity):
+class MainDirectionStatusSensor(TerraMowDataPointEntity, SensorEntity):
     """主方向状态传感器 - 显示当前主方向配置和角度"""
     
     _attr_has_entity_name = True
+    _data_point_ids = (155,)
     _attr_icon = "mdi:compass"
     _attr_translation_key = "main_direction_status"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
@@ -795,7 +740,7 @@ class MainDirectionStatusSensor(SensorEntity):
             identifiers={('TerraMowLawnMower', self.basic_data.host)}, # Corrected typo in identifier
             name='TerraMow',
             manufacturer='TerraMow',
-            model=self.basic_data.lawn_mower._device_model # Use dynamically updated model
+            model=self.basic_data.coordinator.device_model # Use dynamically updated model
         )
     
     @property
@@ -806,15 +751,11 @@ class MainDirectionStatusSensor(SensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return the sensor value."""
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return "unavailable"
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.coordinator.global_params
+        if global_params is None:
             return "no_config"
         
-        main_direction_config = global_params.get('main_direction_angle_config', {})
-        mode = main_direction_config.get('mode', 'MAIN_DIRECTION_MODE_SINGLE')
+        mode = global_params.main_direction.mode or 'MAIN_DIRECTION_MODE_SINGLE'
         
         # 返回当前模式作为传感器值
         return mode
@@ -824,44 +765,42 @@ class MainDirectionStatusSensor(SensorEntity):
         """Return entity specific state attributes."""
         attrs = {}
         
-        if not hasattr(self.basic_data, 'lawn_mower') or not self.basic_data.lawn_mower:
-            return attrs
-            
-        global_params = self.basic_data.lawn_mower.global_params
-        if not global_params:
+        global_params = self.coordinator.global_params
+        if global_params is None:
             return attrs
         
-        main_direction_config = global_params.get('main_direction_angle_config', {})
+        main_direction_config = global_params.main_direction
         
         # 基本模式信息
-        mode = main_direction_config.get('mode', 'MAIN_DIRECTION_MODE_SINGLE')
+        mode = main_direction_config.mode or 'MAIN_DIRECTION_MODE_SINGLE'
         attrs['mode'] = mode
         
         # 当前角度（如果有）
-        current_angle = main_direction_config.get('current_angle')
+        current_angle = main_direction_config.current_angle
         if current_angle is not None:
             attrs['current_angle'] = current_angle
             attrs['current_angle_degrees'] = f"{current_angle}°"
         
         # 根据模式添加特定配置信息
         if mode == 'MAIN_DIRECTION_MODE_SINGLE':
-            single_config = main_direction_config.get('single_mode_config', {})
-            configured_angle = single_config.get('angle', 0)
+            configured_angle = main_direction_config.single_angle
+            if configured_angle is None:
+                configured_angle = 0
             attrs['configured_angle'] = configured_angle
             attrs['configured_angle_degrees'] = f"{configured_angle}°"
             attrs['mode_description'] = "Single main direction"
             
         elif mode == 'MAIN_DIRECTION_MODE_MULTIPLE':
-            multiple_config = main_direction_config.get('multiple_mode_config', {})
-            configured_angles = multiple_config.get('angles', [])
+            configured_angles = list(main_direction_config.multiple_angles or ())
             attrs['configured_angles'] = configured_angles
             attrs['configured_angles_degrees'] = [f"{angle}°" for angle in configured_angles]
             attrs['angles_count'] = len(configured_angles)
             attrs['mode_description'] = "Multiple main directions"
             
         elif mode == 'MAIN_DIRECTION_MODE_AUTO_ROTATE':
-            auto_config = main_direction_config.get('auto_rotate_mode_config', {})
-            interval = auto_config.get('angle_interval', 15)
+            interval = main_direction_config.auto_rotate_interval
+            if interval is None:
+                interval = 15
             attrs['rotation_interval'] = interval
             attrs['rotation_interval_degrees'] = f"{interval}°"
             attrs['mode_description'] = "Auto rotate main direction"
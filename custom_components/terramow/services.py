@@ -0,0 +1,38 @@
+"""Services for the TerraMow integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, ServiceCall
+
+from .const import DOMAIN, SERVICE_REFRESH_COMPATIBILITY_INFO
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services once for all config entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_REFRESH_COMPATIBILITY_INFO):
+        return
+
+    async def async_refresh_compatibility_info(call: ServiceCall) -> None:
+        """Re-query the version compatibility info of every TerraMow robot."""
+        lawn_mowers = [
+            basic_data.lawn_mower
+            for basic_data in hass.data.get(DOMAIN, {}).values()
+            if basic_data.lawn_mower is not None
+        ]
+        await asyncio.gather(
+            *(lawn_mower.async_request_compatibility_info() for lawn_mower in lawn_mowers)
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH_COMPATIBILITY_INFO, async_refresh_compatibility_info
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the integration services after the last config entry is unloaded."""
+    hass.services.async_remove(DOMAIN, SERVICE_REFRESH_COMPATIBILITY_INFO)
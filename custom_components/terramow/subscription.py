@@ -0,0 +1,199 @@
+"""MQTT subscription management for the TerraMow integration."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any
+
+import paho.mqtt.client as mqtt_client
+
+from .const import (
+    MAP_INFO_TOPIC,
+    MODEL_NAME_TOPIC,
+    SUBSCRIPTION_MODE_WILDCARD,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_POINT_WILDCARD_TOPIC = "data_point/+/robot"
+
+# 固定订阅的特殊主题
+SPECIAL_TOPICS = (MAP_INFO_TOPIC, MODEL_NAME_TOPIC)
+
+
+def data_point_topic(dp_id: int) -> str:
+    """Return the robot side topic of a data point."""
+    return f"data_point/{dp_id}/robot"
+
+
+class SubscriptionManager:
+    """Keep the broker subscriptions of one mower in sync with the consumers.
+
+    In wildcard mode a single ``data_point/+/robot`` subscription is used.
+    In demand mode only data points with registered callbacks are subscribed,
+    all of them in one SUBSCRIBE packet on connect, and topics are added or
+    removed incrementally while connected.
+
+    With a persistent session the broker keeps the subscriptions while the
+    client is disconnected. When it reports the session as present on
+    connect, only the topics that changed in the meantime are subscribed or
+    unsubscribed.
+    """
+
+    def __init__(self, mode: str) -> None:
+        """Initialize the subscription manager."""
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._client: mqtt_client.Client | None = None
+        self._dp_ids: set[int] = set()
+        self._initial_mid: int | None = None
+        self._session_topics: set[str] | None = None  # 代理会话中已订阅的主题
+
+        # 统计信息
+        self._connect_started: float | None = None
+        self._connected_at: float | None = None
+        self.subscribe_packets = 0
+        self.unsubscribe_packets = 0
+        self.sessions_resumed = 0
+        self.last_resubscribe_duration: float | None = None
+        self.last_reconnect_duration: float | None = None
+        self.messages_received = 0
+        self.bytes_received = 0
+        self.messages_unhandled = 0
+
+    @property
+    def wildcard(self) -> bool:
+        """Return True if a single wildcard subscription is used."""
+        return self.mode == SUBSCRIPTION_MODE_WILDCARD
+
+    def topics(self) -> list[str]:
+        """Return the topics that should currently be subscribed."""
+        if self.wildcard:
+            topics = [DATA_POINT_WILDCARD_TOPIC]
+        else:
+            topics = [data_point_topic(dp_id) for dp_id in sorted(self._dp_ids)]
+        topics.extend(SPECIAL_TOPICS)
+        return topics
+
+    def mark_connect_started(self) -> None:
+        """Record the start of a (re)connect attempt."""
+        if self._connect_started is None:
+            self._connect_started = time.monotonic()
+
+    def on_connect(self, client: mqtt_client.Client, session_present: bool = False) -> None:
+        """Subscribe all topics in a single SUBSCRIBE packet.
+
+        If the broker resumed the previous session, only the difference to
+        the topics subscribed in that session is sent.
+        """
+        with self._lock:
+            self._client = client
+            self._connected_at = time.monotonic()
+            topics = self.topics()
+            if session_present and self._session_topics is not None:
+                self.sessions_resumed += 1
+                subscribe = [topic for topic in topics if topic not in self._session_topics]
+                unsubscribe = sorted(self._session_topics.difference(topics))
+                if unsubscribe:
+                    client.unsubscribe(unsubscribe)
+                    self.unsubscribe_packets += 1
+            else:
+                subscribe = topics
+            self._session_topics = set(topics)
+            if subscribe:
+                self._initial_mid = self._subscribe(client, subscribe)
+            else:
+                # 会话中已有全部订阅，无需等待SUBACK
+                self._initial_mid = None
+                self._record_subscribed()
+        if subscribe is topics:
+            _LOGGER.info("Subscribed to %d topics (%s mode)", len(topics), self.mode)
+        else:
+            _LOGGER.info(
+                "Session resumed, subscribed %d of %d topics (%s mode)",
+                len(subscribe), len(topics), self.mode,
+            )
+
+    def on_disconnect(self) -> None:
+        """Forget the client until the next connect."""
+        with self._lock:
+            self._client = None
+            self._initial_mid = None
+        self.mark_connect_started()
+
+    def on_subscribe(self, _client, _userdata, mid, _granted_qos) -> None:  # type: ignore[no-untyped-def]
+        """Record how long the connection took to become fully subscribed."""
+        with self._lock:
+            if mid != self._initial_mid or self._connected_at is None:
+                return
+            # 连接后的首次订阅已确认
+            self._initial_mid = None
+            self._record_subscribed()
+        _LOGGER.debug(
+            "Subscriptions acknowledged in %.3fs", self.last_resubscribe_duration
+        )
+
+    def _record_subscribed(self) -> None:
+        """Record the subscribe and reconnect durations; caller holds the lock."""
+        now = time.monotonic()
+        self.last_resubscribe_duration = now - self._connected_at
+        if self._connect_started is not None:
+            self.last_reconnect_duration = now - self._connect_started
+            self._connect_started = None
+
+    def add_data_point(self, dp_id: int) -> None:
+        """Subscribe to a data point that gained its first consumer."""
+        with self._lock:
+            if dp_id in self._dp_ids:
+                return
+            self._dp_ids.add(dp_id)
+            if self._client is not None and not self.wildcard:
+                topic = data_point_topic(dp_id)
+                self._subscribe(self._client, [topic])
+                self._session_topics.add(topic)
+
+    def remove_data_point(self, dp_id: int) -> None:
+        """Unsubscribe from a data point that lost its last consumer."""
+        with self._lock:
+            if dp_id not in self._dp_ids:
+                return
+            self._dp_ids.discard(dp_id)
+            if self._client is not None and not self.wildcard:
+                topic = data_point_topic(dp_id)
+                self._client.unsubscribe(topic)
+                self.unsubscribe_packets += 1
+                self._session_topics.discard(topic)
+
+    def record_message(self, size: int, handled: bool) -> None:
+        """Account for a received message."""
+        self.messages_received += 1
+        self.bytes_received += size
+        if not handled:
+            self.messages_unhandled += 1
+
+    def _subscribe(self, client: mqtt_client.Client, topics: list[str]) -> int | None:
+        """Send one SUBSCRIBE packet for all topics and return its message id."""
+        result, mid = client.subscribe([(topic, 0) for topic in topics])
+        if result != mqtt_client.MQTT_ERR_SUCCESS:
+            _LOGGER.warning("Failed to subscribe %s: %s", topics, result)
+            return None
+        self.subscribe_packets += 1
+        return mid
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return subscription statistics for diagnostics."""
+        return {
+            "mode": self.mode,
+            "topics": self.topics(),
+            "connected": self._client is not None,
+            "subscribe_packets": self.subscribe_packets,
+            "unsubscribe_packets": self.unsubscribe_packets,
+            "sessions_resumed": self.sessions_resumed,
+            "last_resubscribe_duration": self.last_resubscribe_duration,
+            "last_reconnect_duration": self.last_reconnect_duration,
+            "messages_received": self.messages_received,
+            "bytes_received": self.bytes_received,
+            "messages_unhandled": self.messages_unhandled,
+        }
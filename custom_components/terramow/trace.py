@@ -0,0 +1,61 @@
+"""Message trace buffer for the TerraMow integration."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from datetime import UTC, datetime
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_RECEIVED = "received"
+TRACE_SENT = "sent"
+
+
+class TraceBuffer:
+    """Keep the last payloads of every data point in memory.
+
+    Recording only appends the raw payload with a timestamp to a bounded
+    ring buffer per key, so it is cheap enough for the receive path. The
+    payloads are formatted when the buffer is dumped (diagnostics). Every
+    ``sample_rate``-th payload of a key is additionally written to the debug
+    log; 0 disables logging.
+    """
+
+    def __init__(self, size: int, sample_rate: int) -> None:
+        """Initialize the trace buffer."""
+        self._size = size
+        self.sample_rate = sample_rate
+        self._buffers: dict[Any, deque[tuple[float, str, bytes]]] = {}
+        self._counts: dict[Any, int] = {}
+
+    def record(self, key: Any, direction: str, payload: bytes) -> None:
+        """Record a received or sent payload of key."""
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = deque(maxlen=self._size)
+        buffer.append((time.time(), direction, payload))
+
+        if not self.sample_rate:
+            return
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+        if count % self.sample_rate == 0 and _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s %s (%d bytes): %s", key, direction, len(payload), payload)
+
+    def as_dict(self) -> dict[str, list[dict[str, Any]]]:
+        """Return the recorded payloads for diagnostics."""
+        return {
+            str(key): [
+                {
+                    "time": datetime.fromtimestamp(timestamp, UTC).isoformat(),
+                    "direction": direction,
+                    "size": len(payload),
+                    "payload": payload.decode(errors="replace"),
+                }
+                for timestamp, direction, payload in list(buffer)
+            ]
+            for key, buffer in list(self._buffers.items())
+        }
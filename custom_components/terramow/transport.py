@@ -0,0 +1,107 @@
+"""MQTT transport helpers for the TerraMow integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+import paho.mqtt.client as mqtt_client
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# loop_misc 调用间隔 (单位: 秒)，负责心跳和超时检测
+MISC_LOOP_INTERVAL = 1.0
+
+
+def is_event_loop_thread(hass: HomeAssistant) -> bool:
+    """Return True if the caller runs inside the Home Assistant event loop."""
+    try:
+        return asyncio.get_running_loop() is hass.loop
+    except RuntimeError:
+        return False
+
+
+class AsyncioMqttLoop:
+    """Drive a paho MQTT client from the Home Assistant event loop.
+
+    Instead of running ``loop_forever`` in a dedicated thread, the client
+    socket is registered with the event loop via ``add_reader``/``add_writer``
+    so that paho's ``loop_read``/``loop_write`` run directly on the loop and
+    message callbacks are dispatched without a thread hop. ``loop_misc`` is
+    called periodically to keep the connection alive.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: mqtt_client.Client) -> None:
+        """Attach the socket callbacks of the client to the event loop."""
+        self._hass = hass
+        self._loop = hass.loop
+        self._client = client
+        self._sock_fd: int | None = None
+        self._misc_task: asyncio.Task | None = None
+
+        client.on_socket_open = self._on_socket_open
+        client.on_socket_close = self._on_socket_close
+        client.on_socket_register_write = self._on_socket_register_write
+        client.on_socket_unregister_write = self._on_socket_unregister_write
+
+    def _call_in_loop(self, func: Callable[..., None], *args: Any) -> None:
+        """Run func in the event loop.
+
+        paho calls the socket hooks from whichever thread drives the client
+        (the executor while connecting), so hop to the loop when needed.
+        """
+        if is_event_loop_thread(self._hass):
+            func(*args)
+        else:
+            self._loop.call_soon_threadsafe(func, *args)
+
+    def _on_socket_open(self, client, _userdata, sock) -> None:  # type: ignore[no-untyped-def]
+        """Start watching the socket once it is opened."""
+        self._call_in_loop(self._async_socket_open, client, sock.fileno())
+
+    def _async_socket_open(self, client: mqtt_client.Client, sock_fd: int) -> None:
+        _LOGGER.debug("MQTT socket opened, fd=%d", sock_fd)
+        self._sock_fd = sock_fd
+        self._loop.add_reader(sock_fd, client.loop_read)
+        if self._misc_task is None or self._misc_task.done():
+            self._misc_task = self._loop.create_task(self._async_misc_loop())
+
+    def _on_socket_close(self, _client, _userdata, sock) -> None:  # type: ignore[no-untyped-def]
+        """Stop watching the socket before it is closed."""
+        self._call_in_loop(self._async_socket_close)
+
+    def _async_socket_close(self) -> None:
+        if self._sock_fd is None:
+            return
+        _LOGGER.debug("MQTT socket closed, fd=%d", self._sock_fd)
+        self._loop.remove_reader(self._sock_fd)
+        self._loop.remove_writer(self._sock_fd)
+        self._sock_fd = None
+        if self._misc_task is not None:
+            self._misc_task.cancel()
+            self._misc_task = None
+
+    def _on_socket_register_write(self, client, _userdata, _sock) -> None:  # type: ignore[no-untyped-def]
+        """Flush pending packets as soon as the socket is writable."""
+        self._call_in_loop(self._async_register_write, client)
+
+    def _async_register_write(self, client: mqtt_client.Client) -> None:
+        if self._sock_fd is not None:
+            self._loop.add_writer(self._sock_fd, client.loop_write)
+
+    def _on_socket_unregister_write(self, _client, _userdata, _sock) -> None:  # type: ignore[no-untyped-def]
+        """Stop waiting for the socket to become writable."""
+        self._call_in_loop(self._async_unregister_write)
+
+    def _async_unregister_write(self) -> None:
+        if self._sock_fd is not None:
+            self._loop.remove_writer(self._sock_fd)
+
+    async def _async_misc_loop(self) -> None:
+        """Periodically run loop_misc to handle keepalive pings and timeouts."""
+        while self._client.loop_misc() == mqtt_client.MQTT_ERR_SUCCESS:
+            await asyncio.sleep(MISC_LOOP_INTERVAL)
+        _LOGGER.debug("MQTT misc loop finished")
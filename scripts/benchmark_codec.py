@@ -0,0 +1,116 @@
+"""Benchmark the JSON codec layer against decoding with the json module.
+
+Run from the repository root in the development environment:
+
+    python scripts/benchmark_codec.py
+
+Compares json.loads(payload.decode()), as done before the codec layer,
+with codec.loads(payload) for payloads of the size the robot sends, and
+json.dumps with codec.dumps for a command. The codec uses orjson when it
+is importable, so the reported codec name tells which one was measured.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.terramow import codec  # noqa: E402
+
+# 开发者文档中的示例负载
+MISSION_STATUS = {
+    "mission": "MISSION_GLOBAL_CLEAN",
+    "sub_mission": "SUB_MISSION_IDLE",
+    "state": "MISSION_STATE_RUNNING",
+    "power_mode": "POWER_MODE_RUNNING",
+    "has_error": False,
+    "is_saving_data": False,
+    "back_to_station_reason": "BACK_TO_STATION_REASON_NONE",
+    "is_robot_navi_located": True,
+    "is_upgrading": False,
+    "is_data_conversion_in_progress": False,
+}
+GLOBAL_PARAMS = {
+    "mow_height": {"value": 40},
+    "mow_speed": {"speed_type": "MOW_SPEED_TYPE_MEDIUM"},
+    "edge_cutting_distance": {"value": 10},
+    "main_direction_angle_config": {
+        "mode": "MAIN_DIRECTION_MODE_SINGLE",
+        "single_mode_config": {"angle": 0},
+        "current_angle": 0,
+    },
+    "mow_spacing": {"value": 100},
+    "blade_disk_speed": {"speed_type": "BLADE_DISK_SPEED_TYPE_HIGH"},
+    "current_mow_spacing": 100,
+}
+# 6个区域、每个区域4个子区域，子区域带边界点，大小与实际地图信息相近
+MAP_INFO = {
+    "id": 1,
+    "name": "Garden",
+    "map_state": "MAP_STATE_COMPLETE",
+    "total_area": 98765,
+    "clean_info": {
+        "mode": "MAP_CLEAN_INFO_MODE_SELECT_REGION",
+        "select_region": {"region_id": [1, 2]},
+    },
+    "regions": [
+        {
+            "id": region,
+            "name": f"Region {region}",
+            "sub_regions": [
+                {
+                    "id": region * 10 + zone,
+                    "name": f"Zone {region}.{zone}",
+                    "points": [
+                        {"x": 1000 + point * 37, "y": -2000 + point * 11}
+                        for point in range(40)
+                    ],
+                }
+                for zone in range(4)
+            ],
+        }
+        for region in range(6)
+    ],
+}
+START_COMMAND = {
+    "seq": 42,
+    "mode": "START_MODE_GLOBAL_CLEAN",
+    "global_clean": {"restart": False},
+}
+
+
+def best_of(func, number: int) -> float:
+    """Return the best time per call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    """Run the benchmark."""
+    print(f"Python {sys.version.split()[0]}, codec {codec.CODEC_NAME}, best of 5")
+    for name, value, number in (
+        ("dp107", MISSION_STATUS, 20000),
+        ("dp155", GLOBAL_PARAMS, 20000),
+        ("map info", MAP_INFO, 200),
+    ):
+        payload = json.dumps(value).encode()
+        before = best_of(lambda payload=payload: json.loads(payload.decode()), number)
+        after = best_of(lambda payload=payload: codec.loads(payload), number)
+        print(
+            f"decode {name} ({len(payload)} B): json {before:.2f} us, "
+            f"codec {after:.2f} us, {before / after:.1f}x"
+        )
+
+    before = best_of(lambda: json.dumps(START_COMMAND).encode(), 20000)
+    after = best_of(lambda: codec.dumps(START_COMMAND), 20000)
+    print(
+        f"encode dp103 command: json {before:.2f} us, "
+        f"codec {after:.2f} us, {before / after:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Benchmark the typed data point models against reading the decoded dicts.
+
+Run from the repository root in the development environment:
+
+    python scripts/benchmark_models.py
+
+Reports the cost of the entity reads of one state refresh, the cost of
+building the models once per payload and the memory of the decoded
+payloads with and without the cached models.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.terramow import models  # noqa: E402
+from custom_components.terramow.const import MAP_INFO_TOPIC  # noqa: E402
+
+# 开发者文档中的示例负载，地图信息为6个区域、每个区域4个子区域
+PAYLOADS = {
+    108: {
+        "state": "BATTERY_STATE_CHARGING",
+        "charger_connected": True,
+        "is_switch_on": True,
+        "tempreture": "BATTERY_TEMPRETURE_NORMAL",
+    },
+    113: {
+        "type": "MAP_AREA_TYPE_CLEANING",
+        "total_area": 3000,
+        "clean_area": 1500,
+        "is_completed": False,
+        "work_duration": 1800,
+    },
+    117: {
+        "is_map_detected": True,
+        "map_id": 1,
+        "map_state": "MAP_STATE_COMPLETE",
+        "map_number": 2,
+        "is_backing_up_map": False,
+        "main_direction_angle": 0,
+        "is_spot_mode_map": False,
+        "spot_mode_map_number": 0,
+        "is_able_to_run_build_map": False,
+        "backup_map_backup_id": 0,
+    },
+    124: {"duration": 7200, "clean_area": 2000, "clean_times": 5},
+    138: {
+        "exist": True,
+        "item_id": 1,
+        "shift_id": 0,
+        "start_time": {"hour": 14, "minute": 30},
+        "end_time": {"hour": 16, "minute": 0},
+    },
+    155: {
+        "mow_height": {"value": 40},
+        "mow_speed": {"speed_type": "MOW_SPEED_TYPE_MEDIUM"},
+        "edge_cutting_distance": {"value": 10},
+        "main_direction_angle_config": {
+            "mode": "MAIN_DIRECTION_MODE_MULTIPLE",
+            "multiple_mode_config": {"angles": [0, 90]},
+            "current_angle": 0,
+        },
+        "mow_spacing": {"value": 100},
+        "blade_disk_speed": {"speed_type": "BLADE_DISK_SPEED_TYPE_HIGH"},
+        "current_mow_spacing": 100,
+    },
+    MAP_INFO_TOPIC: {
+        "id": 1,
+        "name": "Garden",
+        "map_state": "MAP_STATE_COMPLETE",
+        "total_area": 98765,
+        "clean_info": {
+            "mode": "MAP_CLEAN_INFO_MODE_SELECT_REGION",
+            "select_region": {"region_id": [1, 2]},
+        },
+        "regions": [
+            {
+                "id": region,
+                "name": f"Region {region}",
+                "sub_regions": [
+                    {"id": region * 10 + zone, "name": f"Zone {region}.{zone}"}
+                    for zone in range(4)
+                ],
+            }
+            for region in range(6)
+        ],
+    },
+}
+
+MODELS = {
+    108: models.BatteryStatus,
+    113: models.WorkData,
+    117: models.MapStatus,
+    124: models.Statistics,
+    138: models.Schedule,
+    155: models.GlobalParams,
+    MAP_INFO_TOPIC: models.MapInfo,
+}
+
+
+def read_dicts(data: dict) -> list:
+    """Entity reads of one state refresh as done before the models."""
+    params = data[155] or {}
+    direction = params.get("main_direction_angle_config", {})
+    work = data[113] or {}
+    battery = data[108] or {}
+    schedule = data[138] or {}
+    start_time = schedule.get("start_time", {})
+    map_info = data[MAP_INFO_TOPIC] or {}
+    values = [
+        params.get("mow_height", {}).get("value"),
+        params.get("mow_speed", {}).get("speed_type"),
+        params.get("mow_spacing", {}).get("value"),
+        params.get("edge_cutting_distance", {}).get("value"),
+        params.get("blade_disk_speed", {}).get("speed_type"),
+        direction.get("mode", "MAIN_DIRECTION_MODE_SINGLE"),
+        direction.get("current_angle"),
+        direction.get("multiple_mode_config", {}).get("angles", [0, 90]),
+        work.get("clean_area", 0),
+        work.get("total_area", 0),
+        work.get("work_duration"),
+        battery.get("state", "unknown"),
+        battery.get("tempreture", "unknown").replace("TEMPRETURE", "TEMPERATURE"),
+        map_info.get("clean_info", {}).get("mode", ""),
+    ]
+    if schedule.get("exist", False) and "hour" in start_time and "minute" in start_time:
+        values.append(f"{start_time['hour']:02d}:{start_time['minute']:02d}")
+    for region in map_info.get("regions", []):
+        for sub_region in region.get("sub_regions", []):
+            values.append((sub_region.get("id"), sub_region.get("name", "")))
+    return values
+
+
+def read_models(data: dict) -> list:
+    """The same reads through the models."""
+    params = data[155]
+    direction = params.main_direction
+    work = data[113]
+    battery = data[108]
+    schedule = data[138]
+    map_info = data[MAP_INFO_TOPIC]
+    values = [
+        params.mow_height,
+        params.mow_speed,
+        params.mow_spacing,
+        params.edge_cutting_distance,
+        params.blade_disk_speed,
+        direction.mode or "MAIN_DIRECTION_MODE_SINGLE",
+        direction.current_angle,
+        direction.multiple_angles,
+        work.clean_area,
+        work.total_area,
+        work.work_duration,
+        battery.state,
+        battery.temperature,
+        map_info.clean_mode,
+    ]
+    if schedule.exist and schedule.start_time is not None:
+        values.append(schedule.start_time)
+    for region in map_info.regions:
+        for sub_region in region.sub_regions:
+            values.append((sub_region.id, sub_region.name))
+    return values
+
+
+def best_of(func, number: int) -> float:
+    """Return the best time per call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def traced_size(build) -> int:
+    """Return the bytes allocated by build that are still alive."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    """Run the benchmark."""
+    encoded = {key: json.dumps(value).encode() for key, value in PAYLOADS.items()}
+    dicts = {key: json.loads(value) for key, value in encoded.items()}
+    built = {key: MODELS[key].from_dict(value) for key, value in dicts.items()}
+
+    print(f"Python {sys.version.split()[0]}, best of 5")
+    dict_reads = best_of(lambda: read_dicts(dicts), 20000)
+    model_reads = best_of(lambda: read_models(built), 20000)
+    print(f"entity reads of one refresh: dicts {dict_reads:.2f} us, models {model_reads:.2f} us")
+    build = best_of(
+        lambda: [MODELS[key].from_dict(value) for key, value in dicts.items()], 2000
+    )
+    print(f"building all models once: {build:.1f} us")
+
+    # 在测量范围内解码，共享的字符串也计入
+    payloads = traced_size(
+        lambda: {key: json.loads(value) for key, value in encoded.items()}
+    )
+
+    def payloads_and_models() -> tuple:
+        decoded = {key: json.loads(value) for key, value in encoded.items()}
+        return decoded, {key: MODELS[key].from_dict(value) for key, value in decoded.items()}
+
+    both = traced_size(payloads_and_models)
+    print(f"memory: payloads {payloads} B, payloads and cached models {both} B")
+
+
+if __name__ == "__main__":
+    main()
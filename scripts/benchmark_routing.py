@@ -0,0 +1,122 @@
+"""Benchmark topic resolution and duplicate suppression of received messages.
+
+Run from the repository root in the development environment:
+
+    python scripts/benchmark_routing.py
+
+Compares the per message topic handling done before the dispatch table
+(special topic comparisons, regex match, id parsing and consumer lookup)
+with the TopicRouter lookup, for 11 routed data points.
+
+It also reports the cost of the payload fingerprint check against the
+decode it saves on a duplicate. The fraction of duplicates above which
+the check pays off follows from the two. The hit rate depends on the
+firmware, so it is not simulated here; a running robot reports it as
+checked and suppressed under fingerprints in the diagnostics.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.terramow import codec  # noqa: E402
+from custom_components.terramow.const import (  # noqa: E402
+    MAP_INFO_TOPIC,
+    MODEL_NAME_TOPIC,
+)
+from custom_components.terramow.fingerprint import PayloadFingerprints  # noqa: E402
+from custom_components.terramow.routing import TopicRouter  # noqa: E402
+
+# 集成使用的数据点
+DATA_POINTS = (8, 107, 108, 113, 117, 124, 125, 126, 127, 138, 155)
+
+# 调度表之前 on_mqtt_message 的主题解析方式
+TOPIC_PATTERN = re.compile(r"^data_point/(\d+)/robot$")
+
+TOPICS = (
+    "data_point/155/robot",
+    "data_point/113/robot",
+    MAP_INFO_TOPIC,
+    "data_point/999/robot",  # 没有消费者的数据点
+)
+
+GLOBAL_PARAMS = json.dumps({
+    "mow_height": {"value": 40},
+    "mow_speed": {"speed_type": "MOW_SPEED_TYPE_MEDIUM"},
+    "edge_cutting_distance": {"value": 10},
+    "main_direction_angle_config": {
+        "mode": "MAIN_DIRECTION_MODE_SINGLE",
+        "single_mode_config": {"angle": 0},
+        "current_angle": 0,
+    },
+    "mow_spacing": {"value": 100},
+    "blade_disk_speed": {"speed_type": "BLADE_DISK_SPEED_TYPE_HIGH"},
+    "current_mow_spacing": 100,
+}).encode()
+
+
+def resolve_by_regex(topic: str, consumers: dict) -> int | str | None:
+    """Resolve a topic the way on_mqtt_message did before the table."""
+    if topic == MAP_INFO_TOPIC:
+        return MAP_INFO_TOPIC
+    if topic == MODEL_NAME_TOPIC:
+        return MODEL_NAME_TOPIC
+    match = TOPIC_PATTERN.fullmatch(topic)
+    if not match:
+        return None
+    try:
+        dp_id = int(match.group(1))
+    except ValueError:
+        return None
+    return dp_id if dp_id in consumers else None
+
+
+def best_of(func, number: int) -> float:
+    """Return the best time per call in nanoseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+
+
+def main() -> None:
+    """Run the benchmark."""
+    router = TopicRouter()
+    consumers = {}
+    for dp_id in DATA_POINTS:
+        router.add_data_point(dp_id)
+        consumers[dp_id] = [print]
+    routes = router.routes
+
+    print(f"Python {sys.version.split()[0]}, {len(DATA_POINTS)} data points, best of 5")
+    for topic in TOPICS:
+        before = best_of(lambda topic=topic: resolve_by_regex(topic, consumers), 200000)
+        after = best_of(lambda topic=topic: routes.get(topic), 200000)
+        print(f"resolve {topic}: regex path {before:.0f} ns, table {after:.0f} ns")
+
+    fingerprints = PayloadFingerprints()
+    topic = "data_point/155/robot"
+    fingerprints.is_duplicate(topic, GLOBAL_PARAMS)
+    # bytes缓存哈希值，每轮使用新的负载对象，与接收的消息相同
+    rounds = []
+    for _ in range(5):
+        payloads = [bytes(bytearray(GLOBAL_PARAMS)) for _ in range(100000)]
+        start = time.perf_counter()
+        for payload in payloads:
+            fingerprints.is_duplicate(topic, payload)
+        rounds.append((time.perf_counter() - start) / len(payloads) * 1e9)
+    check = min(rounds)
+    decode = best_of(lambda: codec.loads(GLOBAL_PARAMS), 200000)
+    print(
+        f"dp155 ({len(GLOBAL_PARAMS)} B): fingerprint check {check:.0f} ns, "
+        f"{codec.CODEC_NAME} decode {decode:.0f} ns, "
+        f"pays off above {check / decode:.0%} duplicates"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Tests for the command acknowledgement of the lawn mower runtime."""
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.terramow import TerraMowBasicData
+from custom_components.terramow.coordinator import TerraMowDataCoordinator
+from custom_components.terramow.lawn_mower import TerraMowLawnMower
+from custom_components.terramow.models import Mission, MissionState, SubMission
+
+WAITING_IN_STATION = {
+    "mission": "MISSION_GLOBAL_CLEAN",
+    "sub_mission": "SUB_MISSION_FLEXIBLE_STATION_WAIT",
+    "state": "MISSION_STATE_RUNNING",
+}
+
+
+def create_runtime(hass: HomeAssistant) -> TerraMowLawnMower:
+    """Create a runtime that is not connected to a broker."""
+    basic_data = TerraMowBasicData(host="192.0.2.1", password="secret")
+    basic_data.coordinator = TerraMowDataCoordinator(hass, basic_data.host, "entry")
+    lawn_mower = TerraMowLawnMower(basic_data, hass)
+    lawn_mower.register_callback(107, lawn_mower.on_mission_status)
+    return lawn_mower
+
+
+async def test_ack_requires_a_status_change(hass: HomeAssistant) -> None:
+    """A robot already in the target state does not acknowledge by a report."""
+    lawn_mower = create_runtime(hass)
+    lawn_mower._async_dispatch_data_point(107, dict(WAITING_IN_STATION))
+    assert lawn_mower.mission_state == MissionState.MISSION_STATE_RUNNING
+
+    future = lawn_mower._resume_mow()
+    # 与发送时相同的状态报告不是确认
+    lawn_mower._async_dispatch_data_point(107, dict(WAITING_IN_STATION))
+    assert not future.done()
+
+    leaving = {**WAITING_IN_STATION, "sub_mission": "SUB_MISSION_OUT_OF_STATION"}
+    lawn_mower._async_dispatch_data_point(107, leaving)
+    assert future.done()
+    assert future.result() == leaving
+    assert lawn_mower.mission == Mission.MISSION_GLOBAL_CLEAN
+    assert lawn_mower.sub_mission == SubMission.SUB_MISSION_OUT_OF_STATION
+    assert lawn_mower.commands.acknowledged == 1
+
+    await lawn_mower.async_stop()
+
+
+async def test_ack_on_state_transition(hass: HomeAssistant) -> None:
+    """A pause is acknowledged once the mission status changes to paused."""
+    lawn_mower = create_runtime(hass)
+    running = {**WAITING_IN_STATION, "sub_mission": "SUB_MISSION_IDLE"}
+    lawn_mower._async_dispatch_data_point(107, running)
+
+    future = lawn_mower._send_pause_command()
+    lawn_mower._async_dispatch_data_point(107, running)
+    assert not future.done()
+
+    lawn_mower._async_dispatch_data_point(
+        107, {**running, "state": "MISSION_STATE_PAUSE"}
+    )
+    assert future.done()
+    assert future.result()["state"] == "MISSION_STATE_PAUSE"
+
+    await lawn_mower.async_stop()
@@ -0,0 +1,102 @@
+"""Tests for the data coordinator."""
+
+import copy
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.terramow.const import DOMAIN, STORAGE_VERSION
+from custom_components.terramow.coordinator import TerraMowDataCoordinator
+
+# 开发者文档 docs/en/developers/data_point.md 中的示例负载
+DOCUMENTED_PAYLOADS = {
+    8: {"int_value": 80},
+    108: {
+        "state": "BATTERY_STATE_CHARGING",
+        "charger_connected": True,
+        "is_switch_on": True,
+        "tempreture": "BATTERY_TEMPRETURE_NORMAL",
+    },
+    113: {
+        "type": "MAP_AREA_TYPE_CLEANING",
+        "total_area": 3000,
+        "clean_area": 1500,
+        "is_completed": False,
+        "work_duration": 1800,
+    },
+    117: {
+        "is_map_detected": True,
+        "map_id": 1,
+        "map_state": "MAP_STATE_COMPLETE",
+        "map_number": 2,
+        "is_backing_up_map": False,
+        "main_direction_angle": 0,
+        "is_spot_mode_map": False,
+        "spot_mode_map_number": 0,
+        "is_able_to_run_build_map": False,
+        "backup_map_backup_id": 0,
+    },
+    124: {"duration": 7200, "clean_area": 2000, "clean_times": 5},
+    125: {"int_value": 120},
+    126: {"int_value": 120},
+    138: {
+        "exist": True,
+        "item_id": 1,
+        "shift_id": 0,
+        "start_time": {"hour": 14, "minute": 30},
+        "end_time": {"hour": 16, "minute": 0},
+    },
+    155: {
+        "mow_height": {"value": 40},
+        "mow_speed": {"speed_type": "MOW_SPEED_TYPE_MEDIUM"},
+        "edge_cutting_distance": {"value": 10},
+        "main_direction_angle_config": {
+            "mode": "MAIN_DIRECTION_MODE_SINGLE",
+            "single_mode_config": {"angle": 0},
+            "current_angle": 0,
+        },
+        "mow_spacing": {"value": 100},
+        "blade_disk_speed": {"speed_type": "BLADE_DISK_SPEED_TYPE_HIGH"},
+        "current_mow_spacing": 100,
+    },
+}
+
+
+@pytest.mark.parametrize(("dp_id", "payload"), DOCUMENTED_PAYLOADS.items())
+async def test_payload_round_trip(
+    hass: HomeAssistant, hass_storage: dict, dp_id: int, payload: dict
+) -> None:
+    """Payloads come back unchanged, also after a restart from the snapshot."""
+    coordinator = TerraMowDataCoordinator(hass, "192.0.2.1", "entry")
+    coordinator.async_set_data(dp_id, copy.deepcopy(payload))
+    assert coordinator.get(dp_id) == payload
+    assert coordinator.is_current(dp_id, copy.deepcopy(payload))
+
+    hass_storage[f"{DOMAIN}.entry"] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.entry",
+        "data": coordinator._snapshot(),
+    }
+    restored = TerraMowDataCoordinator(hass, "192.0.2.1", "entry")
+    await restored.async_restore()
+
+    assert restored.get(dp_id) == payload
+    assert restored.is_stale(dp_id)
+    assert not restored.is_current(dp_id, payload)
+
+
+async def test_models_read_the_payload(hass: HomeAssistant) -> None:
+    """The typed properties read the documented payloads."""
+    coordinator = TerraMowDataCoordinator(hass, "192.0.2.1", "entry")
+    for dp_id, payload in DOCUMENTED_PAYLOADS.items():
+        coordinator.async_set_data(dp_id, payload)
+
+    assert coordinator.battery_level == 80
+    assert coordinator.battery_status.temperature == "BATTERY_TEMPERATURE_NORMAL"
+    assert coordinator.current_work_data.clean_area == 1500
+    assert coordinator.map_status.map_number == 2
+    assert coordinator.statistics_data.duration == 7200
+    assert coordinator.schedule_data.start_time == "14:30"
+    assert coordinator.global_params.main_direction.single_angle == 0
+    assert coordinator.blade_time == 120
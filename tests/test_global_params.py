@@ -0,0 +1,63 @@
+"""Tests for the dp_155 global parameter writes."""
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.terramow.coordinator import TerraMowDataCoordinator
+from custom_components.terramow.global_params import PendingWriteTracker, merge_params
+
+SINGLE = {
+    "main_direction_angle_config": {
+        "mode": "MAIN_DIRECTION_MODE_SINGLE",
+        "single_mode_config": {"angle": 30},
+    }
+}
+MULTIPLE = {
+    "main_direction_angle_config": {
+        "mode": "MAIN_DIRECTION_MODE_MULTIPLE",
+        "multiple_mode_config": {"angles": [0, 90]},
+    }
+}
+
+
+def test_mode_switch_drops_previous_sub_config() -> None:
+    """A mode switch replaces the sub-config but keeps reported fields."""
+    params = {
+        "mow_height": {"value": 40},
+        "main_direction_angle_config": {
+            **SINGLE["main_direction_angle_config"],
+            "current_angle": 30,
+        },
+    }
+    merge_params(params, MULTIPLE)
+    assert params == {
+        "mow_height": {"value": 40},
+        "main_direction_angle_config": {
+            **MULTIPLE["main_direction_angle_config"],
+            "current_angle": 30,
+        },
+    }
+
+    # 同一模式下的修改仍按字段合并
+    merge_params(params, {"main_direction_angle_config": {"current_angle": 90}})
+    assert params["main_direction_angle_config"]["multiple_mode_config"] == {"angles": [0, 90]}
+
+
+async def test_mode_switch_is_confirmed(hass: HomeAssistant) -> None:
+    """A write followed by a mode switch is confirmed by the echo of the new mode."""
+    coordinator = TerraMowDataCoordinator(hass, "192.0.2.1", "entry")
+    tracker = PendingWriteTracker(hass, coordinator, timeout=15)
+
+    tracker.async_request(SINGLE)
+    tracker.async_request(MULTIPLE)
+    assert tracker.apply({}) == MULTIPLE
+
+    # 设备只回传当前模式的子配置
+    echo = {
+        "main_direction_angle_config": {
+            **MULTIPLE["main_direction_angle_config"],
+            "current_angle": 0,
+        }
+    }
+    tracker.async_reconcile(echo)
+    assert not tracker.has_pending
+    assert tracker.confirmed == 1
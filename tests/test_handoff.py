@@ -0,0 +1,52 @@
+"""Tests for the receive handoff queue."""
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.terramow.const import DROP_POLICY_NEVER
+from custom_components.terramow.fingerprint import PayloadFingerprints
+from custom_components.terramow.handoff import HandoffQueue
+
+
+async def test_latest_value_survives_a_full_queue(hass: HomeAssistant) -> None:
+    """A flood of never-drop messages does not discard another key's value."""
+    delivered: list[tuple[int, bytes]] = []
+    fingerprints = PayloadFingerprints()
+    queue = HandoffQueue(
+        hass, lambda key, value: delivered.append((key, value)), 4,
+        {107: DROP_POLICY_NEVER},
+    )
+
+    def receive(key: int, payload: bytes) -> None:
+        # 与 on_mqtt_message 相同：重复的负载在入队前被丢弃
+        if not fingerprints.is_duplicate(f"data_point/{key}/robot", payload):
+            queue.put(key, payload)
+
+    battery = b'{"state": "BATTERY_STATE_CHARGING"}'
+    receive(108, battery)
+    for seq in range(10):
+        receive(107, b'{"seq": %d}' % seq)
+    assert queue.overflow > 0
+
+    # 机器人重发相同的负载，被识别为重复
+    receive(108, battery)
+    await asyncio.sleep(0)
+
+    assert delivered.count((108, battery)) == 1
+    assert [value for key, value in delivered if key == 107] == [
+        b'{"seq": %d}' % seq for seq in range(10)
+    ]
+
+
+async def test_drop_oldest_keys_coalesce(hass: HomeAssistant) -> None:
+    """Only the newest value of a drop-oldest key is delivered."""
+    delivered: list[tuple[int, int]] = []
+    queue = HandoffQueue(hass, lambda key, value: delivered.append((key, value)), 4)
+
+    for value in range(5):
+        queue.put(8, value)
+    await asyncio.sleep(0)
+
+    assert delivered == [(8, 4)]
+    assert queue.messages_coalesced == 4
@@ -0,0 +1,37 @@
+"""Tests for the MQTT reconnects of the lawn mower runtime."""
+
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+from paho.mqtt import client as mqtt_client
+
+from .test_commands import create_runtime
+
+
+async def test_thread_loop_uses_reconnect_policy(hass: HomeAssistant) -> None:
+    """The thread transport waits the policy delay after a lost connection."""
+    lawn_mower = create_runtime(hass)
+    lawn_mower.mqtt_client = MagicMock()
+    lawn_mower.mqtt_client.loop.side_effect = [
+        mqtt_client.MQTT_ERR_SUCCESS,
+        mqtt_client.MQTT_ERR_CONN_LOST,
+        mqtt_client.MQTT_ERR_SUCCESS,
+        mqtt_client.MQTT_ERR_NO_CONN,
+    ]
+    delays = []
+
+    def next_delay() -> float:
+        delays.append(len(delays))
+        if len(delays) == 2:
+            lawn_mower._stop_event.set()
+        return 0
+
+    lawn_mower.reconnect.next_delay = next_delay
+    lawn_mower.mqtt_loop()
+
+    # 每次断线后按重连策略等待，再重新连接
+    assert lawn_mower.mqtt_client.connect.call_count == 2
+    assert delays == [0, 1]
+    lawn_mower.mqtt_client.loop_forever.assert_not_called()
+    lawn_mower.mqtt_client.reconnect_delay_set.assert_not_called()
+    await lawn_mower.async_stop()
@@ -0,0 +1,30 @@
+"""Tests for the TerraMow services."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.terramow.const import DOMAIN, SERVICE_REFRESH_COMPATIBILITY_INFO
+from custom_components.terramow.services import (
+    async_setup_services,
+    async_unload_services,
+)
+
+
+async def test_refresh_compatibility_info(hass: HomeAssistant) -> None:
+    """The service re-queries the compatibility info of every robot."""
+    lawn_mower = MagicMock()
+    lawn_mower.async_request_compatibility_info = AsyncMock()
+    hass.data[DOMAIN] = {
+        "entry": MagicMock(lawn_mower=lawn_mower),
+        "loading": MagicMock(lawn_mower=None),
+    }
+
+    async_setup_services(hass)
+    await hass.services.async_call(
+        DOMAIN, SERVICE_REFRESH_COMPATIBILITY_INFO, blocking=True
+    )
+    lawn_mower.async_request_compatibility_info.assert_awaited_once()
+
+    async_unload_services(hass)
+    assert not hass.services.has_service(DOMAIN, SERVICE_REFRESH_COMPATIBILITY_INFO)